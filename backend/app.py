@@ -1,6 +1,8 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, conint
+from typing import List, Literal, Optional
 import pandas as pd
 import os
 UNIVERSITIES = [
@@ -32,10 +34,31 @@ UNIVERSITIES = [
     {"university":"KTH Royal Institute of Technology","country":"Sweden","city":"Stockholm","ranking":35,"min_gpa":3.4,"min_ielts":6.5,"average_fees_eur":15000,"field":"Engineering"},
 ]
 
-from modules.admission_prediction import predict_admission
-from modules.recommendation_engine import recommend_universities
+from modules.admission_prediction import predict_admission_batch, predict_admission_grid, sweep_values
+from modules.admission_model import admission_model_status
+from modules.recommendation_engine import MATCH_LIMIT, MATCH_LIMIT_MAX, recommend_universities, match_universities, match_universities_batch
 from modules.nlp_query_handler import answer_query
-from modules.cost_roi_analysis import analyze_total_cost, find_affordable_universities, match_scholarships
+from modules.catalog_search import get_search_index
+from modules.autocomplete import AUTOCOMPLETE_LIMIT, get_autocomplete_index
+from modules.query_parser import get_query_parser
+from modules.name_resolver import resolve_scholarship_country
+from modules.roi_simulation import (
+    ROI_SEED,
+    ROI_SIMULATIONS,
+    select_universities,
+    simulate_roi,
+    start_simulation_pool,
+    stop_simulation_pool
+)
+from modules.scholarship_join import get_scholarship_join
+from modules.admin_management import add_scholarship, remove_scholarship
+from modules.bulk_ingest import INGEST_CHUNK_ROWS, IngestJob
+from modules.cost_roi_analysis import analyze_total_cost, find_affordable_universities, get_cost_engine, match_scholarships
+from utils.admin_auth import require_admin
+from utils.helpers import resolve_data_path
+from utils.streaming import NDJSONStreamingResponse, iter_csv_rows, iter_ndjson, batched, ndjson_line
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, start_catalog_watcher, stop_catalog_watcher
+from data_fetcher.scholarship_store import get_scholarship_store
 from data_fetcher.fetch_scholarships import (
     fetch_scholarships_by_country,
     filter_scholarships as filter_scholarships_advanced,
@@ -53,6 +76,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def load_catalog():
+    # Parse the CSVs once per process instead of on every request,
+    # then pick up edits in the background
+    try:
+        get_catalog_snapshot()
+    except FileNotFoundError as e:
+        print(f"Warning: university catalog not loaded at startup: {str(e)}")
+    start_catalog_watcher()
+    # Long-lived "spawn" pool for /roi/simulate (never forked from this threaded process)
+    start_simulation_pool()
+
+@app.on_event("shutdown")
+def stop_catalog():
+    stop_catalog_watcher()
+    stop_simulation_pool()
+
 # ---------- Data Models ----------
 class StudentProfile(BaseModel):
     gpa: float = None
@@ -61,6 +101,31 @@ class StudentProfile(BaseModel):
     country: str = None
     field: str = None
 
+class RecommendRequest(StudentProfile):
+    # List applicable scholarships and net yearly cost, optionally ranking by it
+    include_scholarships: bool = False
+    rank_by: Literal["match_score", "net_cost"] = "match_score"
+
+class BatchRecommendRequest(BaseModel):
+    profiles: List[StudentProfile]
+    top_k: conint(ge=1, le=MATCH_LIMIT_MAX) = MATCH_LIMIT
+
+class BatchPredictRequest(BaseModel):
+    # Parallel arrays; an omitted array counts as all zeros
+    gpa: List[Optional[float]] = []
+    ielts: List[Optional[float]] = []
+    budget: List[Optional[float]] = []
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    step: float = 1
+
+class SweepRequest(BaseModel):
+    gpa: SweepRange
+    ielts: SweepRange
+    budget: SweepRange
+
 class QueryRequest(BaseModel):
     query: str
 
@@ -69,9 +134,35 @@ class CostAnalysisRequest(BaseModel):
     country: str
     duration_years: int = 2
 
+class BatchCostRequest(BaseModel):
+    duration_years: float = 2
+    limit: int = 50
+    country: str = None
+    max_total_cost: float = None
+
+class RoiSimulationRequest(BaseModel):
+    # Named universities, or else the best-ranked `limit` ones (optionally in a country / field)
+    universities: List[str] = []
+    country: str = None
+    field: str = None
+    limit: int = 50
+    simulations: int = ROI_SIMULATIONS
+    seed: int = ROI_SEED
+    duration_years: float = 2
+    horizon_years: float = 10
+    workers: int = 1
+
 class ScholarshipRequest(BaseModel):
     country: str
 
+class NewScholarship(BaseModel):
+    scholarship_name: str
+    country: str
+    eligible_universities: str = None
+    coverage: str = None
+    amount_eur: float = None
+    eligibility: str = None
+
 # ---------- Routes ----------
 @app.get("/")
 def root():
@@ -125,78 +216,195 @@ def predict(profile: StudentProfile):
         return {"status": "error", "message": str(e)}
 
 
+@app.get("/model-status")
+def model_status():
+    """Whether admission scoring uses models/admission_model.pkl or the heuristic fallback"""
+    try:
+        return {"status": "success", **admission_model_status()}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
-@app.post("/recommend")
-def recommend(profile: StudentProfile):
+@app.post("/predict/sweep")
+def predict_sweep(request: SweepRequest):
+    """
+    Admission probability and chance for every gpa x ielts x budget combination
+    in the given ranges (stop inclusive), indexed [gpa][ielts][budget]
+    """
     try:
-        # Load university dataset
-        csv_path = "backend/data/universities.csv"
-        if not os.path.exists(csv_path):
-            csv_path = "data/universities.csv"
+        axes = {
+            name: sweep_values(axis.start, axis.stop, axis.step)
+            for name, axis in (("gpa", request.gpa), ("ielts", request.ielts), ("budget", request.budget))
+        }
+        probability, chance = predict_admission_grid(axes["gpa"], axes["ielts"], axes["budget"])
 
-        df = pd.read_csv(csv_path)
+        return {
+            "status": "success",
+            **{name: values.tolist() for name, values in axes.items()},
+            "probability": probability.tolist(),
+            "chance": chance.tolist()
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
-        # Normalize inputs
-        gpa = profile.gpa or 0
-        ielts = profile.ielts or 0
-        budget = profile.budget or 10**9
-        country = (profile.country or "").lower()
-        field = (profile.field or "").lower()
-
-        results = []
-
-        for _, uni in df.iterrows():
-            # Eligibility filters
-            if gpa < uni.get("min_gpa", 0):
-                continue
-            if ielts < uni.get("min_ielts", 0):
-                continue
-            if budget < uni.get("average_fees_eur", 0):
-                continue
-            if country and country != str(uni.get("country", "")).lower():
-                continue
-            if field and field not in str(uni.get("field", "")).lower():
-                continue
-
-            # Match score calculation
-            gpa_score = min(gpa / 4, 1)
-            ielts_score = min(ielts / 9, 1)
-            cost_score = 1 - (uni["average_fees_eur"] / budget)
-
-            match_score = round(
-                (gpa_score * 0.4) + (ielts_score * 0.3) + (cost_score * 0.3),
-                2
-            )
-
-            results.append({
-                "university": uni["university"],
-                "country": uni["country"],
-                "city": uni.get("city", ""),
-                "ranking": uni.get("ranking", 500),
-                "average_fees_eur": uni["average_fees_eur"],
-                "field": uni.get("field", ""),
-                "match_score": match_score
+# Profiles scored (and results emitted) per chunk by /predict/batch
+PREDICT_CHUNK_SIZE = 10000
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request):
+    """
+    Score many profiles with predict_admission in one NumPy pass per chunk
+
+    Accepts either a JSON body of parallel arrays ({"gpa": [...], "ielts": [...],
+    "budget": [...]}) or, with Content-Type application/x-ndjson, one profile
+    object per line. The response is NDJSON: one line per chunk of
+    PREDICT_CHUNK_SIZE profiles ({"offset", "probability", "chance"}), then a
+    final {"status", "total"} line. NDJSON input is read as it arrives, so
+    neither side of a large job is ever held in memory at once.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        chunks = _ndjson_prediction_chunks(request)
+    else:
+        try:
+            body = BatchPredictRequest(**(await request.json()))
+            chunks = _columnar_prediction_chunks(body)
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    return NDJSONStreamingResponse(_prediction_stream(chunks))
+
+
+def _columnar_prediction_chunks(body: BatchPredictRequest):
+    columns = [body.gpa, body.ielts, body.budget]
+    total = max(len(values) for values in columns)
+    if any(values and len(values) != total for values in columns):
+        raise ValueError("gpa, ielts and budget must have the same length")
+    columns = [values or [0] * total for values in columns]
+
+    async def chunks():
+        for start in range(0, total, PREDICT_CHUNK_SIZE):
+            yield [values[start:start + PREDICT_CHUNK_SIZE] for values in columns]
+
+    return chunks()
+
+
+async def _ndjson_prediction_chunks(request: Request):
+    async for lines in batched(iter_ndjson(request.stream()), PREDICT_CHUNK_SIZE):
+        profiles = [profile for _, profile in lines]
+        yield [[profile.get(name) for profile in profiles] for name in ("gpa", "ielts", "budget")]
+
+
+async def _prediction_stream(chunks):
+    total = 0
+    try:
+        async for gpa, ielts, budget in chunks:
+            probability, chance = predict_admission_batch(gpa, ielts, budget)
+            yield ndjson_line({
+                "offset": total,
+                "probability": probability.tolist(),
+                "chance": chance.tolist()
             })
+            total += len(probability)
+    except Exception as e:
+        # Headers are already sent; report the failure in-band after the last good chunk
+        yield ndjson_line({"status": "error", "message": str(e), "total": total})
+        return
+    yield ndjson_line({"status": "success", "total": total})
+
+
+@app.post("/recommend")
+def recommend(profile: RecommendRequest):
+    try:
+        snapshot = get_catalog_snapshot()
 
-        # Sort best matches
-        results.sort(key=lambda x: x["match_score"], reverse=True)
+        # Filter, score and pick the best matches on whole columns
+        scholarships = None
+        if profile.include_scholarships or profile.rank_by == "net_cost":
+            scholarships = get_scholarship_join(snapshot)
+        total, results = match_universities(snapshot.universities, profile, scholarships=scholarships, rank_by=profile.rank_by)
 
         return {
             "status": "success",
-            "total": len(results),
-            "recommendations": results[:10]  # top 10 only
+            "catalog_version": snapshot.version,
+            "total": total,
+            "recommendations": results  # top 10 only
         }
 
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@app.post("/recommend/batch")
+def recommend_batch(request: BatchRecommendRequest):
+    """Recommendations for many student profiles in one call"""
+    try:
+        snapshot = get_catalog_snapshot()
+        batch = match_universities_batch(snapshot.universities, request.profiles, limit=request.top_k)
+        return {
+            "status": "success",
+            "catalog_version": snapshot.version,
+            "total_profiles": len(batch),
+            "results": [
+                {"total": total, "recommendations": recommendations}
+                for total, recommendations in batch
+            ]
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 @app.post("/query")
 def query_handler(request: QueryRequest):
     try:
         answer = answer_query(request.query)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    response = {"status": "success", "answer": answer, "constraints": {}, "total": 0, "recommendations": []}
+    try:
+        # Constraints stated in the question run through the /recommend filters
+        snapshot = get_catalog_snapshot()
+        constraints = get_query_parser(snapshot.universities).parse(request.query)
+        total, results = 0, []
+        if not constraints.is_empty():
+            total, results = match_universities(snapshot.universities, constraints)
+        response.update({
+            "catalog_version": snapshot.version,
+            "constraints": constraints.to_dict(),
+            "total": total,
+            "recommendations": results
+        })
+    except Exception as e:
+        # The canned answer does not need the catalog
+        response["recommendations_error"] = str(e)
+    return response
+
+# Upper bound on hits returned by /search
+SEARCH_MAX_LIMIT = 100
+
+@app.get("/search")
+def search(q: str, limit: int = 10):
+    """BM25 full-text search over universities and scholarships"""
+    try:
+        snapshot = get_catalog_snapshot()
+        results = get_search_index(snapshot).search(q, max(0, min(limit, SEARCH_MAX_LIMIT)))
         return {
             "status": "success",
-            "answer": answer
+            "catalog_version": snapshot.version,
+            "query": q,
+            "results": results,
+            "total": len(results)
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+@app.get("/autocomplete")
+def autocomplete(q: str, limit: int = AUTOCOMPLETE_LIMIT):
+    """University, city, field and scholarship names starting with q, best ranked first"""
+    try:
+        snapshot = get_catalog_snapshot()
+        suggestions = get_autocomplete_index(snapshot).suggest(q, max(0, min(limit, AUTOCOMPLETE_LIMIT)))
+        return {
+            "status": "success",
+            "catalog_version": snapshot.version,
+            "suggestions": suggestions
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -204,20 +412,77 @@ def query_handler(request: QueryRequest):
 @app.post("/cost-analysis")
 def cost_analysis(request: CostAnalysisRequest):
     try:
+        snapshot = get_catalog_snapshot()
         analysis = analyze_total_cost(request.tuition_fee, request.country, request.duration_years)
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "cost_analysis": analysis
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@app.post("/cost-analysis/batch")
+def cost_analysis_batch(request: BatchCostRequest):
+    """Total study cost of every university in the catalog, cheapest first"""
+    try:
+        snapshot = get_catalog_snapshot()
+        total, results = get_cost_engine(snapshot.universities).rank_by_total_cost(
+            request.duration_years,
+            limit=request.limit,
+            country=request.country,
+            max_total_cost=request.max_total_cost
+        )
+        return {
+            "status": "success",
+            "catalog_version": snapshot.version,
+            "duration_years": request.duration_years,
+            "total": total,
+            "results": results
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+@app.post("/roi/simulate")
+def roi_simulate(request: RoiSimulationRequest):
+    """Monte Carlo payback period and net ROI percentiles per university"""
+    try:
+        snapshot = get_catalog_snapshot()
+        rows = select_universities(
+            snapshot.universities,
+            names=request.universities,
+            country=request.country,
+            field=request.field,
+            limit=request.limit
+        )
+        results = simulate_roi(
+            snapshot,
+            rows,
+            n_simulations=request.simulations,
+            seed=request.seed,
+            duration_years=request.duration_years,
+            horizon_years=request.horizon_years,
+            workers=request.workers
+        )
+        return {
+            "status": "success",
+            "catalog_version": snapshot.version,
+            "simulations": request.simulations,
+            "seed": request.seed,
+            "results": results,
+            "total": len(results)
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 @app.post("/find-affordable")
 def find_affordable(profile: StudentProfile):
     try:
-        affordable_unis = find_affordable_universities(profile, profile.budget)
+        snapshot = get_catalog_snapshot()
+        affordable_unis = find_affordable_universities(profile, profile.budget, snapshot=snapshot)
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "affordable_analysis": affordable_unis
         }
     except Exception as e:
@@ -226,9 +491,11 @@ def find_affordable(profile: StudentProfile):
 @app.post("/scholarships")
 def get_scholarships(request: ScholarshipRequest):
     try:
-        scholarships = match_scholarships(None, request.country)
+        snapshot = get_catalog_snapshot()
+        scholarships = match_scholarships(None, request.country, snapshot=snapshot)
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "scholarships": scholarships
         }
     except Exception as e:
@@ -237,14 +504,12 @@ def get_scholarships(request: ScholarshipRequest):
 @app.get("/universities")
 def get_all_universities():
     try:
-        csv_path = "backend/data/universities.csv"
-        if not os.path.exists(csv_path):
-            csv_path = "data/universities.csv"
-        df = pd.read_csv(csv_path)
+        snapshot = get_catalog_snapshot()
         return {
             "status": "success",
-            "universities": df.to_dict(orient="records"),
-            "total": len(df)
+            "catalog_version": snapshot.version,
+            "universities": snapshot.universities.records(),
+            "total": len(snapshot.universities)
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -252,14 +517,15 @@ def get_all_universities():
 @app.get("/scholarships-list")
 def get_all_scholarships():
     try:
-        csv_path = "backend/data/scholarships.csv"
-        if not os.path.exists(csv_path):
-            csv_path = "data/scholarships.csv"
-        df = pd.read_csv(csv_path)
+        snapshot = get_catalog_snapshot()
+        store = get_scholarship_store(snapshot)
+        if store is None:
+            raise FileNotFoundError(f"Scholarships data file not found at {resolve_data_path('scholarships.csv')}")
         return {
             "status": "success",
-            "scholarships": df.to_dict(orient="records"),
-            "total": len(df)
+            "catalog_version": snapshot.version,
+            "scholarships": store.get(),
+            "total": len(store)
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -270,9 +536,12 @@ def get_all_scholarships():
 def scholarships_by_country(country: str):
     """Get scholarships available in a specific country"""
     try:
-        scholarships = fetch_scholarships_by_country(country)
+        snapshot = get_catalog_snapshot()
+        country = resolve_scholarship_country(country, snapshot)
+        scholarships = fetch_scholarships_by_country(country, snapshot=snapshot)
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "country": country,
             "scholarships": scholarships,
             "total": len(scholarships)
@@ -284,9 +553,11 @@ def scholarships_by_country(country: str):
 def scholarships_statistics():
     """Get statistics about all scholarships"""
     try:
-        stats = get_scholarship_statistics()
+        snapshot = get_catalog_snapshot()
+        stats = get_scholarship_statistics(snapshot)
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "statistics": stats
         }
     except Exception as e:
@@ -296,14 +567,18 @@ def scholarships_statistics():
 def filter_scholarships(country: str = None, coverage: str = None, min_amount: float = None, max_amount: float = None):
     """Advanced scholarship filtering with multiple criteria"""
     try:
+        snapshot = get_catalog_snapshot()
+        country = resolve_scholarship_country(country, snapshot)
         scholarships = filter_scholarships_advanced(
             country=country,
             coverage=coverage,
             min_amount=min_amount,
-            max_amount=max_amount
+            max_amount=max_amount,
+            snapshot=snapshot
         )
         return {
             "status": "success",
+            "catalog_version": snapshot.version,
             "scholarships": scholarships,
             "total": len(scholarships),
             "filters": {
@@ -316,3 +591,48 @@ def filter_scholarships(country: str = None, coverage: str = None, min_amount: f
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+
+@app.post("/admin/scholarships", dependencies=[Depends(require_admin)])
+def admin_add_scholarship(scholarship: NewScholarship):
+    """Add one scholarship; the statistics are updated in place"""
+    try:
+        return add_scholarship(scholarship.model_dump())
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@app.delete("/admin/scholarships/{name}", dependencies=[Depends(require_admin)])
+def admin_remove_scholarship(name: str):
+    """Remove every scholarship with this exact name"""
+    try:
+        return remove_scholarship(name)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@app.post("/admin/ingest", dependencies=[Depends(require_admin)])
+async def admin_ingest(request: Request, dataset: str = "universities"):
+    """
+    Bulk-add universities or scholarships from a streamed upload
+
+    The body is CSV (with a header row) or, with Content-Type
+    application/x-ndjson, one JSON object per line. It is validated
+    INGEST_CHUNK_ROWS rows at a time; accepted rows are committed together
+    once the whole upload has been read, and rejected rows are listed with
+    their line number and reasons.
+    """
+    try:
+        job = await run_in_threadpool(IngestJob, dataset)
+        try:
+            if "ndjson" in request.headers.get("content-type", ""):
+                async for lines in batched(iter_ndjson(request.stream()), INGEST_CHUNK_ROWS):
+                    await run_in_threadpool(job.add_records, lines)
+            else:
+                async for lines in batched(iter_csv_rows(request.stream()), INGEST_CHUNK_ROWS):
+                    await run_in_threadpool(job.add_csv_rows, lines)
+            result = await run_in_threadpool(job.commit)
+        finally:
+            job.close()
+        return {"status": "success", "catalog_version": get_catalog_snapshot().version, **result}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,61 @@
+"""
+Benchmark: /find-affordable through the prefix-sum index vs a boolean mask per call
+
+Checks AffordabilityIndex.summary against the previous mask / argmin / mean
+implementation over many budgets, then times both.
+
+Run from backend/:
+    python -m benchmarks.bench_affordable
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.cost_roi_analysis import AffordabilityIndex
+
+
+def mask_summary(catalog, max_budget):
+    """The previous per-call implementation"""
+    fees = catalog.column("average_fees_eur")
+    affordable = np.flatnonzero(fees <= max_budget)
+    affordable_fees = fees[affordable]
+    total = len(catalog)
+    return {
+        "total_universities": total,
+        "affordable_universities": len(affordable),
+        "percentage_affordable": round((len(affordable) / total) * 100, 2) if total > 0 else 0,
+        "cheapest_university": catalog.records(affordable[[affordable_fees.argmin()]])[0] if len(affordable) > 0 else None,
+        "average_fee_in_budget": round(affordable_fees.mean(), 2) if len(affordable) > 0 else 0
+    }
+
+
+def run(n_rows: int = 100_000, n_budgets: int = 2000):
+    frame = make_universities_frame(n_rows)
+    frame.loc[frame.sample(frac=0.01, random_state=0).index, "average_fees_eur"] = np.nan
+    catalog = UniversityCatalog.from_frame(frame)
+    budgets = np.random.default_rng(0).uniform(0, 16000, n_budgets).round().tolist() + [999.0, 1000.0, 14950.0, float("nan")]
+
+    start = time.perf_counter()
+    index = AffordabilityIndex(catalog)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    expected = [mask_summary(catalog, budget) for budget in budgets]
+    mask_us = (time.perf_counter() - start) / len(budgets) * 1e6
+
+    start = time.perf_counter()
+    results = [index.summary(budget) for budget in budgets]
+    index_us = (time.perf_counter() - start) / len(budgets) * 1e6
+
+    assert results == expected
+    print(f"catalog rows: {n_rows}, budgets: {len(budgets)} (results identical), index build: {build_ms:.1f} ms")
+    print(f"mask per call:  {mask_us:8.1f} us")
+    print(f"index per call: {index_us:8.1f} us")
+    print(f"speedup:        {mask_us / index_us:8.0f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+"""
+Benchmark: /autocomplete latency on a synthetic 100k-row catalog
+
+Builds the autocomplete trie for synthetic universities and scholarships,
+checks a few prefixes against a scan of every name, then reports latency
+percentiles and response sizes over a mixed prefix set.
+
+Run from backend/:
+    python -m benchmarks.bench_autocomplete
+"""
+
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_scholarships_frame, make_universities_frame
+from data_fetcher.catalog_snapshot import CatalogSnapshot
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.autocomplete import AutocompleteIndex
+from utils.prefix_trie import WORD_START, normalize
+
+PREFIXES = [
+    "u", "un", "univ", "university 42", "university 4242", "ai", "data", "comp", "germany c",
+    "germany city 7", "fr", "exc", "merit scholarship 1", "women in", "rob", "zzz",
+]
+
+
+def scan(index, prefix, k):
+    """Best k entries with a word starting with prefix, by checking every entry"""
+    prefix = normalize(prefix)
+    hits = []
+    for entry_id, entry in enumerate(index.entries):
+        name = normalize(entry["value"])
+        if any(name.startswith(prefix, match.start()) for match in WORD_START.finditer(name)):
+            hits.append(entry_id)
+            if len(hits) == k:
+                break
+    return [index.entries[entry_id] for entry_id in hits]
+
+
+def run(n_universities: int = 80_000, n_scholarships: int = 20_000, repeat: int = 200):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_universities))
+    snapshot = CatalogSnapshot(1, catalog, make_scholarships_frame(n_scholarships), {})
+
+    start = time.perf_counter()
+    index = AutocompleteIndex(snapshot)
+    print(f"entries: {len(index.entries)}, keys: {len(index.trie)}, build: {time.perf_counter() - start:.2f} s")
+
+    for prefix in PREFIXES:
+        assert index.suggest(prefix) == scan(index, prefix, index.trie.k), prefix
+
+    timings, sizes = [], []
+    for _ in range(repeat):
+        for prefix in PREFIXES:
+            start = time.perf_counter()
+            suggestions = index.suggest(prefix)
+            timings.append(time.perf_counter() - start)
+    for prefix in PREFIXES:
+        sizes.append(len(json.dumps({"status": "success", "catalog_version": 1, "suggestions": index.suggest(prefix)})))
+
+    timings = np.array(timings) * 1e6
+    print(f"p50: {np.percentile(timings, 50):.1f} us, p99: {np.percentile(timings, 99):.1f} us, max: {timings.max():.1f} us")
+    print(f"response bytes: median {int(np.median(sizes))}, max {max(sizes)}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,103 @@
+"""
+Benchmark: streaming bulk ingest vs one add_university call per row
+
+Runs in a temporary data directory. An upload of synthetic universities
+(1% of them invalid) is fed through the same path as /admin/ingest:
+iter_csv_rows over small byte chunks, IngestJob chunk by chunk, one commit.
+A second, traced run measures peak Python memory while the upload streams
+(the commit then rebuilds the catalog, which is sized by the catalog); it
+stays flat as the upload grows. The per-row rewrite the old add_university
+did is timed on a small sample for comparison.
+
+Run from backend/:
+    python -m benchmarks.bench_bulk_ingest
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.catalog_snapshot import reload_catalog_snapshot
+from modules.bulk_ingest import INGEST_CHUNK_ROWS, IngestJob
+from utils.streaming import batched, iter_csv_rows
+
+BYTE_CHUNK = 64 * 1024
+
+
+def upload_bytes(n_rows: int) -> bytes:
+    df = make_universities_frame(n_rows, seed=7)
+    df["university"] = [f"Uploaded {i}" for i in range(n_rows)]
+    df = df.astype(object)
+    bad = np.random.default_rng(1).random(n_rows) < 0.01
+    df.loc[bad, "average_fees_eur"] = -1
+    return df.to_csv(index=False).encode("utf-8")
+
+
+async def ingest(body: bytes, trace: bool = False):
+    """Ingest an upload; with trace, also return peak traced memory (bytes) before the commit"""
+    async def stream():
+        for start in range(0, len(body), BYTE_CHUNK):
+            yield body[start:start + BYTE_CHUNK]
+
+    job = IngestJob("universities")
+    try:
+        if trace:
+            tracemalloc.start()
+        async for lines in batched(iter_csv_rows(stream()), INGEST_CHUNK_ROWS):
+            job.add_csv_rows(lines)
+        peak = None
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return job.commit(), peak
+    finally:
+        job.close()
+
+
+def run(sizes=(50_000, 200_000), base_rows: int = 10_000):
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "data"))
+        os.chdir(directory)
+        try:
+            print(f"{'upload rows':>12} {'accepted':>9} {'rejected':>9} {'ingest s':>9} {'rows/s':>9} {'peak MB':>8}")
+            for n_rows in sizes:
+                body = upload_bytes(n_rows)
+                for trace in (False, True):
+                    make_universities_frame(base_rows).to_csv(os.path.join("data", "universities.csv"), index=False)
+                    reload_catalog_snapshot()
+                    start = time.perf_counter()
+                    result, traced_peak = asyncio.run(ingest(body, trace))
+                    if trace:
+                        peak = traced_peak
+                    else:
+                        elapsed = time.perf_counter() - start
+
+                    catalog = reload_catalog_snapshot().universities
+                    assert len(catalog) == base_rows + result["accepted"]
+                print(
+                    f"{n_rows:>12} {result['accepted']:>9} {result['rejected']:>9} {elapsed:>9.2f} "
+                    f"{n_rows / elapsed:>9.0f} {peak / 2**20:>8.1f}"
+                )
+
+            # Old path: concat + rewrite per row
+            df = pd.read_csv(os.path.join("data", "universities.csv"))
+            sample = 20
+            start = time.perf_counter()
+            for i in range(sample):
+                df = pd.concat([df, pd.DataFrame([{"university": f"One by one {i}", "country": "France", "city": "Paris"}])], ignore_index=True)
+                df.to_csv(os.path.join("data", "universities.csv"), index=False)
+            per_row = (time.perf_counter() - start) / sample
+            print(f"row-by-row rewrite at {len(df)} rows: {per_row * 1e3:.1f} ms/row ({1 / per_row:.0f} rows/s)")
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == "__main__":
+    run()
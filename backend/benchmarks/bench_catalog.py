@@ -0,0 +1,48 @@
+"""
+Benchmark: per-request cost of reading universities.csv vs the in-memory catalog
+
+Run from backend/:
+    python -m benchmarks.bench_catalog
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.fetch_universities import UniversityCatalog
+
+
+def _time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(sizes=(14, 1_000, 10_000, 100_000), repeat: int = 20):
+    print(f"{'rows':>8} {'read_csv ms':>12} {'catalog ms':>12} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in sizes:
+            csv_path = os.path.join(tmp_dir, f"universities_{n_rows}.csv")
+            make_universities_frame(n_rows).to_csv(csv_path, index=False)
+            catalog = UniversityCatalog.from_csv(csv_path)
+
+            # Same lookup the endpoints do: fees column filtered by a budget
+            def read_per_call():
+                df = pd.read_csv(csv_path)
+                return df[df["average_fees_eur"] <= 9000]
+
+            def from_catalog():
+                fees = catalog.column("average_fees_eur")
+                return fees[fees <= 9000]
+
+            csv_ms = _time_per_call(read_per_call, repeat)
+            catalog_ms = _time_per_call(from_catalog, repeat)
+            print(f"{n_rows:>8} {csv_ms:>12.3f} {catalog_ms:>12.3f} {csv_ms / catalog_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    run()
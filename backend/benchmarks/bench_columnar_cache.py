@@ -0,0 +1,66 @@
+"""
+Benchmark: loading the universities catalog from the CSV vs the columnar cache
+
+Runs on synthetic universities.csv files in a temporary directory. For each
+size: the catalog is loaded with the cache disabled (CSV parse), then once
+with the cache enabled and none present (parse plus cache write), then from
+the cache, the way every later worker starts. The cached catalog must equal
+the parsed one column for column, dtypes included; the size of the
+memory-mapped (shared) part of the cache is reported next to the files.
+
+Run from backend/:
+    python -m benchmarks.bench_columnar_cache
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.columnar_cache import CACHE_ENV, cache_root, load_university_catalog
+
+
+def timed_load(path: str, cache: bool):
+    os.environ[CACHE_ENV] = "1" if cache else "0"
+    start = time.perf_counter()
+    catalog = load_university_catalog(path)
+    return catalog, (time.perf_counter() - start) * 1e3
+
+
+def run(sizes=(100_000, 500_000)):
+    previous = os.environ.get(CACHE_ENV)
+    try:
+        print(f"{'rows':>8} {'csv MB':>7} {'cache MB':>9} {'mapped MB':>10} {'parse ms':>9} {'parse+write ms':>15} {'cached ms':>10} {'speedup':>8}")
+        for n_rows in sizes:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "universities.csv")
+                make_universities_frame(n_rows).to_csv(path, index=False)
+
+                parsed, parse_ms = timed_load(path, cache=False)
+                _, write_ms = timed_load(path, cache=True)
+                cached, cached_ms = timed_load(path, cache=True)
+
+                pd.testing.assert_frame_equal(parsed.to_frame(), cached.to_frame())
+                for name in parsed.column_names:
+                    assert parsed.column(name).dtype == cached.column(name).dtype, name
+
+                (key,) = os.listdir(cache_root(path))
+                cache_directory = os.path.join(cache_root(path), key)
+                cache_bytes = sum(os.path.getsize(os.path.join(cache_directory, name)) for name in os.listdir(cache_directory))
+                mapped_bytes = sum(os.path.getsize(os.path.join(cache_directory, name)) for name in os.listdir(cache_directory) if name.endswith(".npy"))
+                print(
+                    f"{n_rows:>8} {os.path.getsize(path) / 2**20:>7.1f} {cache_bytes / 2**20:>9.1f} {mapped_bytes / 2**20:>10.1f} "
+                    f"{parse_ms:>9.0f} {write_ms:>15.0f} {cached_ms:>10.0f} {parse_ms / cached_ms:>7.1f}x"
+                )
+        print("cached catalogs identical to parsed ones")
+    finally:
+        if previous is None:
+            os.environ.pop(CACHE_ENV, None)
+        else:
+            os.environ[CACHE_ENV] = previous
+
+
+if __name__ == "__main__":
+    run()
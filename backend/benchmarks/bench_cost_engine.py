@@ -0,0 +1,52 @@
+"""
+Benchmark: catalog-wide total cost vs one analyze_total_cost call per university
+
+Checks that CatalogCostEngine produces exactly the per-university
+analyze_total_cost figures, then times both and the ranking by total cost.
+
+Run from backend/:
+    python -m benchmarks.bench_cost_engine
+"""
+
+import time
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.cost_roi_analysis import CatalogCostEngine, analyze_total_cost
+
+COST_FIELDS = ["monthly_living_cost", "yearly_living_cost", "total_cost", "total_cost_per_month"]
+
+
+def run(n_rows: int = 100_000, durations=(1, 1.5, 2, 3)):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_rows))
+    fees = catalog.column("average_fees_eur").tolist()
+    countries = catalog.column("country").tolist()
+
+    start = time.perf_counter()
+    engine = CatalogCostEngine(catalog)
+    print(f"catalog rows: {n_rows}, engine build: {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print(f"{'years':>6} {'per call ms':>12} {'engine ms':>10} {'rank top 50 ms':>15} {'speedup':>8}")
+
+    for duration in durations:
+        start = time.perf_counter()
+        expected = [analyze_total_cost(fee, country, duration) for fee, country in zip(fees, countries)]
+        loop_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        costs = engine.costs(duration)
+        engine_ms = (time.perf_counter() - start) * 1e3
+
+        for field in COST_FIELDS:
+            assert costs[field].tolist() == [analysis[field] for analysis in expected], (duration, field)
+
+        start = time.perf_counter()
+        total, cheapest = engine.rank_by_total_cost(duration, limit=50)
+        rank_ms = (time.perf_counter() - start) * 1e3
+        ordered = sorted(range(n_rows), key=lambda row: expected[row]["total_cost"])[:50]
+        assert [record["total_cost"] for record in cheapest] == [expected[row]["total_cost"] for row in ordered]
+
+        print(f"{duration:>6} {loop_ms:>12.1f} {engine_ms:>10.2f} {rank_ms:>15.2f} {loop_ms / engine_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+"""
+Benchmark: EligibilityIndex query cost vs a full column scan as the catalog grows
+
+The query keeps the most selective condition (the budget) at a fixed number of
+matching rows, so the index cost should stay roughly flat while the scan grows
+linearly with the catalog.
+
+Run from backend/:
+    python -m benchmarks.bench_eligibility_index
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.eligibility_index import EligibilityIndex
+
+MATCHING_ROWS = 200
+
+
+def _time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(sizes=(10_000, 100_000, 1_000_000), repeat: int = 200):
+    print(f"{'rows':>9} {'index us':>10} {'scan us':>10} {'speedup':>8}")
+    for n_rows in sizes:
+        df = make_universities_frame(n_rows)
+        df["average_fees_eur"] = np.random.default_rng(1).uniform(1000, 15000, n_rows).round(2)
+        catalog = UniversityCatalog.from_frame(df)
+        index = EligibilityIndex(catalog)
+
+        budget = float(np.sort(df["average_fees_eur"].to_numpy())[MATCHING_ROWS - 1])
+        ielts = 6.5
+        in_france = lambda value: value == "France"
+
+        def indexed():
+            return index.query({"ielts_required": ielts, "average_fees_eur": budget}, {"country": in_france})
+
+        def scan():
+            mask = catalog.column("ielts_required") <= ielts
+            mask &= catalog.column("average_fees_eur") <= budget
+            mask &= catalog.category_mask("country", in_france)
+            return np.flatnonzero(mask)
+
+        assert (indexed() == scan()).all()
+        index_us = _time_per_call(indexed, repeat)
+        scan_us = _time_per_call(scan, repeat)
+        print(f"{n_rows:>9} {index_us:>10.1f} {scan_us:>10.1f} {scan_us / index_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
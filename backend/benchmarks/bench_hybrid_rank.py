@@ -0,0 +1,65 @@
+"""
+Benchmark: HybridRecommendationEngine.rank_universities, vectorized vs per-university scoring
+
+The previous implementation (score_university for every university, then a
+full sort) is run next to the array path on synthetic university dicts, for
+each sort criterion and a few top_k values. Every field of every returned
+ScoredUniversity must be equal.
+
+Run from backend/:
+    python -m benchmarks.bench_hybrid_rank
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_universities_frame
+from modules.hybrid_recommendation import HybridRecommendationEngine
+
+
+def per_university_rank(engine, universities, student_profile, sort_by="combined_score", top_k=None):
+    """The previous implementation"""
+    scored = [engine.score_university(uni, student_profile) for uni in universities]
+    key = sort_by if sort_by in ("acceptance_probability", "cost_fit") else "combined_score"
+    scored.sort(key=lambda x: getattr(x, key), reverse=True)
+    return scored[:top_k] if top_k else scored
+
+
+def make_universities(n_rows: int):
+    df = make_universities_frame(n_rows).rename(columns={"university": "name", "average_fees_eur": "tuition_fee"})
+    df["id"] = [f"uni-{i}" for i in range(n_rows)]
+    universities = df.to_dict(orient="records")
+    rng = np.random.default_rng(0)
+    for uni in universities:
+        if rng.random() < 0.1:
+            uni["programs"] = [uni["field"], "Data Engineering"]
+    return universities
+
+
+def run(n_rows: int = 100_000, repeat: int = 3):
+    engine = HybridRecommendationEngine()
+    universities = make_universities(n_rows)
+    profile = {"gpa": 3.4, "ielts": 7.0, "budget": 9000, "country": "Germany", "field": "AI"}
+
+    print(f"{n_rows} universities")
+    print(f"{'sort_by':<24} {'top_k':>6} {'per-row ms':>11} {'vector ms':>10} {'speedup':>8}")
+    for sort_by in ("combined_score", "cost_fit", "acceptance_probability"):
+        for top_k in (10, 100, None):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                expected = per_university_rank(engine, universities, profile, sort_by, top_k)
+            per_row_ms = (time.perf_counter() - start) / repeat * 1e3
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = engine.rank_universities(universities, profile, sort_by, top_k)
+            vector_ms = (time.perf_counter() - start) / repeat * 1e3
+
+            assert result == expected, f"{sort_by} top_k={top_k}: results differ"
+            print(f"{sort_by:<24} {str(top_k):>6} {per_row_ms:>11.1f} {vector_ms:>10.1f} {per_row_ms / vector_ms:>7.1f}x")
+    print("results identical")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+"""
+Benchmark: typo-tolerant country / field / university lookup
+
+Times building the SymSpell dictionaries for a synthetic catalog and
+resolving exact, misspelled and unknown names against them, both the first
+time (cold) and repeated (answered from the lookup memo).
+
+Run from backend/:
+    python -m benchmarks.bench_name_resolver
+"""
+
+import time
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.name_resolver import CatalogNameResolver
+from modules.text_search import get_text_index
+
+LOOKUPS = [
+    ("country", "Germany"),
+    ("country", "Germnay"),
+    ("country", "netherland"),
+    ("country", "Atlantis"),
+    ("field", "AI"),
+    ("field", "computer sciense"),
+    ("field", "robotcs"),
+    ("university", "University 4242"),
+    ("university", "Univrsity 4242"),
+    ("university", "Institute of Nowhere"),
+]
+
+
+def run(n_rows: int = 100_000, repeat: int = 2000):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_rows))
+    get_text_index(catalog)
+
+    start = time.perf_counter()
+    resolver = CatalogNameResolver(catalog)
+    build_s = time.perf_counter() - start
+
+    print(f"catalog rows: {n_rows}, dictionaries built in {build_s:.2f}s")
+    print(f"{'kind':>10} {'value':>22} {'resolved':>22} {'cold us':>8} {'warm us':>8}")
+    for kind, value in LOOKUPS:
+        lookup = getattr(resolver, kind)
+        start = time.perf_counter()
+        lookup(value)
+        cold_us = (time.perf_counter() - start) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            resolved = lookup(value)
+        elapsed_us = (time.perf_counter() - start) / repeat * 1e6
+        print(f"{kind:>10} {value:>22} {resolved:>22} {cold_us:>8.1f} {elapsed_us:>8.1f}")
+
+
+if __name__ == "__main__":
+    run()
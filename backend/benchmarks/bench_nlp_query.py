@@ -0,0 +1,141 @@
+"""
+Benchmark: compiled intent matcher vs sequential substring checks in answer_query
+
+Generates queries from templates that mix the keywords of several intents,
+checks the answers are identical and times both: first with the shipped
+intent table (against the original answer_query), then with the table grown
+by synthetic intents, where the sequential checks grow with the keyword
+count and the matcher does not.
+
+Run from backend/:
+    python -m benchmarks.bench_nlp_query
+"""
+
+import random
+import time
+
+from modules.nlp_query_handler import INTENTS, IntentMatcher, answer_query
+
+KEYWORDS = [
+    "ielts", "requirement", "how much", "scholarship", "cost", "budget", "expensive",
+    "cheap", "afford", "gpa", "academic", "grades", "france", "germany", "netherlands",
+    "italy", "spain", "living", "accommodation", "food", "apply", "application",
+    "admission", "work", "job", "career", "salary"
+]
+FILLER = [
+    "what", "is", "the", "for", "a", "student", "in", "with", "my", "best",
+    "university", "masters", "program", "europe", "can", "i", "get", "please"
+]
+
+
+def make_queries(n_queries: int, seed: int = 7, keywords=KEYWORDS):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        words = rng.choices(FILLER, k=rng.randint(3, 10))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords).title() if rng.random() < 0.3 else rng.choice(keywords))
+        queries.append(" ".join(words) + rng.choice(["?", "", "!"]))
+    return queries
+
+
+def legacy_answer_query(query):
+    """answer_query before the intent table: dict rebuilt per call, sequential `in` checks"""
+    query_lower = query.lower()
+    
+    # Country-specific queries
+    country_info = {
+        "france": "France offers affordable education (€6,000-€8,000/year) with strong AI and Computer Science programs. Universities like Sorbonne, Paris-Saclay, and Grenoble are top-ranked. IELTS requirement: 6.0-6.5. Scholarships: Eiffel, Charpak, Erasmus+.",
+        "germany": "Germany offers low-cost education with excellent STEM programs. Many public universities are FREE or very affordable (€8,000-€9,000/year). Top universities: TU Munich, RWTH Aachen. IELTS: 6.5. Scholarships: DAAD.",
+        "netherlands": "Netherlands has high tuition fees (€12,000-€13,000/year) but excellent education quality. Amsterdam and Delft are world-renowned. IELTS: 7.0. Living costs: €1,200/month.",
+        "italy": "Italy offers very affordable education (€3,000-€4,000/year) with rich academic history. Milan (Politecnico) and Bologna are top choices. IELTS: 6.0.",
+        "spain": "Spain provides affordable education (€4,500/year) with strong programs. Barcelona and Madrid universities are well-ranked. IELTS: 6.5. Living cost: €800/month."
+    }
+    
+    # Test requirements
+    if "ielts" in query_lower:
+        if "requirement" in query_lower or "how much" in query_lower:
+            return "IELTS requirements vary by university and program: Most require 6.0-7.0. Top universities typically require 6.5-7.5. Some universities accept 5.5 minimum. Check specific university requirements for accurate information."
+        else:
+            return "IELTS (International English Language Testing System) is widely accepted for university admissions in Europe. Scores range from 0-9, with 6.0+ typically required for master's programs."
+    
+    # Scholarship queries
+    if "scholarship" in query_lower:
+        return "Popular scholarships include: Erasmus+ (Europe-wide), DAAD (Germany), Eiffel Excellence (France), Orange Tulip (Netherlands), Campus France, and country-specific schemes. Most require merit-based selection. Apply early!"
+    
+    # Cost/Budget queries
+    if "cost" in query_lower or "budget" in query_lower or "expensive" in query_lower or "cheap" in query_lower or "afford" in query_lower:
+        return "Tuition costs vary significantly: Cheapest: Italy/Spain (€3,000-€4,500/year), Mid-range: France/Germany (€6,000-€9,000), Expensive: Netherlands (€12,000-€13,000). Living costs: €700-€1,200/month depending on country. Plan total budget accordingly."
+    
+    # GPA/Academic queries
+    if "gpa" in query_lower or "academic" in query_lower or "grades" in query_lower:
+        return "Most master's programs require minimum GPA of 3.0+ (on 4.0 scale). Top-tier universities prefer 3.5+. Your GPA combined with IELTS and work experience determines admission chances. Strong GPA can help secure scholarships."
+    
+    # Country-specific help
+    for country, info in country_info.items():
+        if country in query_lower:
+            return info
+    
+    # Living cost queries
+    if "living" in query_lower or "accommodation" in query_lower or "food" in query_lower:
+        return "Average monthly living costs (excluding tuition): France/Germany/Austria: €800-€1,000 | Netherlands/Belgium/Finland: €1,100-€1,200 | Italy/Spain: €700-€800. Budget includes rent, food, transport, and entertainment."
+    
+    # Application process
+    if "apply" in query_lower or "application" in query_lower or "admission" in query_lower:
+        return "Typical application requirements: Bachelor's degree + transcript, IELTS/TOEFL scores, Statement of Purpose (SOP), CV, recommendation letters, entrance exam (if required). Application timeline: 6-12 months before intake. Submit early for better scholarship chances."
+    
+    # Work after graduation
+    if "work" in query_lower or "job" in query_lower or "career" in query_lower or "salary" in query_lower:
+        return "Most European countries allow post-study work visas (1-2 years). Germany and Netherlands offer extended work permits. Average starting salaries for AI/CS graduates: €30,000-€50,000/year depending on country and role. EU degrees are highly valued globally."
+    
+    # Default response
+    return f"I can help with queries about countries (France, Germany, Netherlands, Italy, Spain), IELTS requirements, scholarships, costs, application process, and career opportunities. Could you rephrase your question?"
+
+
+def sequential_answer(intents, query, default=""):
+    """The original control flow for any intent table: rules in order, `in` checks"""
+    query_lower = query.lower()
+    for _, groups, answer in intents:
+        if all(any(keyword in query_lower for keyword in group) for group in groups):
+            return answer
+    return default
+
+
+def _time(func, queries) -> float:
+    start = time.perf_counter()
+    results = [func(query) for query in queries]
+    return time.perf_counter() - start, results
+
+
+def _report(label, n_keywords, n_queries, sequential_s, compiled_s):
+    print(
+        f"{label:>16} {n_keywords:>9} {sequential_s / n_queries * 1e6:>14.2f} "
+        f"{compiled_s / n_queries * 1e6:>13.2f} {sequential_s / compiled_s:>8.2f}x"
+    )
+
+
+def run(n_queries: int = 100_000, extra_intents=(100, 500)):
+    print(f"queries: {n_queries}")
+    print(f"{'table':>16} {'keywords':>9} {'sequential us':>14} {'compiled us':>13} {'speedup':>9}")
+
+    queries = make_queries(n_queries)
+    legacy_s, expected = _time(legacy_answer_query, queries)
+    compiled_s, answers = _time(answer_query, queries)
+    assert answers == expected
+    _report("shipped", len(KEYWORDS), n_queries, legacy_s, compiled_s)
+
+    for n_extra in extra_intents:
+        extra = [(f"topic{i}", [(f"topic{i}", f"subject{i}")], f"answer {i}") for i in range(n_extra)]
+        intents = INTENTS + extra
+        keywords = KEYWORDS + [keyword for _, groups, _ in extra for keyword in groups[0]]
+        matcher = IntentMatcher(intents)
+        queries = make_queries(n_queries, keywords=keywords)
+
+        sequential_s, expected = _time(lambda query: sequential_answer(intents, query), queries)
+        compiled_s, answers = _time(lambda query: matcher.answer(query, ""), queries)
+        assert answers == expected
+        _report(f"+{n_extra} intents", len(keywords), n_queries, sequential_s, compiled_s)
+
+
+if __name__ == "__main__":
+    run()
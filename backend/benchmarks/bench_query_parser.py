@@ -0,0 +1,51 @@
+"""
+Benchmark: /query constraint extraction plus indexed retrieval
+
+Times QueryParser.parse alone and parse + match_universities per query
+against a synthetic catalog.
+
+Run from backend/:
+    python -m benchmarks.bench_query_parser
+"""
+
+import time
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.catalog_snapshot import warm_catalog_indexes
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.query_parser import get_query_parser
+from modules.recommendation_engine import match_universities
+
+QUERIES = [
+    "cheap AI masters in Germany under 9000 with IELTS 6.5",
+    "Data Science in France, budget €12,000, gpa 3.4",
+    "I have 7.5 ielts and 8.2/10 CGPA, max 15k euros",
+    "computer science in spain",
+    "robotics programs in Austria City 3 below 6000 eur",
+    "what scholarships can I get?",
+]
+
+
+def run(n_rows: int = 100_000, repeat: int = 200):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_rows))
+    warm_catalog_indexes(catalog)
+    parser = get_query_parser(catalog)
+
+    print(f"catalog rows: {n_rows}")
+    print(f"{'query':>54} {'parse us':>9} {'+ match us':>11} {'matches':>8}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parser.parse(query)
+        parse_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            constraints = parser.parse(query)
+            total = match_universities(catalog, constraints)[0] if not constraints.is_empty() else 0
+        total_us = (time.perf_counter() - start) / repeat * 1e6
+        print(f"{query:>54} {parse_us:>9.1f} {total_us:>11.1f} {total:>8}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""
+Benchmark: /recommend row-by-row loop vs the vectorized match_universities
+
+Checks both paths return identical results before timing them.
+
+Run from backend/:
+    python -m benchmarks.bench_recommend
+"""
+
+import time
+from types import SimpleNamespace
+
+from benchmarks.synthetic_data import make_universities_frame
+from data_fetcher.catalog_snapshot import warm_catalog_indexes
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.recommendation_engine import match_universities
+
+PROFILES = [
+    SimpleNamespace(gpa=3.5, ielts=6.5, budget=9000, country=None, field=None),
+    SimpleNamespace(gpa=3.0, ielts=7.0, budget=13000, country="netherlands", field=None),
+    SimpleNamespace(gpa=None, ielts=6.0, budget=5000, country=None, field="computer"),
+    SimpleNamespace(gpa=4.0, ielts=9.0, budget=None, country="France", field="ai"),
+]
+
+
+def legacy_recommend(df, profile):
+    """The original iterrows implementation of /recommend"""
+    gpa = profile.gpa or 0
+    ielts = profile.ielts or 0
+    budget = profile.budget or 10**9
+    country = (profile.country or "").lower()
+    field = (profile.field or "").lower()
+
+    results = []
+    for _, uni in df.iterrows():
+        if gpa < uni.get("min_gpa", 0):
+            continue
+        if ielts < uni.get("min_ielts", 0):
+            continue
+        if budget < uni.get("average_fees_eur", 0):
+            continue
+        if country and country != str(uni.get("country", "")).lower():
+            continue
+        if field and field not in str(uni.get("field", "")).lower():
+            continue
+
+        gpa_score = min(gpa / 4, 1)
+        ielts_score = min(ielts / 9, 1)
+        cost_score = 1 - (uni["average_fees_eur"] / budget)
+        match_score = round((gpa_score * 0.4) + (ielts_score * 0.3) + (cost_score * 0.3), 2)
+
+        results.append({
+            "university": uni["university"],
+            "country": uni["country"],
+            "city": uni.get("city", ""),
+            "ranking": uni.get("ranking", 500),
+            "average_fees_eur": uni["average_fees_eur"],
+            "field": uni.get("field", ""),
+            "match_score": match_score
+        })
+
+    results.sort(key=lambda x: x["match_score"], reverse=True)
+    return len(results), results[:10]
+
+
+def run(n_rows: int = 100_000, repeat: int = 20):
+    df = make_universities_frame(n_rows)
+    catalog = UniversityCatalog.from_frame(df)
+    warm_catalog_indexes(catalog)
+
+    legacy_s = 0.0
+    vectorized_s = 0.0
+    for profile in PROFILES:
+        start = time.perf_counter()
+        expected = legacy_recommend(df, profile)
+        legacy_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            actual = match_universities(catalog, profile)
+        vectorized_s += (time.perf_counter() - start) / repeat
+
+        assert actual == expected, f"mismatch for {profile}"
+
+    print(f"rows: {n_rows}, profiles: {len(PROFILES)} (outputs identical)")
+    print(f"iterrows loop: {legacy_s / len(PROFILES) * 1000:10.2f} ms/request")
+    print(f"vectorized:    {vectorized_s / len(PROFILES) * 1000:10.2f} ms/request")
+    print(f"speedup:       {legacy_s / vectorized_s:10.0f}x")
+
+
+if __name__ == "__main__":
+    run()
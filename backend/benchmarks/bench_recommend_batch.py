@@ -0,0 +1,57 @@
+"""
+Benchmark: one /recommend/batch pass vs one match_universities call per profile
+
+Checks the batch results equal the per-profile results before timing.
+
+Run from backend/:
+    python -m benchmarks.bench_recommend_batch
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.synthetic_data import COUNTRIES, FIELDS, make_universities_frame
+from data_fetcher.catalog_snapshot import warm_catalog_indexes
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.recommendation_engine import match_universities, match_universities_batch
+
+
+def make_profiles(n_profiles: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(n_profiles):
+        profiles.append(SimpleNamespace(
+            gpa=float(rng.choice([0, 2.5, 3.0, 3.5, 4.0])),
+            ielts=float(rng.choice([0, 5.5, 6.0, 6.5, 7.0, 8.0])),
+            budget=float(rng.choice([0, 4000, 8000, 12000])),
+            country=rng.choice([None] + [country.lower() for country in COUNTRIES]),
+            field=rng.choice([None, "ai", "computer", "data"] + FIELDS[:2]),
+        ))
+    return profiles
+
+
+def run(n_rows: int = 2_000, n_profiles: int = 5_000):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_rows))
+    warm_catalog_indexes(catalog)
+    profiles = make_profiles(n_profiles)
+
+    start = time.perf_counter()
+    expected = [match_universities(catalog, profile) for profile in profiles]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = match_universities_batch(catalog, profiles)
+    batch_s = time.perf_counter() - start
+
+    assert actual == expected, "batch results differ from per-profile results"
+
+    print(f"catalog rows: {n_rows}, profiles: {n_profiles} (outputs identical)")
+    print(f"{n_profiles} single calls: {single_s * 1000:10.1f} ms")
+    print(f"one batch call:     {batch_s * 1000:10.1f} ms")
+    print(f"speedup:            {single_s / batch_s:10.1f}x")
+
+
+if __name__ == "__main__":
+    run()
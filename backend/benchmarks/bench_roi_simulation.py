@@ -0,0 +1,47 @@
+"""
+Benchmark: /roi/simulate Monte Carlo throughput
+
+Times a 50-university comparison in-process, then a larger comparison both
+in-process and through the process pool, checking that the pool returns
+exactly the in-process results.
+
+Run from backend/:
+    python -m benchmarks.bench_roi_simulation
+"""
+
+import os
+import time
+
+from benchmarks.synthetic_data import make_scholarships_frame, make_universities_frame
+from data_fetcher.catalog_snapshot import CatalogSnapshot
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.roi_simulation import ROI_SIMULATIONS, select_universities, simulate_roi, start_simulation_pool, stop_simulation_pool
+
+
+def timed(snapshot, rows, workers, n_simulations):
+    start = time.perf_counter()
+    results = simulate_roi(snapshot, rows, n_simulations=n_simulations, workers=workers)
+    return results, time.perf_counter() - start
+
+
+def run(n_rows: int = 10_000, n_simulations: int = ROI_SIMULATIONS, large: int = 400):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_rows))
+    snapshot = CatalogSnapshot(1, catalog, make_scholarships_frame(200), {})
+    workers = start_simulation_pool(os.cpu_count() or 1)
+
+    rows = select_universities(catalog, limit=50)
+    simulate_roi(snapshot, rows[:1], n_simulations=n_simulations)  # warm the cost engine
+    _, elapsed = timed(snapshot, rows, 1, n_simulations)
+    print(f"{len(rows)} universities x {n_simulations} simulations, in-process: {elapsed * 1e3:.0f} ms")
+
+    rows = select_universities(catalog, limit=large)
+    serial, serial_s = timed(snapshot, rows, 1, n_simulations)
+    pooled, pooled_s = timed(snapshot, rows, workers, n_simulations)
+    assert pooled == serial
+    print(f"{len(rows)} universities x {n_simulations} simulations, in-process: {serial_s * 1e3:.0f} ms, "
+          f"{workers} processes: {pooled_s * 1e3:.0f} ms (results identical)")
+    stop_simulation_pool()
+
+
+if __name__ == "__main__":
+    run()
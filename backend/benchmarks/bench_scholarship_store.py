@@ -0,0 +1,76 @@
+"""
+Benchmark: scholarship lookups through ScholarshipStore vs reading the CSV per call
+
+Writes a synthetic scholarships.csv (with some missing values), checks every
+store lookup against the pandas expression the fetch functions used to run,
+then times one lookup of each kind both ways.
+
+Run from backend/:
+    python -m benchmarks.bench_scholarship_store
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import make_scholarships_frame
+from data_fetcher.scholarship_store import ScholarshipStore
+
+
+def per_call(csv_path):
+    """The previous implementations: read the CSV, filter with pandas"""
+    return {
+        "by country": lambda: (lambda df: df[df["country"] == "Germany"].to_dict(orient="records"))(pd.read_csv(csv_path)),
+        "by coverage": lambda: (lambda df: df[df["coverage"] == "Full"].to_dict(orient="records"))(pd.read_csv(csv_path)),
+        "by eligibility": lambda: (lambda df: df[df["eligibility"].str.contains("indian", case=False, na=False)].to_dict(orient="records"))(pd.read_csv(csv_path)),
+        "amount range": lambda: (lambda df: df[(df["amount_eur"] >= 8000) & (df["amount_eur"] <= 9000)].to_dict(orient="records"))(pd.read_csv(csv_path)),
+    }
+
+
+def indexed(store):
+    return {
+        "by country": lambda: store.get(store.rows_equal("country", "Germany")),
+        "by coverage": lambda: store.get(store.rows_equal("coverage", "Full")),
+        "by eligibility": lambda: store.get(store.rows_matching_eligibility("indian")),
+        "amount range": lambda: store.get(store.rows_in_amount_range(8000, 9000)),
+    }
+
+
+def run(n_rows: int = 20_000, repeat: int = 20):
+    df = make_scholarships_frame(n_rows)
+    rng = np.random.default_rng(0)
+    df.loc[rng.random(n_rows) < 0.01, "eligibility"] = np.nan
+    df["amount_eur"] = df["amount_eur"].astype(float)
+    df.loc[rng.random(n_rows) < 0.01, "amount_eur"] = np.nan
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "scholarships.csv")
+        df.to_csv(csv_path, index=False)
+
+        start = time.perf_counter()
+        store = ScholarshipStore(pd.read_csv(csv_path))
+        print(f"scholarships: {n_rows}, store build (incl. CSV parse): {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        old, new = per_call(csv_path), indexed(store)
+        print(f"{'lookup':>15} {'per call ms':>12} {'store ms':>9} {'rows':>6}")
+        for name in old:
+            expected = old[name]()
+            assert repr(new[name]()) == repr(expected), name
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                old[name]()
+            old_ms = (time.perf_counter() - start) / repeat * 1e3
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                new[name]()
+            new_ms = (time.perf_counter() - start) / repeat * 1e3
+            print(f"{name:>15} {old_ms:>12.2f} {new_ms:>9.2f} {len(expected):>6}")
+
+
+if __name__ == "__main__":
+    run()
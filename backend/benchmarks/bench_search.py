@@ -0,0 +1,78 @@
+"""
+Benchmark: BM25 /search latency on a synthetic 100k-document corpus
+
+Builds a snapshot from synthetic universities and scholarships, checks the
+pruned top-k against exhaustive scoring, then reports latency percentiles
+over a mixed query set (end to end through CatalogSearchIndex.search,
+including building the result records).
+
+Run from backend/:
+    python -m benchmarks.bench_search
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import make_scholarships_frame, make_universities_frame
+from data_fetcher.catalog_snapshot import CatalogSnapshot
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.catalog_search import CatalogSearchIndex
+from utils.bm25 import tokenize
+
+QUERIES = [
+    "ai", "data science", "germany computer science", "university 4242", "robotics france",
+    "merit scholarship", "full scholarship germany", "women in stem", "paris", "france city 7",
+    "computer engineering spain", "excellence scholarship 12345", "informatics austria", "zzz",
+    "university", "selected netherlands universities partial",
+]
+
+
+def exhaustive_top_k(index, query, k):
+    """Score every document containing a query term, no pruning"""
+    terms = {index.vocabulary[token] for token in tokenize(query) if token in index.vocabulary}
+    terms = sorted(terms, key=lambda term: (-index.max_impact[term], term))
+    scores = np.zeros(index.size)
+    for term in terms:
+        docs, impacts = index._postings(term)
+        scores[docs] += impacts
+    hit = np.flatnonzero(scores > 0)
+    order = np.lexsort((hit, -scores[hit]))[:k]
+    return hit[order], scores[hit][order]
+
+
+def run(n_universities: int = 80_000, n_scholarships: int = 20_000, k: int = 10, repeat: int = 50):
+    catalog = UniversityCatalog.from_frame(make_universities_frame(n_universities))
+    snapshot = CatalogSnapshot(1, catalog, make_scholarships_frame(n_scholarships), {})
+
+    start = time.perf_counter()
+    search_index = CatalogSearchIndex(snapshot)
+    print(f"documents: {len(search_index.index)}, index build: {time.perf_counter() - start:.2f} s")
+
+    for query in QUERIES:
+        docs, scores = search_index.index.search(query, k)
+        expected_docs, expected_scores = exhaustive_top_k(search_index.index, query, k)
+        assert np.allclose(scores, expected_scores) and docs.tolist() == expected_docs.tolist(), query
+
+    timings = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            search_index.search(query, k)
+            timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    print(f"queries: {len(timings)} (top {k})")
+    print(f"p50: {np.percentile(timings, 50):8.1f} us")
+    print(f"p99: {np.percentile(timings, 99):8.1f} us")
+    print(f"max: {timings.max():8.1f} us")
+
+    print(f"{'query':>42} {'us':>8}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            search_index.search(query, k)
+        print(f"{query:>42} {(time.perf_counter() - start) / repeat * 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,95 @@
+"""
+Benchmark: CSV vs SQLite storage backends
+
+Runs in a temporary data directory holding synthetic universities.csv and
+scholarships.csv, migrated to catalog.db with data_fetcher.migrate_to_sqlite.
+For each backend the catalog snapshot load and the filtering entry points are
+timed: recommend_universities, find_affordable_universities,
+match_scholarships and the scholarship fetchers. Their results must be
+identical under both backends. Indexes and WAL mode are checked on the
+migrated database.
+
+Run from backend/:
+    python -m benchmarks.bench_storage
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_data import make_scholarships_frame, make_universities_frame
+from data_fetcher import fetch_scholarships
+from data_fetcher.catalog_snapshot import reload_catalog_snapshot
+from data_fetcher.migrate_to_sqlite import migrate
+from data_fetcher.storage import DATABASE_FILE, STORAGE_ENV, SQLITE_INDEXES, get_storage
+from modules.cost_roi_analysis import find_affordable_universities, match_scholarships
+from modules.recommendation_engine import recommend_universities
+
+
+class Profile:
+    def __init__(self, **fields):
+        self.__dict__.update({"gpa": 3.0, "ielts": None, "budget": None, "country": None, "field": None, **fields})
+
+
+QUERIES = {
+    "recommend (ielts, budget)": lambda: recommend_universities(Profile(ielts=6.0, budget=2000)),
+    "recommend (country, field)": lambda: recommend_universities(Profile(ielts=7.5, country="finland", field="data")),
+    "recommend (no match)": lambda: recommend_universities(Profile(ielts=5.0, budget=500)),
+    "find_affordable": lambda: find_affordable_universities(None, 4000),
+    "match_scholarships": lambda: match_scholarships(None, "Austria"),
+    "scholarships by country": lambda: fetch_scholarships.fetch_scholarships_by_country("Italy"),
+    "scholarships by eligibility": lambda: fetch_scholarships.fetch_scholarships_by_eligibility("indian"),
+    "filter_scholarships": lambda: fetch_scholarships.filter_scholarships(country="Spain", coverage="Full", min_amount=25000)
+}
+
+
+def time_call(call, repeat: int):
+    result = call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return result, (time.perf_counter() - start) / repeat * 1e3
+
+
+def run(n_universities: int = 100_000, n_scholarships: int = 20_000, repeat: int = 20):
+    previous_dir, previous_backend = os.getcwd(), os.environ.get(STORAGE_ENV)
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "data"))
+        os.chdir(directory)
+        try:
+            make_universities_frame(n_universities).to_csv(os.path.join("data", "universities.csv"), index=False)
+            make_scholarships_frame(n_scholarships).to_csv(os.path.join("data", "scholarships.csv"), index=False)
+            start = time.perf_counter()
+            migrate(os.path.join("data", DATABASE_FILE))
+            print(f"{n_universities} universities, {n_scholarships} scholarships; migration: {time.perf_counter() - start:.2f} s")
+
+            results, timings = {}, {}
+            for backend in ("csv", "sqlite"):
+                os.environ[STORAGE_ENV] = backend
+                start = time.perf_counter()
+                reload_catalog_snapshot()
+                timings[(backend, "snapshot load")] = (time.perf_counter() - start) * 1e3
+                for name, call in QUERIES.items():
+                    results[(backend, name)], timings[(backend, name)] = time_call(call, repeat)
+
+            connection = get_storage().connection()
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert indexes == {f"idx_{table}_{column}" for table, columns in SQLITE_INDEXES.items() for column in columns}
+
+            print(f"{'':<30} {'csv ms':>9} {'sqlite ms':>10}")
+            for name in ["snapshot load"] + list(QUERIES):
+                if name in QUERIES:
+                    assert results[("csv", name)] == results[("sqlite", name)], f"{name}: backends disagree"
+                print(f"{name:<30} {timings[('csv', name)]:>9.2f} {timings[('sqlite', name)]:>10.2f}")
+            print("results identical under both backends")
+        finally:
+            os.chdir(previous_dir)
+            if previous_backend is None:
+                os.environ.pop(STORAGE_ENV, None)
+            else:
+                os.environ[STORAGE_ENV] = previous_backend
+
+
+if __name__ == "__main__":
+    run()
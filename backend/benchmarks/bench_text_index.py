@@ -0,0 +1,54 @@
+"""
+Benchmark: trigram index vs scanning for case-insensitive substring matches
+
+Uses a catalog where every row has its own field text (the worst case for
+the categorical scan) and also searches university names.
+
+Run from backend/:
+    python -m benchmarks.bench_text_index
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import FIELDS, make_universities_frame
+from utils.text_index import TrigramIndex
+
+QUERIES = ["ai", "data science", "robotics", "computer science / ai", "university 4242", "zzz"]
+
+
+def _time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(n_rows: int = 100_000, repeat: int = 20):
+    df = make_universities_frame(n_rows)
+    rng = np.random.default_rng(5)
+    df["field"] = [f"{field} track {i}" for i, field in enumerate(rng.choice(FIELDS, n_rows))]
+    texts = df["field"].tolist() + df["university"].tolist()
+
+    start = time.perf_counter()
+    index = TrigramIndex(texts)
+    print(f"texts: {len(texts)}, index build: {time.perf_counter() - start:.2f} s")
+    print(f"{'query':>24} {'hits':>7} {'index us':>10} {'scan us':>10} {'pandas us':>10}")
+
+    lowered = [text.lower() for text in texts]
+    series = pd.concat([df["field"], df["university"]], ignore_index=True)
+    for query in QUERIES:
+        q = query.lower()
+        expected = [i for i, text in enumerate(lowered) if q in text]
+        assert index.search(query).tolist() == expected
+
+        index_us = _time_per_call(lambda: index.search(query), repeat)
+        scan_us = _time_per_call(lambda: [i for i, text in enumerate(lowered) if q in text], repeat)
+        pandas_us = _time_per_call(lambda: series.str.contains(query, case=False, regex=False), max(1, repeat // 4))
+        print(f"{query:>24} {len(expected):>7} {index_us:>10.1f} {scan_us:>10.1f} {pandas_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
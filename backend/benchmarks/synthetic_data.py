@@ -0,0 +1,47 @@
+"""
+Synthetic catalog generator shared by the benchmark scripts
+"""
+
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ["France", "Germany", "Netherlands", "Belgium", "Finland", "Italy", "Spain", "Austria"]
+FIELDS = [
+    "Computer Science / AI", "AI / Data Science", "Informatics / AI", "Computer Science",
+    "AI / Robotics", "AI / Engineering", "Data Science / AI", "Computer Engineering", "AI / Data Analytics"
+]
+
+
+def make_universities_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a universities.csv-shaped DataFrame with n_rows random rows"""
+    rng = np.random.default_rng(seed)
+    countries = rng.choice(COUNTRIES, n_rows)
+    return pd.DataFrame({
+        "university": [f"University {i}" for i in range(n_rows)],
+        "country": countries,
+        "city": [f"{country} City {i % 50}" for i, country in enumerate(countries)],
+        "field": rng.choice(FIELDS, n_rows),
+        "ielts_required": rng.choice([5.5, 6.0, 6.5, 7.0, 7.5], n_rows),
+        "average_fees_eur": rng.integers(20, 300, n_rows) * 50,
+        "ranking": rng.integers(1, 1000, n_rows),
+        "course_url": [f"https://example.edu/{i}" for i in range(n_rows)],
+    })
+
+
+SCHOLARSHIP_PREFIXES = ["Excellence", "Merit", "Global", "Mobility", "Research", "Talent", "Future Leaders", "Women in STEM"]
+ELIGIBILITY = ["Merit-based", "Need-based", "Indian Students", "EU Students", "International Students", "Research Track"]
+COVERAGE = ["Full", "Partial", "Tuition Only", "Living Costs"]
+
+
+def make_scholarships_frame(n_rows: int, seed: int = 43) -> pd.DataFrame:
+    """Build a scholarships.csv-shaped DataFrame with n_rows random rows"""
+    rng = np.random.default_rng(seed)
+    countries = rng.choice(COUNTRIES, n_rows)
+    return pd.DataFrame({
+        "scholarship_name": [f"{prefix} Scholarship {i}" for i, prefix in enumerate(rng.choice(SCHOLARSHIP_PREFIXES, n_rows))],
+        "country": countries,
+        "eligible_universities": [f"Selected {country} Universities" for country in countries],
+        "coverage": rng.choice(COVERAGE, n_rows),
+        "amount_eur": rng.integers(10, 300, n_rows) * 100,
+        "eligibility": rng.choice(ELIGIBILITY, n_rows),
+    })
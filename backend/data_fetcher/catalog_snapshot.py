@@ -0,0 +1,241 @@
+"""
+Catalog Snapshot Module
+Versioned in-memory copy of the universities and scholarships (from the
+configured storage backend, see data_fetcher/storage.py) with hot reload
+
+A snapshot is never modified once published. When a CSV changes, a new
+snapshot (and every registered index over it) is built off the request path
+and published with a single reference assignment. Requests hold on to the
+snapshot they started with, so a reload never changes data under them.
+"""
+
+import itertools
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from data_fetcher.fetch_universities import UniversityCatalog
+from data_fetcher.storage import get_storage
+
+WATCH_INTERVAL_SECONDS = 2.0
+
+# (mtime in ns, size in bytes) of a source file, None if it does not exist
+# (SQLite storage stamps the database and its -wal file as a pair)
+FileStamp = Optional[Tuple[int, int]]
+
+
+class CatalogSnapshot:
+    """Immutable catalog data as of one version"""
+
+    def __init__(
+        self,
+        version: int,
+        universities: UniversityCatalog,
+        scholarships: Optional[pd.DataFrame],
+        stamps: Dict[str, FileStamp]
+    ):
+        self.version = version
+        self.universities = universities
+        self.scholarships = scholarships
+        self.stamps = stamps
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, key: str, builder: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """
+        Get a structure computed from this snapshot as a whole (e.g. an index
+        spanning universities and scholarships), building it on first use
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_build_lock = threading.Lock()
+_versions = itertools.count(1)
+_index_builders: Dict[str, Callable[[UniversityCatalog], Any]] = {}
+_snapshot_index_builders: Dict[str, Callable[[CatalogSnapshot], Any]] = {}
+_watcher: Optional["CatalogWatcher"] = None
+
+
+def register_catalog_index(key: str, builder: Callable[[UniversityCatalog], Any]):
+    """
+    Register an index derived from the university catalog
+
+    Registered indexes are built together with each new snapshot, before it is
+    published, so the first request against a fresh snapshot does not pay for them.
+    """
+    _index_builders[key] = builder
+
+
+def warm_catalog_indexes(catalog: UniversityCatalog):
+    """Build every registered index for a catalog ahead of its first query"""
+    for key, builder in _index_builders.items():
+        catalog.derived(key, builder)
+
+
+def register_snapshot_index(key: str, builder: Callable[[CatalogSnapshot], Any]):
+    """Register an index derived from a whole snapshot; built before each snapshot is published"""
+    _snapshot_index_builders[key] = builder
+
+
+def warm_snapshot_indexes(snapshot: CatalogSnapshot):
+    """Build the registered catalog and snapshot indexes for a snapshot"""
+    warm_catalog_indexes(snapshot.universities)
+    for key, builder in _snapshot_index_builders.items():
+        snapshot.derived(key, builder)
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """
+    Get the current snapshot, loading the first one on demand
+
+    Raises:
+        FileNotFoundError: If universities.csv cannot be found
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        with _build_lock:
+            snapshot = _snapshot or _publish(_build_snapshot())
+    return snapshot
+
+
+def get_university_catalog() -> UniversityCatalog:
+    """Get the university catalog of the current snapshot"""
+    return get_catalog_snapshot().universities
+
+
+def pushdown_storage(snapshot: Optional[CatalogSnapshot] = None):
+    """
+    The storage backend if it can answer filters with indexed queries for a
+    snapshot (the current one by default), else None: filter in memory
+
+    Pushed-down queries read the live database, not the snapshot. They are
+    only used while the database stamps still equal the snapshot's, so results
+    match the version the request resolved names against (and reports); from
+    a change until the watcher publishes it, requests filter the snapshot.
+    A commit landing between the check and the query is still seen.
+    """
+    storage = get_storage()
+    if not storage.pushdown:
+        return None
+    if snapshot is None:
+        snapshot = get_catalog_snapshot()
+    return storage if storage.source_stamps() == snapshot.stamps else None
+
+
+def reload_catalog_snapshot(force: bool = True) -> CatalogSnapshot:
+    """
+    Rebuild the snapshot from disk and publish it
+
+    Args:
+        force: Rebuild even if neither file's mtime and size changed
+    """
+    with _build_lock:
+        current = _snapshot
+        if not force and current is not None and _source_stamps() == current.stamps:
+            return current
+        return _publish(_build_snapshot())
+
+
+def _publish(snapshot: CatalogSnapshot) -> CatalogSnapshot:
+    global _snapshot
+    _snapshot = snapshot
+    return snapshot
+
+
+def source_stamp(name: str) -> FileStamp:
+    """Current stamp of a source ("universities" or "scholarships", plus "universities_log" for CSV storage)"""
+    return get_storage().source_stamps()[name]
+
+
+def _source_stamps() -> Dict[str, FileStamp]:
+    return get_storage().source_stamps()
+
+
+def _build_snapshot() -> CatalogSnapshot:
+    storage = get_storage()
+    # Stamp before parsing: a write landing mid-parse shows up as a change next time
+    stamps = storage.source_stamps()
+
+    universities = storage.read_university_catalog()
+    scholarships = storage.read_scholarships()
+
+    snapshot = CatalogSnapshot(next(_versions), universities, scholarships, stamps)
+    warm_snapshot_indexes(snapshot)
+    return snapshot
+
+
+class CatalogWatcher(threading.Thread):
+    """Background thread that polls the CSV files and hot-swaps the snapshot when they change"""
+
+    def __init__(self, interval: float = WATCH_INTERVAL_SECONDS):
+        super().__init__(name="catalog-watcher", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._changed = threading.Event()
+
+    def run(self):
+        failed_stamps = None
+        while not self._stopped.is_set():
+            self._changed.wait(self.interval)
+            self._changed.clear()
+            if self._stopped.is_set():
+                break
+            current = _snapshot
+            stamps = _source_stamps()
+            if stamps == failed_stamps or (current is not None and stamps == current.stamps):
+                continue
+            try:
+                reload_catalog_snapshot(force=False)
+                failed_stamps = None
+            except Exception as e:
+                # Keep serving the last good snapshot; a half-written file is
+                # retried as soon as it changes again
+                failed_stamps = stamps
+                print(f"Warning: catalog reload failed, keeping version {current.version if current else None}: {str(e)}")
+
+    def notify(self):
+        """Check the files now instead of at the next poll"""
+        self._changed.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._changed.set()
+
+
+def start_catalog_watcher(interval: float = WATCH_INTERVAL_SECONDS) -> CatalogWatcher:
+    """Start the process-wide catalog watcher (once)"""
+    global _watcher
+    if _watcher is None or not _watcher.is_alive():
+        _watcher = CatalogWatcher(interval)
+        _watcher.start()
+    return _watcher
+
+
+def notify_catalog_changed():
+    """
+    Tell the watcher a source file was just written so it reloads without
+    waiting for the next poll (bursts of writes share one rebuild); without a
+    running watcher, reload right away
+    """
+    watcher = _watcher
+    if watcher is not None and watcher.is_alive():
+        watcher.notify()
+    else:
+        reload_catalog_snapshot(force=False)
+
+
+def stop_catalog_watcher():
+    """Stop the process-wide catalog watcher"""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,261 @@
+"""
+Columnar Cache Module
+Binary copy of the parsed universities catalog kept next to the CSV, so a
+starting worker memory-maps arrays instead of parsing CSV text
+
+The cache for universities.csv lives in universities.csv.columns/<key>/,
+where key is a hash of the inode, mtime and size of the CSV, its
+write-ahead log and its fold marker. Checking for a cache costs three stat
+calls, and no file contents are read. Any write to a source replaces or grows
+a file, which changes the key, so a stale cache is never read: the next load
+parses the CSV, writes a new cache directory and removes the old ones. Each
+directory holds:
+
+- manifest.json: format version, row count, column names and kinds
+- one .npy file per numeric column, and one int32 code file per text or
+  categorical column (-1 marks a missing value)
+- strings.npy / strings.offsets.npy: the string table the codes point into,
+  as concatenated UTF-8 bytes and the byte offset where each string starts
+
+Everything is loaded with mmap, so every worker on a host shares the same
+page-cache pages. Category values (countries, cities, fields) are decoded
+when the cache loads. Text columns stay as codes, and a string is decoded
+only when its row is read. Set CATALOG_COLUMNAR_CACHE=0 to always parse the
+CSV.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher.fetch_universities import UniversityCatalog
+from data_fetcher.university_log import catalog_lock, fold_path, log_path, merge_universities, parse_log, read_log_data
+
+CACHE_ENV = "CATALOG_COLUMNAR_CACHE"
+CACHE_SUFFIX = ".columns"
+CACHE_FORMAT = 2
+MANIFEST_FILE = "manifest.json"
+STRINGS_FILE = "strings.npy"
+OFFSETS_FILE = "strings.offsets.npy"
+
+
+class UncacheableCatalog(ValueError):
+    """A column the cache format cannot represent exactly"""
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def cache_root(base_path: str) -> str:
+    return base_path + CACHE_SUFFIX
+
+
+def source_key(base_path: str) -> str:
+    """
+    Hash of the inode, mtime and size of a base CSV, its log and its fold marker
+
+    Raises:
+        FileNotFoundError: If the base CSV does not exist
+    """
+    stamps = []
+    for path in (base_path, log_path(base_path), fold_path(base_path)):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if path == base_path:
+                raise
+            stamps.append(None)
+            continue
+        stamps.append([stat.st_ino, stat.st_mtime_ns, stat.st_size])
+    return hashlib.sha256(json.dumps(stamps).encode("utf-8")).hexdigest()[:32]
+
+
+class MappedStrings:
+    """
+    The cache's string table, decoding only the entries it is indexed with
+
+    ``strings[codes]`` returns an object array of the same shape, like
+    indexing an array of str would, with NaN for code -1.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, codes: np.ndarray) -> np.ndarray:
+        codes = np.asarray(codes)
+        flat = codes.ravel()
+        present = flat >= 0
+        starts = np.zeros(len(flat), dtype=np.int64)
+        ends = np.zeros(len(flat), dtype=np.int64)
+        starts[present] = self.offsets[flat[present]]
+        ends[present] = self.offsets[flat[present] + 1]
+        buffer = memoryview(self.data)
+        values = np.empty(len(flat), dtype=object)
+        values[:] = [
+            str(buffer[start:end], "utf-8") if keep else np.nan
+            for start, end, keep in zip(starts.tolist(), ends.tolist(), present.tolist())
+        ]
+        return values.reshape(codes.shape)
+
+
+def load_university_catalog(base_path: str) -> UniversityCatalog:
+    """
+    The catalog of a base CSV and its log, from the columnar cache when it is current
+
+    Raises:
+        FileNotFoundError: If the base CSV does not exist
+    """
+    # The key and the bytes parsed on a miss come from the same locked window
+    with catalog_lock(base_path, exclusive=False):
+        key = source_key(base_path) if cache_enabled() else None
+        if key is not None:
+            catalog = read_cache(base_path, key)
+            if catalog is not None:
+                return catalog
+        with open(base_path, "rb") as base_file:
+            data = base_file.read()
+        log_data = read_log_data(base_path)
+
+    df = merge_universities(pd.read_csv(io.BytesIO(data)), parse_log(log_data))
+    catalog = UniversityCatalog.from_frame(df, source_path=base_path)
+    if key is None:
+        return catalog
+    try:
+        write_cache(catalog, base_path, key)
+    except (OSError, UncacheableCatalog) as e:
+        print(f"Warning: Could not write the columnar cache for {base_path}: {str(e)}")
+        return catalog
+    # Serve this worker from the mapped files too, like every other worker
+    return read_cache(base_path, key) or catalog
+
+
+def read_cache(base_path: str, key: str) -> Optional[UniversityCatalog]:
+    """The cached catalog for key, or None if there is none (or it cannot be read)"""
+    directory = os.path.join(cache_root(base_path), key)
+    if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("format") != CACHE_FORMAT:
+            return None
+
+        strings = MappedStrings(_load_array(directory, STRINGS_FILE), _load_array(directory, OFFSETS_FILE))
+        if len(strings) != manifest["strings"]:
+            return None
+
+        columns, codes, categories, text = {}, {}, {}, {}
+        for i, spec in enumerate(manifest["columns"]):
+            name, kind = spec["name"], spec["kind"]
+            values = _load_array(directory, f"{i}.npy")
+            if kind == "numeric":
+                columns[name] = values
+            elif kind == "text":
+                text[name] = (values, strings)
+            else:
+                codes[name] = values
+                categories[name] = strings[_load_array(directory, f"{i}.categories.npy")]
+    except (OSError, ValueError, KeyError) as e:
+        # Removed by a newer worker mid-read, or damaged: parse the CSV instead
+        print(f"Warning: Ignoring the columnar cache in {directory}: {str(e)}")
+        return None
+    catalog = UniversityCatalog(columns, codes, categories, [spec["name"] for spec in manifest["columns"]], base_path, text)
+    if len(catalog) != manifest["rows"]:
+        return None
+    return catalog
+
+
+def _load_array(directory: str, file_name: str) -> np.ndarray:
+    # A plain ndarray view of the read-only mapping (not an np.memmap)
+    return np.asarray(np.load(os.path.join(directory, file_name), mmap_mode="r", allow_pickle=False))
+
+
+def write_cache(catalog: UniversityCatalog, base_path: str, key: str):
+    """
+    Write the cache directory for key and remove the caches of older sources
+
+    The files are written to a temp directory and renamed into place, so
+    readers only ever see a complete cache.
+
+    Raises:
+        UncacheableCatalog: If a column holds values the format cannot round-trip
+        OSError: If the directory cannot be written
+    """
+    root = cache_root(base_path)
+    os.makedirs(root, exist_ok=True)
+    temp_directory = tempfile.mkdtemp(prefix=".tmp-", dir=root)
+    try:
+        strings: List[str] = []
+        specs = []
+        for i, name in enumerate(catalog.column_names):
+            if name in catalog.codes:
+                np.save(os.path.join(temp_directory, f"{i}.npy"), catalog.codes[name].astype(np.int32))
+                np.save(os.path.join(temp_directory, f"{i}.categories.npy"), _encode_strings(catalog.categories[name], strings, name))
+                specs.append({"name": name, "kind": "categorical"})
+                continue
+            values = catalog.column(name)
+            if values.dtype.kind in "biuf":
+                np.save(os.path.join(temp_directory, f"{i}.npy"), values)
+                specs.append({"name": name, "kind": "numeric"})
+            elif values.dtype == object:
+                np.save(os.path.join(temp_directory, f"{i}.npy"), _encode_strings(values, strings, name))
+                specs.append({"name": name, "kind": "text"})
+            else:
+                raise UncacheableCatalog(f"column {name} has unsupported dtype {values.dtype}")
+
+        try:
+            encoded = [value.encode("utf-8") for value in strings]
+        except UnicodeEncodeError as e:
+            raise UncacheableCatalog(f"a string cannot be stored as UTF-8: {str(e)}")
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        np.save(os.path.join(temp_directory, STRINGS_FILE), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        np.save(os.path.join(temp_directory, OFFSETS_FILE), offsets)
+        # The manifest goes last: a directory without one is never read
+        with open(os.path.join(temp_directory, MANIFEST_FILE), "w") as manifest_file:
+            json.dump({"format": CACHE_FORMAT, "rows": len(catalog), "strings": len(strings), "columns": specs}, manifest_file)
+        os.chmod(temp_directory, 0o755)
+
+        try:
+            os.rename(temp_directory, os.path.join(root, key))
+        except OSError:
+            # Another worker cached the same source first
+            if not os.path.isdir(os.path.join(root, key)):
+                raise
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+    _remove_stale(root, keep=key)
+
+
+def _encode_strings(values: np.ndarray, strings: List[str], name: str) -> np.ndarray:
+    """Append a column's distinct strings to the dictionary and return its codes (-1 = NaN)"""
+    column_codes, uniques = pd.factorize(values)
+    missing = values[column_codes == -1]
+    if not all(isinstance(value, float) for value in missing):
+        raise UncacheableCatalog(f"column {name} has missing values other than NaN")
+    uniques = list(uniques)
+    if not all(isinstance(value, str) for value in uniques):
+        raise UncacheableCatalog(f"column {name} has values that are not plain strings")
+    offset = len(strings)
+    strings.extend(uniques)
+    return np.where(column_codes == -1, -1, column_codes + offset).astype(np.int32)
+
+
+def _remove_stale(root: str, keep: str):
+    # Workers still mapping a removed cache keep their pages until they reload
+    for entry in os.listdir(root):
+        if entry != keep and not entry.startswith("."):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
@@ -3,31 +3,44 @@ Scholarship Data Fetcher Module
 Provides utilities to fetch, validate, and manage scholarship data
 """
 
-import pandas as pd
-import os
+import numpy as np
 from typing import List, Dict
 
-def fetch_scholarships_by_country(country: str) -> List[Dict]:
+from data_fetcher.catalog_snapshot import pushdown_storage
+from data_fetcher.scholarship_store import get_scholarship_store, scholarship_statistics
+
+
+def _pushed_down(snapshot=None, **filters):
+    """
+    Scholarships matching the filters through an indexed SQL query when the
+    storage backend supports it and holds the snapshot's (default: the
+    current one's) data, else None (use the in-memory store)
+    """
+    storage = pushdown_storage(snapshot)
+    if storage is None:
+        return None
+    return storage.scholarships(**filters) or []
+
+def fetch_scholarships_by_country(country: str, snapshot=None) -> List[Dict]:
     """
     Fetch scholarships available in a specific country
     
     Args:
-        country (str): Country name to filter scholarships
+        country (str): Country name as spelled in the scholarship data (callers
+            resolve user input with modules.name_resolver first)
+        snapshot (CatalogSnapshot, optional): Snapshot to read (default: the current one)
         
     Returns:
         List[Dict]: List of scholarships available in that country
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
     try:
-        df = pd.read_csv(csv_path)
-        scholarships = df[df["country"] == country]
-        return scholarships.to_dict(orient="records")
+        scholarships = _pushed_down(snapshot, country=country)
+        if scholarships is not None:
+            return scholarships
+        store = get_scholarship_store(snapshot)
+        if store is None:
+            return []
+        return store.get(store.rows_equal("country", country))
     except Exception as e:
         print(f"Error fetching scholarships for {country}: {str(e)}")
         return []
@@ -40,16 +53,14 @@ def fetch_all_scholarships() -> List[Dict]:
     Returns:
         List[Dict]: List of all scholarships
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
     try:
-        df = pd.read_csv(csv_path)
-        return df.to_dict(orient="records")
+        scholarships = _pushed_down()
+        if scholarships is not None:
+            return scholarships
+        store = get_scholarship_store()
+        if store is None:
+            return []
+        return store.get()
     except Exception as e:
         print(f"Error fetching all scholarships: {str(e)}")
         return []
@@ -65,17 +76,14 @@ def fetch_scholarships_by_coverage(coverage_type: str) -> List[Dict]:
     Returns:
         List[Dict]: List of scholarships matching the coverage type
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
     try:
-        df = pd.read_csv(csv_path)
-        scholarships = df[df["coverage"] == coverage_type]
-        return scholarships.to_dict(orient="records")
+        scholarships = _pushed_down(coverage=coverage_type)
+        if scholarships is not None:
+            return scholarships
+        store = get_scholarship_store()
+        if store is None:
+            return []
+        return store.get(store.rows_equal("coverage", coverage_type))
     except Exception as e:
         print(f"Error fetching scholarships with coverage {coverage_type}: {str(e)}")
         return []
@@ -91,89 +99,81 @@ def fetch_scholarships_by_eligibility(eligibility: str) -> List[Dict]:
     Returns:
         List[Dict]: List of scholarships matching the eligibility
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
     try:
-        df = pd.read_csv(csv_path)
-        scholarships = df[df["eligibility"].str.contains(eligibility, case=False, na=False)]
-        return scholarships.to_dict(orient="records")
+        scholarships = _pushed_down(eligibility=eligibility)
+        if scholarships is not None:
+            return scholarships
+        store = get_scholarship_store()
+        if store is None:
+            return []
+        return store.get(store.rows_matching_eligibility(eligibility))
     except Exception as e:
         print(f"Error fetching scholarships with eligibility {eligibility}: {str(e)}")
         return []
 
 
-def get_scholarship_statistics() -> Dict:
+def get_scholarship_statistics(snapshot=None) -> Dict:
     """
     Get statistics about available scholarships
     
+    Args:
+        snapshot (CatalogSnapshot, optional): Snapshot to read (default: the current one)
+    
     Returns:
         Dict: Statistics including count by country, coverage type, etc.
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return {"error": "Scholarships data file not found"}
-    
     try:
-        df = pd.read_csv(csv_path)
+        # Maintained incrementally; only rebuilt when the file changes outside the app
+        statistics = scholarship_statistics(snapshot)
+        if statistics is None:
+            return {"error": "Scholarships data file not found"}
         
-        return {
-            "total_scholarships": len(df),
-            "countries": df["country"].nunique(),
-            "by_country": df["country"].value_counts().to_dict(),
-            "by_coverage": df["coverage"].value_counts().to_dict(),
-            "total_funding_available": df["amount_eur"].sum(),
-            "average_scholarship_amount": round(df["amount_eur"].mean(), 2)
-        }
+        return statistics
     except Exception as e:
         print(f"Error generating scholarship statistics: {str(e)}")
         return {"error": str(e)}
 
 
-def filter_scholarships(country=None, coverage=None, min_amount=None, max_amount=None) -> List[Dict]:
+def filter_scholarships(country=None, coverage=None, min_amount=None, max_amount=None, snapshot=None) -> List[Dict]:
     """
     Advanced filtering for scholarships with multiple criteria
     
     Args:
-        country (str, optional): Filter by country
+        country (str, optional): Filter by country (as spelled in the data)
         coverage (str, optional): Filter by coverage type
         min_amount (float, optional): Minimum scholarship amount
         max_amount (float, optional): Maximum scholarship amount
+        snapshot (CatalogSnapshot, optional): Snapshot to read (default: the current one)
         
     Returns:
         List[Dict]: Filtered list of scholarships
     """
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
     try:
-        df = pd.read_csv(csv_path)
+        scholarships = _pushed_down(
+            snapshot,
+            country=country or None,
+            coverage=coverage or None,
+            min_amount=min_amount,
+            max_amount=max_amount
+        )
+        if scholarships is not None:
+            return scholarships
+        store = get_scholarship_store(snapshot)
+        if store is None:
+            return []
         
-        # Apply filters
+        # Apply filters (each narrows the rows, which stay in file order)
+        rows = np.arange(len(store))
         if country:
-            df = df[df["country"] == country]
+            rows = np.intersect1d(rows, store.rows_equal("country", country))
         
         if coverage:
-            df = df[df["coverage"] == coverage]
-        
-        if min_amount is not None:
-            df = df[df["amount_eur"] >= min_amount]
+            rows = np.intersect1d(rows, store.rows_equal("coverage", coverage))
         
-        if max_amount is not None:
-            df = df[df["amount_eur"] <= max_amount]
+        if min_amount is not None or max_amount is not None:
+            rows = np.intersect1d(rows, store.rows_in_amount_range(min_amount, max_amount))
         
-        return df.to_dict(orient="records")
+        return store.get(rows)
     except Exception as e:
         print(f"Error filtering scholarships: {str(e)}")
         return []
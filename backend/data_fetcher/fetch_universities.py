@@ -0,0 +1,159 @@
+"""
+University Data Fetcher Module
+Columnar in-memory representation of universities.csv
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class UniversityCatalog:
+    """
+    Read-only columnar view of the universities dataset
+
+    Numeric and free-text columns are kept as NumPy arrays with the dtypes
+    pandas inferred from the CSV. Country, city and field are stored as
+    categorical codes (int32) plus an array of their distinct values, so
+    equality and substring filters only have to look at each distinct value once.
+
+    A catalog read from the columnar cache can also hold text columns as
+    ``text[name] = (codes, strings)``: codes into a shared string table that
+    decodes only the entries it is indexed with, so rows are turned into
+    Python strings when they are read rather than when the catalog loads.
+    """
+
+    CATEGORICAL_COLUMNS = ("country", "city", "field")
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        column_names: Sequence[str],
+        source_path: Optional[str] = None,
+        text: Optional[Dict[str, Tuple[np.ndarray, Any]]] = None
+    ):
+        self.columns = columns
+        self.codes = codes
+        self.categories = categories
+        self.text = text or {}
+        self.column_names = list(column_names)
+        self.source_path = source_path
+        first = self.column_names[0] if self.column_names else None
+        if first is None:
+            self.size = 0
+        elif first in codes:
+            self.size = len(codes[first])
+        elif first in self.text:
+            self.size = len(self.text[first][0])
+        else:
+            self.size = len(columns[first])
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source_path: Optional[str] = None) -> "UniversityCatalog":
+        """Build a catalog from a DataFrame, factorizing the categorical columns"""
+        columns, codes, categories = {}, {}, {}
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if name in cls.CATEGORICAL_COLUMNS:
+                # Missing values become their own category so lookups stay total
+                column_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                codes[name] = column_codes.astype(np.int32)
+                categories[name] = np.asarray(uniques, dtype=object)
+            else:
+                columns[name] = values
+        return cls(columns, codes, categories, df.columns, source_path)
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "UniversityCatalog":
+        """Parse a universities CSV file into a catalog"""
+        return cls.from_frame(pd.read_csv(csv_path), source_path=csv_path)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def has_column(self, name: str) -> bool:
+        return name in self.columns or name in self.codes or name in self.text
+
+    def column(self, name: str, default: Any = None) -> np.ndarray:
+        """
+        Get a full-length column as an array
+
+        Categorical columns are decoded back to their values. A missing column
+        raises KeyError unless a default is given, mirroring ``row.get(name, default)``.
+        """
+        if name in self.codes:
+            return self.categories[name][self.codes[name]]
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.text:
+            text_codes, strings = self.text[name]
+            return strings[text_codes]
+        if default is None:
+            raise KeyError(name)
+        return np.full(self.size, default)
+
+    def take(self, name: str, rows: np.ndarray, default: Any = None) -> np.ndarray:
+        """Get a column's values at the given row positions without decoding the whole column"""
+        if name in self.codes:
+            return self.categories[name][self.codes[name][rows]]
+        if name in self.columns:
+            return self.columns[name][rows]
+        if name in self.text:
+            text_codes, strings = self.text[name]
+            return strings[text_codes[rows]]
+        if default is None:
+            raise KeyError(name)
+        return np.full(len(rows), default)
+
+    def category_mask(self, name: str, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """Boolean row mask for a categorical column, evaluating predicate once per distinct value"""
+        categories = self.categories[name]
+        matches = np.fromiter((predicate(value) for value in categories), dtype=bool, count=len(categories))
+        return matches[self.codes[name]]
+
+    def records(self, rows: Optional[np.ndarray] = None, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Materialize rows as plain-Python dicts (same shape as ``df.to_dict(orient="records")``)
+
+        Args:
+            rows: Row positions to return, in order (all rows if omitted)
+            columns: Columns to include (all columns if omitted)
+        """
+        if rows is None and columns is None:
+            if self._records is None:
+                self._records = self._build_records(None, self.column_names)
+            return [dict(record) for record in self._records]
+        return self._build_records(rows, columns or self.column_names)
+
+    def _build_records(self, rows: Optional[np.ndarray], columns: Sequence[str]) -> List[Dict[str, Any]]:
+        values = []
+        for name in columns:
+            column = self.column(name) if rows is None else self.take(name, rows)
+            values.append(column.tolist())
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def derived(self, key: str, builder: Callable[["UniversityCatalog"], Any]) -> Any:
+        """
+        Get a structure computed from this catalog (an index, a lookup table),
+        building it on first use. It lives and dies with this catalog instance.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+    def to_frame(self) -> pd.DataFrame:
+        """Rebuild a DataFrame with the original column order and dtypes"""
+        return pd.DataFrame({name: self.column(name) for name in self.column_names})
+
@@ -0,0 +1,95 @@
+"""
+CSV to SQLite Migration
+One-shot copy of universities.csv (with any rows still in its write-ahead
+log) and scholarships.csv into the SQLite catalog database, with the indexes
+the SQLite storage backend queries through
+
+Run from backend/ (or the repository root):
+    python -m data_fetcher.migrate_to_sqlite [--db PATH] [--force]
+
+Then start the API with CATALOG_STORAGE=sqlite. The database is built in a
+temp file and renamed into place, so an interrupted run leaves nothing behind.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+
+from data_fetcher.storage import DATABASE_FILE, CsvStorage, connect, create_table
+from utils.helpers import resolve_data_path
+
+
+def migrate(db_path: str, force: bool = False) -> dict:
+    """
+    Build the SQLite catalog database from the CSV files
+
+    Args:
+        db_path: Database file to create
+        force: Replace an existing database
+
+    Returns:
+        Rows copied per table
+
+    Raises:
+        FileExistsError: If db_path exists and force is not set
+        FileNotFoundError: If universities.csv does not exist
+    """
+    if os.path.exists(db_path) and not force:
+        raise FileExistsError(f"{db_path} already exists (use --force to replace it)")
+    csv_storage = CsvStorage()
+    tables = {"universities": csv_storage.read_universities()}
+    scholarships = csv_storage.read_scholarships()
+    if scholarships is not None:
+        tables["scholarships"] = scholarships
+
+    directory = os.path.dirname(os.path.abspath(db_path))
+    fd, temp_path = tempfile.mkstemp(prefix=".catalog-", suffix=".db", dir=directory)
+    os.close(fd)
+    try:
+        # Load in rollback-journal mode so the whole database is in one file when it is renamed
+        connection = sqlite3.connect(temp_path)
+        with connection:
+            for table, df in tables.items():
+                create_table(connection, table, df)
+        # Planner statistics, so the most selective index is picked per query
+        connection.execute("ANALYZE")
+        connection.execute("VACUUM")
+        connection.close()
+
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, db_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Switch the database to WAL mode (persistent)
+    connect(db_path).close()
+    return {table: len(df) for table, df in tables.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Copy the catalog CSV files into the SQLite storage backend's database")
+    parser.add_argument("--db", default=None, help=f"database file (default: data/{DATABASE_FILE})")
+    parser.add_argument("--force", action="store_true", help="replace an existing database")
+    args = parser.parse_args(argv)
+
+    # Next to universities.csv, where the storage backend looks for it
+    db_path = args.db or os.path.join(os.path.dirname(resolve_data_path("universities.csv")), DATABASE_FILE)
+    try:
+        counts = migrate(db_path, force=args.force)
+    except (FileExistsError, FileNotFoundError) as e:
+        print(f"Error: {str(e)}")
+        return 1
+    for table, count in counts.items():
+        print(f"{table}: {count} rows")
+    print(f"Wrote {db_path}; start the API with CATALOG_STORAGE=sqlite to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
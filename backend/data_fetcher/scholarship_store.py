@@ -0,0 +1,257 @@
+"""
+Scholarship Store Module
+Indexed, read-only view of scholarships.csv, built once per catalog snapshot
+
+Rows are kept as ready-made records. Country and coverage lookups go through
+hash indexes, amount ranges through the sorted amount_eur column and
+eligibility searches through a trigram index over the distinct eligibility
+texts, so none of the fetch functions filters a DataFrame per call.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher.catalog_snapshot import FileStamp, get_catalog_snapshot, register_snapshot_index
+from utils.text_index import REGEX_SYNTAX, TrigramIndex, text_test
+
+
+EMPTY_ROWS = np.array([], dtype=np.int64)
+
+
+class ScholarshipStore:
+    """Scholarship records with per-column indexes; results keep file order"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.columns = list(df.columns)
+        self.size = len(df)
+        self.records: List[Dict[str, Any]] = df.to_dict(orient="records")
+
+        # column -> {value: ascending row ids}
+        self.hash_indexes: Dict[str, Dict[Any, np.ndarray]] = {}
+        for name in ("country", "coverage"):
+            if name in df.columns:
+                groups: Dict[Any, List[int]] = {}
+                for row, value in enumerate(df[name].tolist()):
+                    groups.setdefault(value, []).append(row)
+                self.hash_indexes[name] = {value: np.array(rows, dtype=np.int64) for value, rows in groups.items()}
+
+        # amount_eur ascending with its row order; missing amounts sort last
+        self.amount_order = EMPTY_ROWS
+        self.sorted_amounts = np.array([])
+        self.n_amounts = 0
+        if "amount_eur" in df.columns:
+            amounts = df["amount_eur"].to_numpy(dtype=float)
+            self.amount_order = np.argsort(amounts, kind="stable")
+            self.sorted_amounts = amounts[self.amount_order]
+            self.n_amounts = len(amounts) - int(np.isnan(amounts).sum())
+
+        # Distinct eligibility texts, the rows having each, and a substring index over them
+        self.eligibility_values: List[Any] = []
+        self.eligibility_rows: List[np.ndarray] = []
+        self.eligibility_index = None
+        if "eligibility" in df.columns:
+            codes, values = pd.factorize(df["eligibility"])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            self.eligibility_values = values.tolist()
+            self.eligibility_rows = [order[bounds[code]:bounds[code + 1]] for code in range(len(values))]
+            self.eligibility_index = TrigramIndex(self.eligibility_values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Copies of the records at the given rows (all rows if None), in that order"""
+        if rows is None:
+            return [dict(record) for record in self.records]
+        return [dict(self.records[row]) for row in rows.tolist()]
+
+    def rows_equal(self, column: str, value: Any) -> np.ndarray:
+        """Rows whose column equals value, like ``df[df[column] == value]``"""
+        if column not in self.hash_indexes:
+            raise KeyError(column)
+        return self.hash_indexes[column].get(value, EMPTY_ROWS)
+
+    def rows_in_amount_range(self, min_amount: Optional[float] = None, max_amount: Optional[float] = None) -> np.ndarray:
+        """Ascending rows with min_amount <= amount_eur <= max_amount (missing amounts never match)"""
+        if "amount_eur" not in self.columns:
+            raise KeyError("amount_eur")
+        start = 0 if min_amount is None else int(np.searchsorted(self.sorted_amounts[:self.n_amounts], min_amount, side="left"))
+        end = self.n_amounts if max_amount is None else int(np.searchsorted(self.sorted_amounts[:self.n_amounts], max_amount, side="right"))
+        return np.sort(self.amount_order[start:max(start, end)])
+
+    def rows_matching_eligibility(self, pattern: str) -> np.ndarray:
+        """
+        Ascending rows whose eligibility matches a case-insensitive regex,
+        like ``df["eligibility"].str.contains(pattern, case=False, na=False)``
+
+        Plain-text patterns go through the trigram index; anything with regex
+        syntax is matched once per distinct eligibility text.
+        """
+        if self.eligibility_index is None:
+            raise KeyError("eligibility")
+        if REGEX_SYNTAX.search(pattern) is None:
+            codes = self.eligibility_index.search(pattern).tolist()
+        else:
+            matches = text_test(pattern)
+            codes = [code for code, value in enumerate(self.eligibility_values) if isinstance(value, str) and matches(value)]
+        # Missing eligibility (na=False) never matches
+        codes = [code for code in codes if isinstance(self.eligibility_values[code], str)]
+        if not codes:
+            return EMPTY_ROWS
+        return np.sort(np.concatenate([self.eligibility_rows[code] for code in codes]))
+
+
+class ScholarshipStatistics:
+    """
+    Per-country and per-coverage counts, total and average funding, kept up
+    to date one added / removed scholarship at a time
+
+    Counts remember the order values first appeared in, so the result is
+    ordered like value_counts() (most frequent first, ties in file order).
+    The formatted result is cached until the next change.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.by_country: Dict[Any, int] = {}
+        self.by_coverage: Dict[Any, int] = {}
+        self.total = 0
+        self.total_funding = 0
+        self.n_amounts = 0
+        self._result: Optional[Dict[str, Any]] = None
+        columns = [df[name].tolist() if name in df.columns else [None] * len(df) for name in ("country", "coverage", "amount_eur")]
+        for country, coverage, amount in zip(*columns):
+            self._apply(country, coverage, amount, 1)
+
+    def add(self, record: Dict[str, Any]):
+        self._apply(record.get("country"), record.get("coverage"), record.get("amount_eur"), 1)
+
+    def remove(self, record: Dict[str, Any]):
+        self._apply(record.get("country"), record.get("coverage"), record.get("amount_eur"), -1)
+
+    def _apply(self, country, coverage, amount, sign: int):
+        self.total += sign
+        _count(self.by_country, country, sign)
+        _count(self.by_coverage, coverage, sign)
+        amount = _amount(amount)
+        if amount is not None:
+            self.total_funding += sign * amount
+            self.n_amounts += sign
+        self._result = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Same shape as get_scholarship_statistics has always returned"""
+        if self._result is None:
+            self._result = {
+                "total_scholarships": self.total,
+                "countries": len(self.by_country),
+                "by_country": _ranked(self.by_country),
+                "by_coverage": _ranked(self.by_coverage),
+                "total_funding_available": self.total_funding,
+                "average_scholarship_amount": round(self.total_funding / self.n_amounts, 2) if self.n_amounts else float("nan")
+            }
+        result = self._result
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
+
+
+def _count(counts: Dict[Any, int], value, sign: int):
+    # Missing values are not counted (like value_counts)
+    if value is None or value != value:
+        return
+    counts[value] = counts.get(value, 0) + sign
+    if counts[value] <= 0:
+        del counts[value]
+
+
+def _ranked(counts: Dict[Any, int]) -> Dict[Any, int]:
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def _amount(value):
+    """A numeric amount_eur (as it would be parsed from the CSV), or None if missing"""
+    if isinstance(value, str):
+        for parse in (int, float):
+            try:
+                value = parse(value)
+                break
+            except ValueError:
+                continue
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return None
+    return value
+
+
+# Statistics of scholarships.csv as of _statistics_stamp; the app's own writes
+# update them in place, any other change to the file rebuilds them
+_statistics: Optional[ScholarshipStatistics] = None
+_statistics_stamp: FileStamp = None
+_statistics_lock = threading.Lock()
+
+
+def scholarship_statistics(snapshot=None) -> Optional[Dict[str, Any]]:
+    """
+    Statistics of the scholarships in a snapshot (the current one by default),
+    or None if scholarships.csv does not exist
+    """
+    global _statistics, _statistics_stamp
+    if snapshot is None:
+        snapshot = get_catalog_snapshot()
+    stamp = snapshot.stamps.get("scholarships")
+    with _statistics_lock:
+        if _statistics is None or stamp != _statistics_stamp:
+            # First use, or the file was changed outside the app
+            _statistics = ScholarshipStatistics(snapshot.scholarships) if snapshot.scholarships is not None else None
+            _statistics_stamp = stamp
+        return _statistics.as_dict() if _statistics is not None else None
+
+
+def record_scholarship_changes(base, published, added: List[Dict[str, Any]], removed: List[Dict[str, Any]]):
+    """
+    Apply scholarships the app itself just added to / removed from
+    scholarships.csv so statistics stay current without a rebuild
+
+    Call this after publishing the snapshot that holds the write: the
+    statistics are then stamped with the version readers actually see.
+
+    Args:
+        base: Snapshot whose scholarships the write started from
+        published: Snapshot published after the write
+        added: Records appended to the file
+        removed: Records dropped from the file
+    """
+    global _statistics, _statistics_stamp
+    with _statistics_lock:
+        if _statistics is None or _statistics_stamp != base.stamps.get("scholarships"):
+            # Not tracking that version of the file (or a reader already
+            # rebuilt from the published one): nothing to update
+            if _statistics_stamp != published.stamps.get("scholarships"):
+                _statistics = None
+            return
+        for record in added:
+            _statistics.add(record)
+        for record in removed:
+            _statistics.remove(record)
+        _statistics_stamp = published.stamps.get("scholarships")
+
+
+def _build_store(snapshot) -> Optional[ScholarshipStore]:
+    return ScholarshipStore(snapshot.scholarships) if snapshot.scholarships is not None else None
+
+
+def get_scholarship_store(snapshot=None) -> Optional[ScholarshipStore]:
+    """
+    Get the scholarship store of a snapshot (the current one by default),
+    or None if scholarships.csv does not exist
+    """
+    if snapshot is None:
+        snapshot = get_catalog_snapshot()
+    return snapshot.derived("scholarship_store", _build_store)
+
+
+register_snapshot_index("scholarship_store", _build_store)
@@ -0,0 +1,415 @@
+"""
+Catalog Storage Module
+Where universities and scholarships are kept: the CSV files in backend/data
+(the default) or an embedded SQLite database, data/catalog.db
+
+The backend is chosen with the CATALOG_STORAGE environment variable ("csv"
+or "sqlite"). Either way the catalog snapshot is loaded from it and writes go
+through it. The SQLite backend also answers the filtering entry points
+(recommend_universities, find_affordable_universities, match_scholarships and
+the scholarship fetchers) with indexed SQL queries (`pushdown`), instead of
+scanning in-memory columns. Those queries read the live database, so they are
+only run while it still holds the current snapshot's data (see
+catalog_snapshot.pushdown_storage); otherwise the snapshot is filtered.
+
+The database runs in WAL mode, so readers never block the writer, and every
+thread gets its own connection. Create it from the CSV files with:
+    python -m data_fetcher.migrate_to_sqlite
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher.columnar_cache import load_university_catalog
+from data_fetcher.fetch_universities import UniversityCatalog
+from data_fetcher.university_log import (
+    append_universities,
+    commit_universities,
+    log_path,
+    read_universities,
+    replace_csv,
+    schedule_compaction,
+    COMPACT_AFTER_BYTES
+)
+from utils.helpers import resolve_data_path
+from utils.text_index import text_test
+
+STORAGE_ENV = "CATALOG_STORAGE"
+STORAGE_BACKENDS = ("csv", "sqlite")
+DATABASE_FILE = "catalog.db"
+
+# Indexed columns per table
+SQLITE_INDEXES = {
+    "universities": ("country", "field", "average_fees_eur", "ranking", "ielts_required"),
+    "scholarships": ("country", "coverage", "amount_eur", "eligibility")
+}
+
+# Rows inserted per statement batch when loading a staged file
+SQLITE_INSERT_CHUNK_ROWS = 50000
+
+# Names a write may add as new columns (existing columns are taken as they are)
+SQL_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+
+def _file_stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class CsvStorage:
+    """universities.csv (plus its write-ahead log) and scholarships.csv"""
+
+    name = "csv"
+    pushdown = False
+
+    def paths(self) -> Dict[str, str]:
+        universities = resolve_data_path("universities.csv")
+        return {
+            "universities": universities,
+            # Rows added through admin_management.add_university, not yet compacted
+            "universities_log": log_path(universities),
+            "scholarships": resolve_data_path("scholarships.csv")
+        }
+
+    def source_stamps(self) -> Dict[str, Any]:
+        return {name: _file_stamp(path) for name, path in self.paths().items()}
+
+    def source_path(self) -> str:
+        return self.paths()["universities"]
+
+    def read_universities(self) -> pd.DataFrame:
+        """
+        Raises:
+            FileNotFoundError: If universities.csv does not exist
+        """
+        return read_universities(self.paths()["universities"])
+
+    def read_university_catalog(self) -> UniversityCatalog:
+        """
+        The universities as a catalog, memory-mapped from the columnar cache when it is current
+
+        Raises:
+            FileNotFoundError: If universities.csv does not exist
+        """
+        return load_university_catalog(self.paths()["universities"])
+
+    def read_scholarships(self) -> Optional[pd.DataFrame]:
+        path = self.paths()["scholarships"]
+        return pd.read_csv(path) if os.path.exists(path) else None
+
+    def add_universities(self, records: List[Dict[str, Any]]):
+        path = self.paths()["universities"]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Universities data file not found at {path}")
+        # Append to the write-ahead log (constant cost, safe across processes);
+        # the log is folded into universities.csv in the background
+        if append_universities(path, records) >= COMPACT_AFTER_BYTES:
+            schedule_compaction(path)
+
+    def ingest_universities(self, staged_path: str):
+        commit_universities(self.paths()["universities"], staged_path)
+
+    def write_scholarships(self, df: pd.DataFrame, added: List[Dict[str, Any]], removed_names: Sequence[str]):
+        """Store the scholarships after adding / removing some (df is the full result)"""
+        df.to_csv(self.paths()["scholarships"], index=False)
+
+    def ingest_scholarships(self, staged_path: str):
+        path = self.paths()["scholarships"]
+        current = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+        replace_csv(path, current, staged_path)
+
+
+class SqliteStorage:
+    """Both tables in one SQLite database; filters run as indexed queries"""
+
+    name = "sqlite"
+    pushdown = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def path(self) -> str:
+        return resolve_data_path(DATABASE_FILE)
+
+    def source_stamps(self) -> Dict[str, Any]:
+        # Commits land in the -wal file first; either file changing is a change to both tables.
+        # An empty -wal (created by the first connection) holds no commits.
+        wal_stamp = _file_stamp(self.path() + "-wal")
+        if wal_stamp is not None and wal_stamp[1] == 0:
+            wal_stamp = None
+        stamp = (_file_stamp(self.path()), wal_stamp)
+        return {"universities": stamp, "scholarships": stamp}
+
+    def source_path(self) -> str:
+        return self.path()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        This thread's connection to the database
+
+        Raises:
+            FileNotFoundError: If the database has not been created
+        """
+        # Keyed by absolute path: data/catalog.db is relative to the working directory
+        path = os.path.abspath(self.path())
+        connections = self._local.__dict__.setdefault("connections", {})
+        connection = connections.get(path)
+        if connection is None:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Catalog database not found at {path} (run python -m data_fetcher.migrate_to_sqlite)")
+            connection = connect(path)
+            connections[path] = connection
+        return connection
+
+    def has_table(self, table: str) -> bool:
+        return self.connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+    def columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.connection().execute(f"PRAGMA table_info({quote_identifier(table)})")]
+
+    def _frame(self, table: str) -> pd.DataFrame:
+        df = pd.read_sql_query(f"SELECT * FROM {quote_identifier(table)} ORDER BY rowid", self.connection())
+        # NULLs read back as None; the CSV path has NaN for missing values
+        return df.where(df.notna(), np.nan)
+
+    def read_universities(self) -> pd.DataFrame:
+        if not self.has_table("universities"):
+            raise FileNotFoundError(f"No universities table in {self.path()}")
+        return self._frame("universities")
+
+    def read_university_catalog(self) -> UniversityCatalog:
+        return UniversityCatalog.from_frame(self.read_universities(), source_path=self.path())
+
+    def read_scholarships(self) -> Optional[pd.DataFrame]:
+        return self._frame("scholarships") if self.has_table("scholarships") else None
+
+    def _rows(self, sql: str, parameters: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        cursor = self.connection().execute(sql, parameters)
+        names = [column[0] for column in cursor.description]
+        return [
+            {name: (np.nan if value is None else value) for name, value in zip(names, row)}
+            for row in cursor.fetchall()
+        ]
+
+    def _insert(self, table: str, records: Iterable[Dict[str, Any]]):
+        """
+        Insert records in the current transaction, adding columns the table lacks
+
+        Raises:
+            ValueError: If a record has a new column whose name is not a plain identifier
+        """
+        connection = self.connection()
+        records = list(records)
+        columns = self.columns(table)
+        new_columns = [name for name in dict.fromkeys(name for record in records for name in record) if name not in columns]
+        invalid = [name for name in new_columns if not isinstance(name, str) or SQL_IDENTIFIER.fullmatch(name) is None]
+        if invalid:
+            raise ValueError(f"Invalid column names for {table}: {', '.join(map(repr, invalid))}")
+        for name in new_columns:
+            connection.execute(f"ALTER TABLE {quote_identifier(table)} ADD COLUMN {quote_identifier(name)}")
+            columns.append(name)
+        quoted = ", ".join(quote_identifier(name) for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        connection.executemany(
+            f"INSERT INTO {quote_identifier(table)} ({quoted}) VALUES ({placeholders})",
+            ([_sql_value(record.get(name)) for name in columns] for record in records)
+        )
+
+    def add_universities(self, records: List[Dict[str, Any]]):
+        with self.connection():
+            self._insert("universities", records)
+
+    def ingest_universities(self, staged_path: str):
+        self._ingest("universities", staged_path)
+
+    def write_scholarships(self, df: pd.DataFrame, added: List[Dict[str, Any]], removed_names: Sequence[str]):
+        with self.connection() as connection:
+            if not self.has_table("scholarships"):
+                create_table(connection, "scholarships", df.iloc[:0])
+            if removed_names:
+                connection.executemany("DELETE FROM scholarships WHERE scholarship_name = ?", [(name,) for name in removed_names])
+            self._insert("scholarships", added)
+
+    def ingest_scholarships(self, staged_path: str):
+        self._ingest("scholarships", staged_path)
+
+    def _ingest(self, table: str, staged_path: str):
+        # One transaction: the whole upload becomes visible at once or not at all
+        with self.connection() as connection:
+            with pd.read_csv(staged_path, chunksize=SQLITE_INSERT_CHUNK_ROWS) as chunks:
+                for chunk in chunks:
+                    if not self.has_table(table):
+                        create_table(connection, table, chunk.iloc[:0])
+                    self._insert(table, chunk.to_dict(orient="records"))
+
+    # ---------- Pushed-down filters ----------
+
+    def _matching_values(self, table: str, column: str, test: Callable[[str], bool], parameters: List[Any]) -> str:
+        """
+        WHERE clause for a Python text test on a low-cardinality indexed column
+
+        The test runs once per distinct value (read off the column's index)
+        rather than once per row; the matches become an IN list the planner
+        can look up through the index. Returns "0" if no value matches.
+        """
+        values = [
+            value for (value,) in self.connection().execute(f"SELECT DISTINCT {quote_identifier(column)} FROM {quote_identifier(table)}")
+            if isinstance(value, str) and test(value)
+        ]
+        if not values:
+            return "0"
+        parameters.extend(values)
+        return f'{quote_identifier(column)} IN ({", ".join("?" for _ in values)})'
+
+    def eligible_universities(self, max_ielts=None, max_fees=None, country=None, field=None, columns=None, limit=None):
+        """
+        Universities meeting the recommend_universities filters, in catalog order
+
+        Args:
+            max_ielts: Highest ielts_required allowed
+            max_fees: Highest average_fees_eur allowed
+            country: Country, compared case-insensitively
+            field: Case-insensitive regex the field must match (plain text is a substring)
+            columns: Columns to return (all if None)
+            limit: Rows to return (all if None)
+        """
+        where, parameters = [], []
+        if max_ielts is not None:
+            where.append("ielts_required <= ?")
+            parameters.append(max_ielts)
+        if max_fees is not None:
+            where.append("average_fees_eur <= ?")
+            parameters.append(max_fees)
+        if country is not None:
+            country = country.lower()
+            where.append(self._matching_values("universities", "country", lambda value: value.lower() == country, parameters))
+        if field is not None:
+            where.append(self._matching_values("universities", "field", text_test(field), parameters))
+        if "0" in where:
+            return []
+        selected = ", ".join(quote_identifier(name) for name in columns) if columns else "*"
+        sql = f"SELECT {selected} FROM universities"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return self._rows(sql, parameters)
+
+    def affordability(self, max_budget) -> Dict[str, Any]:
+        """find_affordable_universities' result for one budget, from the fee index"""
+        connection = self.connection()
+        total = connection.execute("SELECT COUNT(*) FROM universities").fetchone()[0]
+        count, fee_sum = 0, None
+        if max_budget == max_budget:
+            count, fee_sum = connection.execute(
+                "SELECT COUNT(*), SUM(average_fees_eur) FROM universities WHERE average_fees_eur <= ?", (max_budget,)
+            ).fetchone()
+        cheapest = None
+        if count > 0:
+            cheapest = self._rows(
+                "SELECT * FROM universities WHERE average_fees_eur IS NOT NULL ORDER BY average_fees_eur, rowid LIMIT 1"
+            )[0]
+        return {
+            "total_universities": total,
+            "affordable_universities": count,
+            "percentage_affordable": round((count / total) * 100, 2) if total > 0 else 0,
+            "cheapest_university": cheapest,
+            "average_fee_in_budget": round(fee_sum / count, 2) if count > 0 else 0
+        }
+
+    def scholarships(self, country=None, coverage=None, min_amount=None, max_amount=None, eligibility=None):
+        """
+        Scholarships matching every given filter, in file order
+
+        Args:
+            country: Exact country
+            coverage: Exact coverage type
+            min_amount: Lowest amount_eur (missing amounts never match a range)
+            max_amount: Highest amount_eur
+            eligibility: Case-insensitive regex the eligibility must match
+        """
+        if not self.has_table("scholarships"):
+            return None
+        where, parameters = [], []
+        for column, value in (("country", country), ("coverage", coverage)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                parameters.append(value)
+        if min_amount is not None:
+            where.append("amount_eur >= ?")
+            parameters.append(min_amount)
+        if max_amount is not None:
+            where.append("amount_eur <= ?")
+            parameters.append(max_amount)
+        if eligibility is not None:
+            where.append(self._matching_values("scholarships", "eligibility", text_test(eligibility), parameters))
+            if where[-1] == "0":
+                return []
+        sql = "SELECT * FROM scholarships"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._rows(sql + " ORDER BY rowid", parameters)
+
+
+def _sql_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def quote_identifier(name: str) -> str:
+    """A table or column name as a quoted SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the catalog database in WAL mode"""
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def create_table(connection: sqlite3.Connection, table: str, df: pd.DataFrame):
+    """Create a table shaped like df (and its indexes), loading df's rows"""
+    df.to_sql(table, connection, index=False)
+    for column in SQLITE_INDEXES.get(table, ()):
+        if column in df.columns:
+            connection.execute(f"CREATE INDEX {quote_identifier(f'idx_{table}_{column}')} ON {quote_identifier(table)} ({quote_identifier(column)})")
+
+
+_storages = {"csv": CsvStorage(), "sqlite": SqliteStorage()}
+
+
+def storage_backend() -> str:
+    """Name of the configured backend"""
+    return os.environ.get(STORAGE_ENV, "csv").strip().lower() or "csv"
+
+
+def get_storage():
+    """
+    The configured storage backend
+
+    Raises:
+        ValueError: If CATALOG_STORAGE names no known backend
+    """
+    name = storage_backend()
+    if name not in _storages:
+        raise ValueError(f"{STORAGE_ENV} must be one of {', '.join(STORAGE_BACKENDS)}")
+    return _storages[name]
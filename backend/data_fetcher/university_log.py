@@ -0,0 +1,448 @@
+"""
+University Write-Ahead Log Module
+Append-only write path for universities.csv
+
+New universities are appended as JSON lines to a log next to the CSV
+(universities.csv.wal) instead of rewriting the whole file, so an insert
+costs the same however large the catalog is. Readers merge the base file and
+the log. Once the log grows past COMPACT_AFTER_BYTES, a background thread folds
+it into the base file: the merged catalog is written to a temp file in the
+same directory and renamed over universities.csv, then the log is cut down to
+whatever was appended in the meantime.
+
+Writers, compaction and readers coordinate through an advisory lock file
+(universities.csv.lock): appends and the final rename take it exclusively,
+reads take it shared, so nobody ever sees the compacted base together with
+the rows it already contains, and no append is lost between processes.
+
+Replacing the base CSV and cutting the log are two renames. Before the first,
+a marker (universities.csv.fold) records which base file holds how many bytes
+of which log; readers skip those bytes until the log has been cut, so a crash
+between the renames never duplicates rows. The next writer finishes the job.
+A line torn by a crash mid-append is cut off before the next append.
+"""
+
+import io
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock below still serializes this process's writers
+    fcntl = None
+
+LOG_SUFFIX = ".wal"
+LOCK_SUFFIX = ".lock"
+FOLD_SUFFIX = ".fold"
+
+# Log size that triggers a background compaction
+COMPACT_AFTER_BYTES = 1 << 20
+
+# Rows of a staged file held in memory at once while it is copied in
+STAGED_CHUNK_ROWS = 50000
+
+# One reader/writer lock per base file for threads of this process (flock alone is per open file)
+_thread_locks: Dict[str, "_ReadWriteLock"] = {}
+_thread_locks_guard = threading.Lock()
+# Base files with a compaction running
+_compacting = set()
+
+
+def log_path(base_path: str) -> str:
+    """Path of the write-ahead log of a base CSV"""
+    return base_path + LOG_SUFFIX
+
+
+def lock_path(base_path: str) -> str:
+    """Path of the advisory lock file of a base CSV"""
+    return base_path + LOCK_SUFFIX
+
+
+def fold_path(base_path: str) -> str:
+    """Path of the marker of a compaction in progress"""
+    return base_path + FOLD_SUFFIX
+
+
+class _ReadWriteLock:
+    """Any number of shared holders or one exclusive holder, among the threads of this process"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def hold(self, exclusive: bool):
+        with self._condition:
+            if exclusive:
+                self._writers_waiting += 1
+                self._condition.wait_for(lambda: not self._writer and not self._readers)
+                self._writers_waiting -= 1
+                self._writer = True
+            else:
+                # Waiting writers go first, so a steady stream of readers cannot starve them
+                self._condition.wait_for(lambda: not self._writer and not self._writers_waiting)
+                self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                if exclusive:
+                    self._writer = False
+                else:
+                    self._readers -= 1
+                self._condition.notify_all()
+
+
+def _thread_lock(base_path: str) -> _ReadWriteLock:
+    key = os.path.abspath(base_path)
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(key, _ReadWriteLock())
+
+
+@contextmanager
+def catalog_lock(base_path: str, exclusive: bool = True):
+    """
+    Hold the advisory lock of a base CSV
+
+    Args:
+        base_path: Path of the CSV
+        exclusive: Exclusive (writers) or shared (readers) lock; shared
+            holders, in this process or others, do not wait for each other
+    """
+    with _thread_lock(base_path).hold(exclusive):
+        lock_file = _open_lock_file(base_path, exclusive) if fcntl is not None else None
+        if lock_file is None:
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _open_lock_file(base_path: str, exclusive: bool):
+    """
+    The lock file, opened read-only for shared locks (flock does not need
+    write access). If a reader cannot create it, e.g. in a read-only data
+    directory, None: there are no writers to lock out there.
+    """
+    if not exclusive:
+        try:
+            return open(lock_path(base_path), "r")
+        except FileNotFoundError:
+            pass
+    try:
+        return open(lock_path(base_path), "a")
+    except OSError:
+        if exclusive:
+            raise
+        return None
+
+
+def append_universities(base_path: str, records: Sequence[Dict[str, Any]]) -> int:
+    """
+    Durably append universities to the log of a base CSV
+
+    Returns:
+        Size of the log in bytes
+    """
+    payload = "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+    with catalog_lock(base_path):
+        _finish_fold(base_path)
+        fd = os.open(log_path(base_path), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            _truncate_torn_line(fd)
+            os.write(fd, payload)
+            os.fsync(fd)
+            return os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+
+def _truncate_torn_line(fd: int):
+    # A crash mid-append leaves a partial last line; the next record must not be glued onto it
+    size = os.fstat(fd).st_size
+    if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+        return
+    data = os.pread(fd, size, 0)
+    os.ftruncate(fd, data.rfind(b"\n") + 1)
+
+
+def _read_log_region(base_path: str) -> Tuple[bytes, int]:
+    """
+    The log's complete lines not yet folded into the base CSV
+
+    Returns:
+        (bytes, offset of the first of them in the log)
+    """
+    try:
+        with open(log_path(base_path), "rb") as log_file:
+            start = _folded_bytes(base_path, os.fstat(log_file.fileno()))
+            data = log_file.read()
+    except FileNotFoundError:
+        return b"", 0
+    # A line cut short by a crash mid-append is not a record
+    return data[start:data.rfind(b"\n") + 1], start
+
+
+def read_log_data(base_path: str) -> bytes:
+    """The complete lines of the log of a base CSV not yet in the base, as bytes"""
+    return _read_log_region(base_path)[0]
+
+
+def parse_log(data: bytes) -> List[Dict[str, Any]]:
+    """Records in complete log lines; lines that are not a JSON object are skipped with a warning"""
+    records = []
+    for number, line in enumerate(data.decode("utf-8", errors="replace").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            print(f"Warning: Skipping unreadable university log line {number}: {str(e)}")
+            continue
+        if not isinstance(record, dict):
+            print(f"Warning: Skipping university log line {number}: not a JSON object")
+            continue
+        records.append(record)
+    return records
+
+
+def read_log(base_path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Records in the log of a base CSV
+
+    Returns:
+        (records, byte offset just past the last complete line)
+    """
+    data, start = _read_log_region(base_path)
+    return parse_log(data), start + len(data)
+
+
+def _folded_bytes(base_path: str, log_stat: os.stat_result) -> int:
+    """
+    Bytes at the start of the log that are already in the base CSV: non-zero
+    only after a crash between the two renames of a compaction
+    """
+    try:
+        with open(fold_path(base_path)) as fold_file:
+            fold = json.load(fold_file)
+        base = os.stat(base_path)
+    except (OSError, ValueError):
+        return 0
+    if (base.st_ino, base.st_size) != tuple(fold["base"]) or log_stat.st_ino != fold["log"]:
+        # The base rename never happened, or the log was already cut
+        return 0
+    return fold["offset"]
+
+
+def _finish_fold(base_path: str):
+    """Complete an interrupted compaction (caller holds the exclusive lock)"""
+    if not os.path.exists(fold_path(base_path)):
+        return
+    try:
+        with open(log_path(base_path), "rb") as log_file:
+            start = _folded_bytes(base_path, os.fstat(log_file.fileno()))
+            log_file.seek(start)
+            remainder = log_file.read()
+        if start:
+            _replace_contents(log_path(base_path), remainder)
+    except FileNotFoundError:
+        pass
+    os.remove(fold_path(base_path))
+
+
+def _swap_base(base_path: str, temp_path: str, log_offset: int):
+    """
+    Rename temp_path over the base CSV, which now holds the first log_offset
+    bytes of the log, and cut those bytes from the log (caller holds the
+    exclusive lock)
+    """
+    with open(log_path(base_path), "ab+") as log_file:
+        log_stat = os.fstat(log_file.fileno())
+        log_file.seek(log_offset)
+        remainder = log_file.read()
+    temp = os.stat(temp_path)
+    # The renamed file keeps its inode and size: that is how readers tell whether the rename happened
+    _replace_contents(
+        fold_path(base_path),
+        json.dumps({"base": [temp.st_ino, temp.st_size], "log": log_stat.st_ino, "offset": log_offset}).encode("utf-8")
+    )
+    os.replace(temp_path, base_path)
+    _replace_contents(log_path(base_path), remainder)
+    os.remove(fold_path(base_path))
+
+
+def merge_universities(base: pd.DataFrame, records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Base rows followed by logged rows
+
+    The result goes through the CSV format once, so column types come out
+    exactly as they will when the rows are compacted into the file.
+    """
+    if not records:
+        return base
+    merged = pd.concat([base, pd.DataFrame(records)], ignore_index=True)
+    return pd.read_csv(io.StringIO(merged.to_csv(index=False)))
+
+
+def read_universities(base_path: str) -> pd.DataFrame:
+    """
+    The base CSV and its log, merged
+
+    Raises:
+        FileNotFoundError: If the base CSV does not exist
+    """
+    with catalog_lock(base_path, exclusive=False):
+        base = pd.read_csv(base_path)
+        records, _ = read_log(base_path)
+    return merge_universities(base, records)
+
+
+def compact_universities(base_path: str) -> bool:
+    """
+    Fold the log into the base CSV (temp file + atomic rename)
+
+    The merge and the temp file are written without blocking appends; rows
+    appended meanwhile stay in the log. If the base file was replaced by
+    someone else in the meantime, nothing is changed.
+
+    Returns:
+        Whether a compaction happened
+    """
+    with catalog_lock(base_path):
+        _finish_fold(base_path)
+    with catalog_lock(base_path, exclusive=False):
+        stat = os.stat(base_path)
+        base = pd.read_csv(base_path)
+        records, offset = read_log(base_path)
+    if not records:
+        return False
+
+    temp_path = write_temp_csv(base_path, merge_universities(base, records))
+    try:
+        with catalog_lock(base_path):
+            current = os.stat(base_path)
+            if (current.st_mtime_ns, current.st_size, current.st_ino) != (stat.st_mtime_ns, stat.st_size, stat.st_ino):
+                return False
+            _swap_base(base_path, temp_path, offset)
+        return True
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def commit_universities(base_path: str, staged_path: str):
+    """
+    Add the universities staged in a CSV file (with header) to the catalog
+    in one atomic swap: the base CSV, its log and the staged rows are written
+    to a temp file that replaces the base CSV, and the log is emptied
+
+    Raises:
+        FileNotFoundError: If the base CSV does not exist
+    """
+    with catalog_lock(base_path):
+        _finish_fold(base_path)
+        base = pd.read_csv(base_path)
+        records, offset = read_log(base_path)
+        temp_path = write_temp_csv(base_path, merge_universities(base, records), staged_path)
+        try:
+            _swap_base(base_path, temp_path, offset)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def replace_csv(path: str, frame: pd.DataFrame, staged_path: str = None):
+    """
+    Atomically replace a CSV file with frame, followed by the rows of a
+    staged CSV file (see write_temp_csv)
+    """
+    temp_path = write_temp_csv(path, frame, staged_path)
+    try:
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_temp_csv(path: str, frame: pd.DataFrame, staged_path: str = None, chunk_rows: int = STAGED_CHUNK_ROWS) -> str:
+    """
+    Write frame, then the rows of a staged CSV file (read chunk by chunk, so
+    it can be any size), to a durable temp file next to path, ready to be
+    renamed over it
+
+    Staged columns missing from frame are added at the end; the temp file
+    gets path's permissions.
+
+    Returns:
+        Path of the temp file
+    """
+    columns = list(frame.columns)
+    if staged_path is not None:
+        columns += [name for name in pd.read_csv(staged_path, nrows=0).columns if name not in columns]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".catalog-", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, "w", newline="") as temp_file:
+            frame.reindex(columns=columns).to_csv(temp_file, index=False)
+            if staged_path is not None:
+                # Staged values are copied as text, exactly as staged
+                with pd.read_csv(staged_path, dtype=str, keep_default_na=False, chunksize=chunk_rows) as chunks:
+                    for chunk in chunks:
+                        chunk.reindex(columns=columns).to_csv(temp_file, index=False, header=False)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.chmod(temp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def _replace_contents(path: str, data: bytes):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".universities-", suffix=LOG_SUFFIX, dir=directory)
+    with os.fdopen(fd, "wb") as temp_file:
+        temp_file.write(data)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+
+
+def schedule_compaction(base_path: str) -> bool:
+    """
+    Compact a base CSV in a background thread, unless one is already running
+
+    Returns:
+        Whether a compaction thread was started
+    """
+    key = os.path.abspath(base_path)
+    with _thread_locks_guard:
+        if key in _compacting:
+            return False
+        _compacting.add(key)
+
+    def run():
+        try:
+            compact_universities(base_path)
+        except Exception as e:
+            print(f"Warning: compacting {base_path} failed, rows stay in the log: {str(e)}")
+        finally:
+            with _thread_locks_guard:
+                _compacting.discard(key)
+
+    threading.Thread(target=run, name="university-log-compaction", daemon=True).start()
+    return True
@@ -1,12 +1,80 @@
+import threading
+
 import pandas as pd
-import os
+
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, notify_catalog_changed, reload_catalog_snapshot, source_stamp
+from data_fetcher.scholarship_store import record_scholarship_changes
+from data_fetcher.storage import get_storage
+
+# Serializes the app's own read-modify-write cycles on the scholarships
+_scholarship_write_lock = threading.Lock()
+
+# Reloads tried when the scholarships changed on disk after the snapshot was taken
+STALE_SNAPSHOT_RELOADS = 2
+
+def _current_scholarships_snapshot():
+    """
+    The published snapshot, reloaded if the scholarships source no longer
+    matches it (an edit by hand or by another worker not published yet), so
+    a rewrite never drops that edit. None if the source keeps changing.
+    """
+    snapshot = get_catalog_snapshot()
+    for _ in range(STALE_SNAPSHOT_RELOADS):
+        if source_stamp("scholarships") == snapshot.stamps.get("scholarships"):
+            return snapshot
+        snapshot = reload_catalog_snapshot()
+    if source_stamp("scholarships") == snapshot.stamps.get("scholarships"):
+        return snapshot
+    return None
 
 def add_university(data):
-    csv_path = "backend/data/universities.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/universities.csv"
-    
-    df = pd.read_csv(csv_path)
-    df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
-    df.to_csv(csv_path, index=False)
+    try:
+        # CSV storage appends to a write-ahead log, SQLite inserts one row
+        get_storage().add_universities([data])
+    except FileNotFoundError as e:
+        return {"status": "error", "message": str(e)}
+    # Publish the new row without waiting for the next poll
+    notify_catalog_changed()
     return {"status": "success", "message": "University added successfully"}
+
+def add_scholarship(data):
+    with _scholarship_write_lock:
+        snapshot = _current_scholarships_snapshot()
+        if snapshot is None:
+            return {"status": "error", "message": "Scholarships data is being changed, please retry"}
+        current = snapshot.scholarships if snapshot.scholarships is not None else pd.DataFrame()
+        df = pd.concat([current, pd.DataFrame([data])], ignore_index=True)
+        get_storage().write_scholarships(df, added=[data], removed_names=[])
+        published = reload_catalog_snapshot()
+        # Statistics take the new row as a delta instead of a rebuild
+        record_scholarship_changes(snapshot, published, added=[data], removed=[])
+    return {"status": "success", "message": "Scholarship added successfully"}
+
+def remove_scholarship(name):
+    with _scholarship_write_lock:
+        snapshot = _current_scholarships_snapshot()
+        if snapshot is None:
+            return {"status": "error", "message": "Scholarships data is being changed, please retry"}
+        df = snapshot.scholarships
+        if df is None or "scholarship_name" not in df.columns:
+            return {"status": "error", "message": "Scholarships data file not found"}
+        
+        matches = df["scholarship_name"] == name
+        if not matches.any():
+            return {"status": "error", "message": f"Scholarship '{name}' not found"}
+        removed = df[matches].to_dict(orient="records")
+        get_storage().write_scholarships(df[~matches], added=[], removed_names=[name])
+        published = reload_catalog_snapshot()
+        record_scholarship_changes(snapshot, published, added=[], removed=removed)
+    return {"status": "success", "message": f"Removed {len(removed)} scholarship(s)"}
+
+def ingest_universities(staged_path):
+    """Add every university in a staged CSV file in one atomic commit"""
+    get_storage().ingest_universities(staged_path)
+    reload_catalog_snapshot()
+
+def ingest_scholarships(staged_path):
+    """Add every scholarship in a staged CSV file in one atomic commit"""
+    with _scholarship_write_lock:
+        get_storage().ingest_scholarships(staged_path)
+        reload_catalog_snapshot()
@@ -0,0 +1,217 @@
+"""
+Admission Model Module
+Loads models/admission_model.pkl once and serves it as a plain-NumPy scorer
+
+The artifact is unpickled lazily on first use and kept for the life of the
+process. Linear models (optionally behind affine preprocessing such as
+StandardScaler or MinMaxScaler in a Pipeline) are reduced to one weight per
+feature plus an intercept, so scoring a single profile is a few float
+operations instead of an sklearn call. Other estimators are still served,
+through their own predict_proba/predict.
+
+If the file is missing, empty or unusable, get_admission_model() returns None
+and callers keep their heuristic scoring; admission_model_status() reports
+which path is active.
+"""
+
+import math
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "admission_model.pkl")
+
+# Feature order used when the artifact does not carry feature_names_in_
+FEATURES = ("gpa", "ielts", "budget")
+
+
+class LinearAdmissionModel:
+    """A fitted linear model reduced to weights over (gpa, ielts, budget)"""
+
+    kind = "linear"
+
+    def __init__(self, weights: Sequence[float], intercept: float, logistic: bool):
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = float(intercept)
+        self.logistic = logistic
+        self._gpa_weight, self._ielts_weight, self._budget_weight = self.weights.tolist()
+
+    def score(self, gpa: float, ielts: float, budget: float) -> float:
+        """Admission probability in [0, 1] for one profile"""
+        z = self._gpa_weight * gpa + self._ielts_weight * ielts + self._budget_weight * budget + self.intercept
+        if self.logistic:
+            try:
+                return 1.0 / (1.0 + math.exp(-z))
+            except OverflowError:
+                return 0.0
+        return min(max(z, 0.0), 1.0)
+
+    def score_batch(self, gpa: np.ndarray, ielts: np.ndarray, budget: np.ndarray) -> np.ndarray:
+        """Admission probabilities in [0, 1] for parallel (or broadcastable) arrays"""
+        z = self._gpa_weight * gpa + self._ielts_weight * ielts + self._budget_weight * budget + self.intercept
+        if self.logistic:
+            with np.errstate(over="ignore"):
+                return 1.0 / (1.0 + np.exp(-z))
+        return np.clip(z, 0.0, 1.0)
+
+
+class EstimatorAdmissionModel:
+    """Any other fitted estimator, called through predict_proba (or predict)"""
+
+    kind = "estimator"
+
+    def __init__(self, estimator: Any, feature_order: Sequence[int]):
+        self.estimator = estimator
+        self.feature_order = list(feature_order)
+
+    def score(self, gpa: float, ielts: float, budget: float) -> float:
+        return float(self.score_batch(np.array([gpa]), np.array([ielts]), np.array([budget]))[0])
+
+    def score_batch(self, gpa: np.ndarray, ielts: np.ndarray, budget: np.ndarray) -> np.ndarray:
+        columns = np.broadcast_arrays(gpa, ielts, budget)
+        X = np.column_stack([column.ravel() for column in columns]).astype(float)[:, self.feature_order]
+        if hasattr(self.estimator, "predict_proba"):
+            scores = self.estimator.predict_proba(X)[:, 1]
+        else:
+            scores = np.clip(self.estimator.predict(X), 0.0, 1.0)
+        return scores.reshape(columns[0].shape)
+
+
+_model = None
+_status: Optional[Dict[str, Any]] = None
+_load_lock = threading.Lock()
+
+
+def get_admission_model():
+    """
+    Get the compiled admission model, loading it on first call
+
+    Returns:
+        LinearAdmissionModel / EstimatorAdmissionModel, or None when the
+        heuristic fallback is active
+    """
+    if _status is None:
+        _load()
+    return _model
+
+
+def admission_model_status() -> Dict[str, Any]:
+    """Which scoring path is active ("model" or "heuristic"), and why"""
+    if _status is None:
+        _load()
+    return dict(_status)
+
+
+def _load():
+    global _model, _status
+    with _load_lock:
+        if _status is not None:
+            return
+        try:
+            _model = load_admission_model(MODEL_PATH)
+            _status = {"active": "model", "kind": _model.kind, "path": MODEL_PATH, "reason": None}
+        except Exception as e:
+            _model = None
+            _status = {"active": "heuristic", "kind": None, "path": MODEL_PATH, "reason": str(e)}
+            print(f"Warning: admission model not used, falling back to heuristic scoring: {str(e)}")
+
+
+def load_admission_model(path: str):
+    """
+    Unpickle a model artifact and compile it with compile_admission_model
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is empty or the model cannot be used
+    """
+    return compile_admission_model(_read_artifact(path))
+
+
+def _read_artifact(path: str) -> Any:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found")
+    if os.path.getsize(path) == 0:
+        raise ValueError(f"{path} is empty")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def compile_admission_model(model: Any):
+    """
+    Reduce a fitted estimator (or Pipeline) to its fastest equivalent scorer
+
+    Raises:
+        ValueError: If the model's features cannot be mapped to gpa/ielts/budget
+    """
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    preprocessing, estimator = steps[:-1], steps[-1]
+
+    feature_order = _feature_order(steps[0])
+
+    classes = getattr(estimator, "classes_", None)
+    if classes is not None and len(classes) != 2:
+        raise ValueError(f"expected a binary admission classifier, got {len(classes)} classes")
+
+    coef = getattr(estimator, "coef_", None)
+    affine = None
+    if coef is not None and np.size(coef) == len(feature_order):
+        affine = _affine_form(preprocessing, len(feature_order))
+    if affine is None:
+        return EstimatorAdmissionModel(model, feature_order)
+
+    # w.(A x + c) + b  ==  (w A) x + (w.c + b)
+    matrix, offset = affine
+    coef = np.ravel(coef).astype(float)
+    weights = coef @ matrix
+    intercept = float(coef @ offset + np.ravel(getattr(estimator, "intercept_", 0.0))[0])
+
+    # Weights are in the model's column order; put them in (gpa, ielts, budget) order
+    ordered = np.zeros(len(FEATURES))
+    ordered[feature_order] = weights
+    return LinearAdmissionModel(ordered, intercept, logistic=hasattr(estimator, "predict_proba"))
+
+
+def _feature_order(first_step: Any) -> list:
+    """Position of each of the model's columns in FEATURES"""
+    names = getattr(first_step, "feature_names_in_", None)
+    if names is None:
+        n_features = getattr(first_step, "n_features_in_", len(FEATURES))
+        if n_features != len(FEATURES):
+            raise ValueError(f"model expects {n_features} features, only {', '.join(FEATURES)} are available")
+        return list(range(len(FEATURES)))
+    positions = []
+    for name in names:
+        matches = [i for i, feature in enumerate(FEATURES) if feature in str(name).lower()]
+        if len(matches) != 1:
+            raise ValueError(f"cannot map model feature {name!r} to one of {', '.join(FEATURES)}")
+        positions.append(matches[0])
+    if sorted(positions) != list(range(len(FEATURES))):
+        raise ValueError(f"model features {list(names)} do not cover {', '.join(FEATURES)}")
+    return positions
+
+
+def _affine_form(transformers: Sequence[Any], n_features: int):
+    """
+    (A, c) with transform(x) == A x + c for a chain of fitted transformers,
+    or None if the chain is not affine (e.g. PolynomialFeatures)
+    """
+    def transform(X):
+        for transformer in transformers:
+            X = transformer.transform(X)
+        return np.asarray(X, dtype=float)
+
+    probes = np.vstack([np.zeros(n_features), np.eye(n_features)])
+    try:
+        out = transform(probes)
+        offset = out[0]
+        matrix = (out[1:] - offset).T
+        # Confirm on points away from the probes
+        check = np.random.default_rng(0).uniform(0, 20000, size=(8, n_features))
+        if not np.allclose(transform(check), check @ matrix.T + offset, rtol=1e-7, atol=1e-9):
+            return None
+    except Exception:
+        return None
+    return matrix, offset
@@ -1,19 +1,33 @@
+import numpy as np
+
+from modules.admission_model import get_admission_model
+
+# Index 0/1/2 of the chance computed by predict_admission_batch
+CHANCE_LABELS = np.array(["LOW", "MEDIUM", "HIGH"])
+
+# Largest gpa x ielts x budget grid predict_admission_grid will compute
+SWEEP_MAX_CELLS = 1000000
+
 def predict_admission(profile):
     gpa = profile.gpa or 0
     ielts = profile.ielts or 0
     budget = profile.budget or 0
 
-    # ---------- NORMALIZED SCORES ----------
-    gpa_score = min(gpa / 4.0, 1.0)          # out of 4
-    ielts_score = min(ielts / 9.0, 1.0)      # out of 9
-    budget_score = min(budget / 20000, 1.0)  # 20k reference
+    model = get_admission_model()
+    if model is not None:
+        final_score = model.score(gpa, ielts, budget)
+    else:
+        # ---------- NORMALIZED SCORES ----------
+        gpa_score = min(gpa / 4.0, 1.0)          # out of 4
+        ielts_score = min(ielts / 9.0, 1.0)      # out of 9
+        budget_score = min(budget / 20000, 1.0)  # 20k reference
 
-    # ---------- FINAL WEIGHTED SCORE ----------
-    final_score = (
-        gpa_score * 0.45 +
-        ielts_score * 0.35 +
-        budget_score * 0.20
-    )
+        # ---------- FINAL WEIGHTED SCORE ----------
+        final_score = (
+            gpa_score * 0.45 +
+            ielts_score * 0.35 +
+            budget_score * 0.20
+        )
 
     probability = round(final_score * 100)
 
@@ -32,4 +46,86 @@ def predict_admission(profile):
         "chance": chance,
         "probability": probability,
         "message": message
-    }
\ No newline at end of file
+    }
+
+
+def predict_admission_batch(gpa, ielts, budget):
+    """
+    predict_admission over parallel arrays in one NumPy pass (model or heuristic)
+
+    The arrays may also be any shapes that broadcast together; results take
+    the broadcast shape. Missing values (None/NaN) count as 0, like ``profile.gpa or 0``.
+
+    Returns:
+        (probability as int64 array, chance label array)
+    """
+    gpa = np.nan_to_num(np.asarray(gpa, dtype=float), nan=0.0)
+    ielts = np.nan_to_num(np.asarray(ielts, dtype=float), nan=0.0)
+    budget = np.nan_to_num(np.asarray(budget, dtype=float), nan=0.0)
+
+    model = get_admission_model()
+    if model is not None:
+        final_score = model.score_batch(gpa, ielts, budget)
+    else:
+        # ---------- NORMALIZED SCORES ----------
+        gpa_score = np.minimum(gpa / 4.0, 1.0)
+        ielts_score = np.minimum(ielts / 9.0, 1.0)
+        budget_score = np.minimum(budget / 20000, 1.0)
+
+        # ---------- FINAL WEIGHTED SCORE ----------
+        final_score = (
+            gpa_score * 0.45 +
+            ielts_score * 0.35 +
+            budget_score * 0.20
+        )
+
+    probability = np.rint(final_score * 100).astype(np.int64)
+
+    # ---------- DECISION ----------
+    chance = CHANCE_LABELS[(final_score >= 0.75).astype(int) + (final_score >= 0.5)]
+
+    return probability, chance
+
+
+def sweep_values(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    Evenly spaced values from start to stop inclusive
+
+    Raises:
+        ValueError: If step is not positive, stop < start or the range is too long
+    """
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if stop < start:
+        raise ValueError("stop must not be less than start")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    if count > SWEEP_MAX_CELLS:
+        raise ValueError(f"Range has {count} values, the limit is {SWEEP_MAX_CELLS}")
+    # Round away float drift so 3.0 + 0.1 * 3 comes back as 3.3
+    return np.round(start + step * np.arange(count), 10)
+
+
+def predict_admission_grid(gpa_values, ielts_values, budget_values):
+    """
+    predict_admission for every (gpa, ielts, budget) combination
+
+    Computed by broadcasting the three axes against each other, no loops.
+
+    Returns:
+        (probability, chance) arrays of shape (len(gpa), len(ielts), len(budget))
+
+    Raises:
+        ValueError: If the grid would exceed SWEEP_MAX_CELLS
+    """
+    gpa_values = np.asarray(gpa_values, dtype=float)
+    ielts_values = np.asarray(ielts_values, dtype=float)
+    budget_values = np.asarray(budget_values, dtype=float)
+    cells = len(gpa_values) * len(ielts_values) * len(budget_values)
+    if cells > SWEEP_MAX_CELLS:
+        raise ValueError(f"Sweep grid has {cells} cells, the limit is {SWEEP_MAX_CELLS}")
+
+    return predict_admission_batch(
+        gpa_values[:, None, None],
+        ielts_values[None, :, None],
+        budget_values[None, None, :]
+    )
@@ -0,0 +1,79 @@
+"""
+Catalog Autocomplete
+Prefix suggestions over university, city, field and scholarship names,
+ranked by university ranking
+
+Cities, fields and scholarships take the best ranking among the universities
+they lead to (in that city, in that field, in the scholarship's country);
+entries with no ranked university come last.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from data_fetcher.catalog_snapshot import register_snapshot_index
+from utils.prefix_trie import PrefixTrie
+
+AUTOCOMPLETE_LIMIT = 8
+
+# Order among entries with the same ranking
+ENTRY_TYPES = ("university", "city", "field", "scholarship")
+
+
+class AutocompleteIndex:
+    """Prefix trie over one snapshot's names, built once per snapshot"""
+
+    def __init__(self, snapshot, k: int = AUTOCOMPLETE_LIMIT):
+        catalog = snapshot.universities
+        ranking = np.full(len(catalog), np.inf)
+        if catalog.has_column("ranking"):
+            ranking = catalog.column("ranking").astype(float)
+            ranking[np.isnan(ranking)] = np.inf
+
+        # (type, value) -> best ranking
+        best: Dict[tuple, float] = {}
+
+        def add(kind, values, ranks):
+            for value, rank in zip(values, ranks):
+                if isinstance(value, str) and value.strip():
+                    key = (kind, value)
+                    best[key] = min(best.get(key, np.inf), rank)
+
+        if catalog.has_column("university"):
+            add("university", catalog.column("university").tolist(), ranking.tolist())
+        country_best = {}
+        for name in ("city", "field", "country"):
+            if name in catalog.codes:
+                by_code = np.full(len(catalog.categories[name]), np.inf)
+                np.minimum.at(by_code, catalog.codes[name], ranking)
+                if name == "country":
+                    country_best = dict(zip(catalog.categories[name].tolist(), by_code.tolist()))
+                else:
+                    add(name, catalog.categories[name].tolist(), by_code.tolist())
+
+        df = snapshot.scholarships
+        if df is not None and "scholarship_name" in df.columns:
+            countries = df["country"].tolist() if "country" in df.columns else [None] * len(df)
+            add("scholarship", df["scholarship_name"].tolist(), [country_best.get(country, np.inf) for country in countries])
+
+        # Entry id = position in the global ranking
+        self.entries: List[Dict[str, Any]] = [
+            {"type": kind, "value": value}
+            for (kind, value), _ in sorted(
+                best.items(), key=lambda item: (item[1], ENTRY_TYPES.index(item[0][0]), len(item[0][1]), item[0][1])
+            )
+        ]
+        self.trie = PrefixTrie([entry["value"] for entry in self.entries], range(len(self.entries)), k)
+
+    def suggest(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[Dict[str, Any]]:
+        """Best names with a word starting with prefix: [{"type": ..., "value": ...}]"""
+        return [self.entries[entry] for entry in self.trie.complete(prefix)[:limit]]
+
+
+def get_autocomplete_index(snapshot) -> AutocompleteIndex:
+    """Get the autocomplete trie for a snapshot, building it once per snapshot"""
+    return snapshot.derived("autocomplete", AutocompleteIndex)
+
+
+register_snapshot_index("autocomplete", AutocompleteIndex)
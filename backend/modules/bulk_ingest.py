@@ -0,0 +1,195 @@
+"""
+Bulk Ingest Module
+Validate and commit large university / scholarship uploads chunk by chunk
+
+An upload is parsed INGEST_CHUNK_ROWS rows at a time. Each chunk is checked
+in one vectorized pass per rule (the utils/data_validator_v2 rules that
+UniversityValidationSchema applies, on catalog column names); accepted rows
+are appended to a staging file on disk and rejected rows are reported with
+their line number and reasons. Nothing reaches the catalog until the whole
+upload has been read: then every accepted row is committed in a single atomic
+swap of the CSV. Memory use depends on the chunk size and the reject report
+limit, not on the size of the upload.
+"""
+
+import csv
+import os
+import tempfile
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher.catalog_snapshot import get_catalog_snapshot
+from modules.admin_management import ingest_scholarships, ingest_universities
+from utils.data_validator_v2 import STUDENT_FIELD_RULES, UNIVERSITY_FIELD_RULES
+
+INGEST_CHUNK_ROWS = 10000
+
+# Rejected rows listed in the response (all of them are counted)
+INGEST_MAX_REPORTED_REJECTS = 1000
+
+# UniversityValidationSchema field names accepted in place of catalog columns
+UNIVERSITY_ALIASES = {"name": "university", "tuition_fee": "average_fees_eur"}
+
+# (column, kind, required, minimum, maximum, range message): the
+# UniversityValidationSchema rules on catalog column names, plus the student
+# IELTS range for the catalog's (optional) ielts_required
+UNIVERSITY_RULES = [
+    (UNIVERSITY_ALIASES.get(field, field), *rule) for field, *rule in UNIVERSITY_FIELD_RULES
+] + [
+    ("ielts_required", kind, False, minimum, maximum, message)
+    for field, kind, _, minimum, maximum, message in STUDENT_FIELD_RULES if field == "ielts"
+]
+
+SCHOLARSHIP_RULES = [
+    ("scholarship_name", "text", True, None, None, None),
+    ("country", "text", True, None, None, None),
+    ("amount_eur", "float", False, 0, None, "Amount cannot be negative")
+]
+
+# Columns of a new scholarships.csv
+SCHOLARSHIP_COLUMNS = ["scholarship_name", "country", "eligible_universities", "coverage", "amount_eur", "eligibility"]
+
+INGEST_DATASETS = ("universities", "scholarships")
+
+
+def validate_frame(df: pd.DataFrame, rules: Sequence[tuple]) -> List[Tuple[np.ndarray, str]]:
+    """
+    Check every rule against whole columns
+
+    Returns:
+        (row mask, message) for each rule that some rows break
+    """
+    failures = []
+
+    def fail(mask, message):
+        if mask.any():
+            failures.append((mask, message))
+
+    for column, kind, required, minimum, maximum, message in rules:
+        if column not in df.columns:
+            if required:
+                fail(np.ones(len(df), dtype=bool), f"{column} is required")
+            continue
+        values = df[column]
+        missing = (values.where(values.notna(), "").astype(str).str.strip() == "").to_numpy()
+        if required:
+            fail(missing, f"{column} is required")
+        if kind == "text":
+            continue
+
+        numbers = pd.to_numeric(values.where(~missing), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        unparsed = ~missing & np.isnan(numbers)
+        fail(unparsed, f"{column} must be a number")
+        known = ~missing & ~unparsed
+        if kind == "int":
+            fail(known & (np.mod(numbers, 1, where=known, out=np.zeros(len(numbers))) != 0), f"{column} must be an integer")
+        out_of_range = np.zeros(len(df), dtype=bool)
+        if minimum is not None:
+            out_of_range |= known & (numbers < minimum)
+        if maximum is not None:
+            out_of_range |= known & (numbers > maximum)
+        fail(out_of_range, message)
+    return failures
+
+
+class IngestJob:
+    """One upload: validated chunk by chunk, staged on disk, committed once"""
+
+    def __init__(self, dataset: str):
+        """
+        Raises:
+            ValueError: If dataset is not one of INGEST_DATASETS
+            FileNotFoundError: If universities are ingested before universities.csv exists
+        """
+        if dataset not in INGEST_DATASETS:
+            raise ValueError(f"dataset must be one of {', '.join(INGEST_DATASETS)}")
+        self.dataset = dataset
+        snapshot = get_catalog_snapshot()
+        if dataset == "universities":
+            self.rules, self.aliases = UNIVERSITY_RULES, UNIVERSITY_ALIASES
+            self.columns = list(snapshot.universities.column_names)
+        else:
+            self.rules, self.aliases = SCHOLARSHIP_RULES, {}
+            self.columns = list(snapshot.scholarships.columns) if snapshot.scholarships is not None else SCHOLARSHIP_COLUMNS
+
+        self.accepted = 0
+        self.rejected = 0
+        self.rejects: List[Dict[str, Any]] = []
+        self.ignored_columns = set()
+        self.header = None
+
+        fd, self.staged_path = tempfile.mkstemp(prefix="ingest-", suffix=".csv")
+        self._staged = os.fdopen(fd, "w", newline="")
+        csv.writer(self._staged).writerow(self.columns)
+
+    def add_csv_rows(self, lines: List[Tuple[int, List[str]]]):
+        """Add a chunk of parsed CSV records [(line number, fields)]; the first record of the upload is its header"""
+        if self.header is None:
+            (_, self.header), lines = lines[0], lines[1:]
+        width = len(self.header)
+        good = [(line, fields) for line, fields in lines if len(fields) == width]
+        malformed = [(line, [f"expected {width} fields, got {len(fields)}"]) for line, fields in lines if len(fields) != width]
+        df = pd.DataFrame([fields for _, fields in good], columns=self.header, dtype=object)
+        self._add_frame([line for line, _ in good], df, malformed)
+
+    def add_records(self, lines: List[Tuple[int, Any]]):
+        """Add a chunk of parsed NDJSON lines [(line number, object)]"""
+        good = [(line, record) for line, record in lines if isinstance(record, dict)]
+        malformed = [(line, ["expected a JSON object"]) for line, record in lines if not isinstance(record, dict)]
+        df = pd.DataFrame([record for _, record in good], dtype=object)
+        self._add_frame([line for line, _ in good], df, malformed)
+
+    def _add_frame(self, line_numbers: List[int], df: pd.DataFrame, malformed: List[Tuple[int, List[str]]]):
+        # Schema field names fill in for missing catalog columns
+        for alias, name in self.aliases.items():
+            if alias in df.columns:
+                df[name] = df[alias] if name not in df.columns else df[name].where(df[name].notna(), df[alias])
+                df = df.drop(columns=alias)
+        self.ignored_columns.update(name for name in df.columns if name not in self.columns)
+
+        failures = validate_frame(df, self.rules)
+        rejected = np.zeros(len(df), dtype=bool)
+        for mask, _ in failures:
+            rejected |= mask
+        rejects = malformed + [
+            (line_numbers[row], [message for mask, message in failures if mask[row]])
+            for row in np.flatnonzero(rejected).tolist()
+        ]
+        for line, errors in sorted(rejects, key=lambda reject: reject[0]):
+            self._reject(line, errors)
+
+        accepted = df[~rejected]
+        if len(accepted):
+            accepted.reindex(columns=self.columns).to_csv(self._staged, index=False, header=False)
+            self.accepted += len(accepted)
+
+    def _reject(self, line: int, errors: List[str]):
+        self.rejected += 1
+        if len(self.rejects) < INGEST_MAX_REPORTED_REJECTS:
+            self.rejects.append({"line": line, "errors": errors})
+
+    def commit(self) -> Dict[str, Any]:
+        """Commit the accepted rows (if any) in one swap and summarize the upload"""
+        self._staged.close()
+        if self.accepted:
+            if self.dataset == "universities":
+                ingest_universities(self.staged_path)
+            else:
+                ingest_scholarships(self.staged_path)
+        return {
+            "dataset": self.dataset,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "committed": self.accepted > 0,
+            "rejects": self.rejects,
+            "rejects_truncated": self.rejected > len(self.rejects),
+            "ignored_columns": sorted(self.ignored_columns)
+        }
+
+    def close(self):
+        """Remove the staging file"""
+        self._staged.close()
+        if os.path.exists(self.staged_path):
+            os.remove(self.staged_path)
@@ -0,0 +1,84 @@
+"""
+Catalog Full-Text Search
+BM25 ranking over universities (university, city, field, country) and
+scholarships (scholarship_name, eligible_universities, eligibility, coverage)
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from data_fetcher.catalog_snapshot import register_snapshot_index
+from utils.bm25 import BM25Index
+
+UNIVERSITY_SEARCH_COLUMNS = ("university", "city", "field", "country")
+SCHOLARSHIP_SEARCH_COLUMNS = ("scholarship_name", "eligible_universities", "eligibility", "coverage")
+
+
+class CatalogSearchIndex:
+    """
+    One BM25 index over both datasets of a snapshot, built once per snapshot
+
+    Documents 0..n_universities-1 are catalog rows, the rest are scholarship
+    rows, so both share term statistics and rank on one scale.
+    """
+
+    def __init__(self, snapshot):
+        self.universities = snapshot.universities
+        catalog = self.universities
+        self.n_universities = len(catalog)
+
+        texts = _join_columns(
+            [catalog.column(name) for name in UNIVERSITY_SEARCH_COLUMNS if catalog.has_column(name)],
+            self.n_universities
+        )
+
+        # Scholarships are few; keep their records ready to return
+        self.scholarship_records: List[Dict[str, Any]] = []
+        df = snapshot.scholarships
+        if df is not None:
+            texts += _join_columns(
+                [df[name].to_numpy() for name in SCHOLARSHIP_SEARCH_COLUMNS if name in df.columns],
+                len(df)
+            )
+            self.scholarship_records = df.to_dict(orient="records")
+
+        self.index = BM25Index(texts)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranked hits for a free-text query
+
+        Returns:
+            [{"type": "university" | "scholarship", "score": ..., **row}], best first
+        """
+        doc_ids, scores = self.index.search(query, limit)
+        is_university = doc_ids < self.n_universities
+        university_records = iter(self.universities.records(doc_ids[is_university]))
+
+        hits = []
+        for doc_id, score, university in zip(doc_ids.tolist(), scores.tolist(), is_university.tolist()):
+            if university:
+                hits.append({"type": "university", "score": round(score, 4), **next(university_records)})
+            else:
+                record = self.scholarship_records[doc_id - self.n_universities]
+                hits.append({"type": "scholarship", "score": round(score, 4), **record})
+        return hits
+
+
+def _join_columns(columns: List[np.ndarray], size: int) -> List[str]:
+    """One text per row from several text columns, skipping missing values"""
+    texts = [[] for _ in range(size)]
+    for column in columns:
+        for parts, value in zip(texts, column.tolist()):
+            if isinstance(value, str):
+                parts.append(value)
+    return [" ".join(parts) for parts in texts]
+
+
+def get_search_index(snapshot) -> CatalogSearchIndex:
+    """Get the full-text index for a snapshot, building it once per snapshot"""
+    return snapshot.derived("search_index", CatalogSearchIndex)
+
+
+register_snapshot_index("search_index", CatalogSearchIndex)
@@ -1,5 +1,15 @@
-import pandas as pd
-import os
+import numpy as np
+from bisect import bisect_right
+from functools import lru_cache
+
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, pushdown_storage, register_catalog_index
+from data_fetcher.scholarship_store import get_scholarship_store
+from modules.eligibility_index import get_eligibility_index
+from modules.name_resolver import get_name_resolver, resolve_scholarship_country
+from utils.constants import COUNTRY_NAMES
+from utils.fuzzy_lookup import SymSpellIndex
+from utils.helpers import resolve_data_path
+from utils.ranking import round_scores, top_k_order
 
 def calculate_roi(tuition_fee, expected_salary):
     """Calculate ROI (Return on Investment) for tuition fee vs expected salary"""
@@ -7,32 +17,53 @@ def calculate_roi(tuition_fee, expected_salary):
         return 0
     return round(expected_salary / tuition_fee, 2)
 
-def analyze_total_cost(tuition_fee, country, duration_years=2):
-    """Calculate total cost including living expenses by country"""
-    living_costs = {
-        "France": 900,
-        "Germany": 800,
-        "Netherlands": 1200,
-        "Belgium": 1000,
-        "Finland": 1100,
-        "Italy": 700,
-        "Spain": 800,
-        "Austria": 950,
-        "UK": 1400,
-        "USA": 1500,
-        "Canada": 1300,
-        "Australia": 1400,
-        "China": 600,
-        "India": 400,
-        "Japan": 1100
-    }
+# Average monthly living cost (EUR) by country
+LIVING_COSTS = {
+    "France": 900,
+    "Germany": 800,
+    "Netherlands": 1200,
+    "Belgium": 1000,
+    "Finland": 1100,
+    "Italy": 700,
+    "Spain": 800,
+    "Austria": 950,
+    "UK": 1400,
+    "USA": 1500,
+    "Canada": 1300,
+    "Australia": 1400,
+    "China": 600,
+    "India": 400,
+    "Japan": 1100
+}
+
+# Used for countries missing from LIVING_COSTS
+DEFAULT_MONTHLY_LIVING_COST = 1000
+
+# Misspelled country names ("Germnay", "netherland") resolve to a LIVING_COSTS key
+LIVING_COST_COUNTRIES = SymSpellIndex(LIVING_COSTS, protected=COUNTRY_NAMES)
+
+# Distinct unknown countries remembered, so repeats are not warned about again
+UNKNOWN_COUNTRY_WARNINGS = 256
+
+@lru_cache(maxsize=UNKNOWN_COUNTRY_WARNINGS)
+def _warn_unknown_country(country):
+    # Country names come from requests: only the most recent ones are kept
+    print(f"Warning: Country '{country}' not in living costs database. Using default of {DEFAULT_MONTHLY_LIVING_COST} EUR/month")
+
+def monthly_living_cost(country):
+    """Monthly living cost for a country, and the country as spelled in LIVING_COSTS"""
+    if isinstance(country, str):
+        country = LIVING_COST_COUNTRIES.lookup(country) or country
     
-    if country not in living_costs:
+    if country not in LIVING_COSTS:
         # Default to 1000 if country not found
-        print(f"Warning: Country '{country}' not in living costs database. Using default of 1000 EUR/month")
-        monthly_cost = 1000
-    else:
-        monthly_cost = living_costs[country]
+        _warn_unknown_country(country)
+        return DEFAULT_MONTHLY_LIVING_COST, country
+    return LIVING_COSTS[country], country
+
+def analyze_total_cost(tuition_fee, country, duration_years=2):
+    """Calculate total cost including living expenses by country"""
+    monthly_cost, country = monthly_living_cost(country)
     
     yearly_living = monthly_cost * 12
     total_cost = (tuition_fee + yearly_living) * duration_years
@@ -47,62 +78,210 @@ def analyze_total_cost(tuition_fee, country, duration_years=2):
         "total_cost_per_month": round(total_cost / (duration_years * 12), 2)
     }
 
-def find_affordable_universities(profile, max_budget):
-    """Find universities within budget"""
+class CatalogCostEngine:
+    """
+    Living and total study costs for every university of a catalog
+
+    Monthly living costs are looked up once per distinct country and kept as
+    an array indexed by country code, so costs for the whole catalog, for any
+    duration, are one vectorized pass producing exactly what
+    analyze_total_cost returns university by university.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.fees = catalog.column("average_fees_eur", np.nan).astype(float)
+        if "country" in catalog.codes:
+            monthly_by_code = np.array(
+                [monthly_living_cost(country)[0] for country in catalog.categories["country"].tolist()],
+                dtype=np.int64
+            )
+            self.monthly_living = monthly_by_code[catalog.codes["country"]]
+        else:
+            self.monthly_living = np.full(len(catalog), DEFAULT_MONTHLY_LIVING_COST, dtype=np.int64)
+
+    def costs(self, duration_years, rows=None):
+        """
+        Cost breakdown of the given rows (all rows by default)
+
+        Returns:
+            Dict of arrays: monthly_living_cost, yearly_living_cost,
+            total_cost and total_cost_per_month (both rounded to 2 places)
+
+        Raises:
+            ValueError: If duration_years is not positive
+        """
+        if not duration_years > 0:
+            raise ValueError("duration_years must be positive")
+        fees = self.fees if rows is None else self.fees[rows]
+        monthly = self.monthly_living if rows is None else self.monthly_living[rows]
+        yearly = monthly * 12
+        total = (fees + yearly) * duration_years
+        return {
+            "monthly_living_cost": monthly,
+            "yearly_living_cost": yearly,
+            "total_cost": round_scores(total, 2),
+            "total_cost_per_month": round_scores(total / (duration_years * 12), 2)
+        }
+
+    def rank_by_total_cost(self, duration_years, limit=None, country=None, max_total_cost=None):
+        """
+        Universities cheapest overall first (ties in catalog order)
+
+        Args:
+            duration_years: Length of study
+            limit: Number of universities returned (all if None)
+            country: Only universities in this country (misspellings resolved)
+            max_total_cost: Only universities whose rounded total cost is within it
+
+        Returns:
+            (number of universities that qualify, cost records of the cheapest `limit`)
+        """
+        costs = self.costs(duration_years)
+        total = costs["total_cost"]
+        keep = ~np.isnan(total)
+        if country and country.strip() and "country" in self.catalog.codes:
+            wanted = get_name_resolver(self.catalog).country(country).lower()
+            keep &= self.catalog.category_mask("country", lambda value: str(value).lower() == wanted)
+        if max_total_cost is not None:
+            keep &= total <= max_total_cost
+        rows = np.flatnonzero(keep)
+
+        order = top_k_order(-total[rows], len(rows) if limit is None else max(limit, 0))
+        rows = rows[order]
+        return int(keep.sum()), self.records(rows, duration_years)
+
+    def records(self, rows, duration_years):
+        """Shape rows like analyze_total_cost results, plus the university they are for"""
+        costs = self.costs(duration_years, rows)
+        columns = zip(
+            self.catalog.take("university", rows).tolist(),
+            self.catalog.take("country", rows).tolist(),
+            self.catalog.take("city", rows, "").tolist(),
+            self.fees[rows].tolist(),
+            costs["monthly_living_cost"].tolist(),
+            costs["yearly_living_cost"].tolist(),
+            costs["total_cost"].tolist(),
+            costs["total_cost_per_month"].tolist()
+        )
+        return [
+            {
+                "university": university,
+                "country": country,
+                "city": city,
+                "tuition_fee": tuition_fee,
+                "duration_years": duration_years,
+                "monthly_living_cost": monthly,
+                "yearly_living_cost": yearly,
+                "total_cost": total,
+                "total_cost_per_month": per_month
+            }
+            for university, country, city, tuition_fee, monthly, yearly, total, per_month in columns
+        ]
+
+def get_cost_engine(catalog):
+    """Get the cost engine for a catalog, building its lookup arrays once per catalog"""
+    return catalog.derived("cost_engine", CatalogCostEngine)
+
+register_catalog_index("cost_engine", CatalogCostEngine)
+
+class AffordabilityIndex:
+    """
+    Fees sorted ascending with running totals, for "what fits in this budget"
+
+    The universities within a budget are a prefix of the sorted fees, so one
+    bisect gives their count, the cheapest is the prefix's first row and the
+    average is the running total at its end divided by the count. Integral
+    fees (the usual case) are summed exactly as Python ints, so the average
+    is exactly the mean of the affordable fees.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.size = len(catalog)
+        # Missing fees sort last and never fit a budget
+        sorted_fees, order, n_valid = get_eligibility_index(catalog).sorted_columns.get(
+            "average_fees_eur", (np.array([]), np.array([], dtype=np.int64), 0)
+        )
+        self.fees = sorted_fees[:n_valid].tolist()
+        self.rows = order[:n_valid]
+        if all(fee.is_integer() for fee in self.fees):
+            self.cumulative = np.cumsum([int(fee) for fee in self.fees], dtype=object).tolist()
+        else:
+            self.cumulative = np.cumsum(sorted_fees[:n_valid]).tolist()
+        # Whatever the budget, the cheapest university is the first sorted row
+        self.cheapest = catalog.records(self.rows[:1])[0] if n_valid else None
+
+    def summary(self, max_budget):
+        """find_affordable_universities' result for one budget"""
+        count = bisect_right(self.fees, max_budget) if max_budget == max_budget else 0
+        total = self.size
+        return {
+            "total_universities": total,
+            "affordable_universities": count,
+            "percentage_affordable": round((count / total) * 100, 2) if total > 0 else 0,
+            "cheapest_university": dict(self.cheapest) if count > 0 else None,
+            "average_fee_in_budget": round(self.cumulative[count - 1] / count, 2) if count > 0 else 0
+        }
+
+def get_affordability_index(catalog):
+    """Get the affordability index for a catalog, building it once per catalog"""
+    return catalog.derived("affordability_index", AffordabilityIndex)
+
+register_catalog_index("affordability_index", AffordabilityIndex)
+
+def find_affordable_universities(profile, max_budget, snapshot=None):
+    """Find universities within budget (in the given catalog snapshot, or the current one)"""
     if not max_budget:
         return {"error": "Budget is required"}
     
-    csv_path = "backend/data/universities.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/universities.csv"
-    
-    if not os.path.exists(csv_path):
-        return {"error": f"Universities data file not found at {csv_path}"}
+    # SQLite storage answers from its fee index while it holds the snapshot's data
+    try:
+        if snapshot is None:
+            snapshot = get_catalog_snapshot()
+        catalog = snapshot.universities
+        storage = pushdown_storage(snapshot)
+    except FileNotFoundError:
+        return {"error": f"Universities data file not found at {resolve_data_path('universities.csv')}"}
     
     try:
-        df = pd.read_csv(csv_path)
-        
         # Validate required columns
         required_cols = ["university", "country", "average_fees_eur"]
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = [col for col in required_cols if not catalog.has_column(col)]
         if missing_cols:
             return {"error": f"Missing columns in CSV: {missing_cols}"}
         
-        affordable = df[df["average_fees_eur"] <= max_budget]
-        
-        return {
-            "total_universities": len(df),
-            "affordable_universities": len(affordable),
-            "percentage_affordable": round((len(affordable) / len(df)) * 100, 2) if len(df) > 0 else 0,
-            "cheapest_university": affordable.loc[affordable["average_fees_eur"].idxmin()].to_dict() if len(affordable) > 0 else None,
-            "average_fee_in_budget": round(affordable["average_fees_eur"].mean(), 2) if len(affordable) > 0 else 0
-        }
+        if storage is not None:
+            return storage.affordability(max_budget)
+        return get_affordability_index(catalog).summary(max_budget)
     except Exception as e:
         return {"error": f"Error reading universities data: {str(e)}"}
 
-def match_scholarships(profile, country):
-    """Match scholarships based on student profile and country"""
-    csv_path = "backend/data/scholarships.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/scholarships.csv"
-    
-    if not os.path.exists(csv_path):
-        return []
-    
+def match_scholarships(profile, country, snapshot=None):
+    """Match scholarships based on student profile and country (in the given catalog snapshot, or the current one)"""
     try:
-        df = pd.read_csv(csv_path)
+        if snapshot is None:
+            snapshot = get_catalog_snapshot()
+        store = get_scholarship_store(snapshot)
+        if store is None:
+            return []
         
         # Validate required columns
         required_cols = ["scholarship_name", "country", "coverage", "amount_eur", "eligibility"]
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = [col for col in required_cols if col not in store.columns]
         if missing_cols:
             return []
         
-        # Filter scholarships by country
-        scholarships = df[df["country"] == country]
+        # Filter scholarships by country (as spelled in the data)
+        country = resolve_scholarship_country(country, snapshot)
+        storage = pushdown_storage(snapshot)
+        if storage is not None:
+            scholarships = storage.scholarships(country=country)
+        else:
+            scholarships = store.get(store.rows_equal("country", country))
         
         results = []
-        for _, row in scholarships.iterrows():
+        for row in scholarships:
             results.append({
                 "name": row["scholarship_name"],
                 "country": row["country"],
@@ -115,4 +294,3 @@ def match_scholarships(profile, country):
     except Exception as e:
         print(f"Error reading scholarships data: {str(e)}")
         return []
-
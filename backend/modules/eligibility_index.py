@@ -0,0 +1,160 @@
+"""
+Eligibility Index
+Answers "which universities does this profile qualify for" without scanning the catalog
+
+Threshold columns (min_gpa, min_ielts, ielts_required, average_fees_eur) are
+kept sorted with their row order, so "requirement <= student value" is one
+bisect giving a prefix of rows. Country, city and field keep the row ids of
+each distinct value; country and field, which have few values, also get one
+bitset per value. City is checked through its category codes instead, so it
+costs nothing per distinct city. A query starts from its most selective
+piece (the shortest prefix or the smallest set of category rows) and only
+checks those candidates against the remaining conditions.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from data_fetcher.catalog_snapshot import register_catalog_index
+
+
+class EligibilityIndex:
+    """Sorted threshold columns plus per-category postings and bitsets over a UniversityCatalog"""
+
+    THRESHOLD_COLUMNS = ("min_gpa", "min_ielts", "ielts_required", "average_fees_eur")
+    CATEGORY_COLUMNS = ("country", "city", "field")
+    # Low-cardinality columns worth a dense bitset per value
+    BITSET_COLUMNS = ("country", "field")
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.size = len(catalog)
+
+        # name -> (sorted values, row order, number of non-missing values)
+        self.sorted_columns = {}
+        for name in self.THRESHOLD_COLUMNS:
+            if catalog.has_column(name):
+                values = catalog.column(name).astype(float)
+                order = np.argsort(values, kind="stable")
+                sorted_values = values[order]
+                n_valid = len(values) - int(np.isnan(sorted_values).sum())
+                self.sorted_columns[name] = (sorted_values, order, n_valid)
+
+        # name -> row ids per category code; name -> bitset per category code
+        self.postings = {}
+        self.bitsets = {}
+        for name in self.CATEGORY_COLUMNS:
+            if name not in catalog.codes:
+                continue
+            codes = catalog.codes[name]
+            n_codes = len(catalog.categories[name])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(n_codes + 1))
+            self.postings[name] = [order[bounds[code]:bounds[code + 1]] for code in range(n_codes)]
+            if name in self.BITSET_COLUMNS:
+                bitsets = np.zeros((n_codes, (self.size + 7) // 8), dtype=np.uint8)
+                rows = np.arange(self.size)
+                np.bitwise_or.at(bitsets, (codes, rows >> 3), (1 << (rows & 7)).astype(np.uint8))
+                self.bitsets[name] = bitsets
+
+    def sorted_rows(self, name: str) -> np.ndarray:
+        """Row positions ordered by a threshold column, ascending (stable)"""
+        return self.sorted_columns[name][1]
+
+    def query(
+        self,
+        requirements: Optional[Dict[str, float]] = None,
+        categories: Optional[Dict[str, Union[Callable[[Any], bool], Iterable[int]]]] = None,
+        missing_passes: bool = False
+    ) -> np.ndarray:
+        """
+        Rows meeting every condition, in catalog order
+
+        Args:
+            requirements: {column: student value}; keeps rows where column <= value.
+                A column the catalog lacks counts as a requirement of 0.
+            categories: {column: predicate or category codes}; keeps rows whose
+                value satisfies the predicate (run once per distinct value) or
+                whose category code is listed. A column the catalog lacks
+                matches no row.
+            missing_passes: Whether a missing (NaN) requirement counts as met.
+                /recommend lets them through, recommend_universities does not.
+
+        Returns:
+            Sorted array of row positions
+        """
+        requirements = requirements or {}
+        categories = categories or {}
+
+        # Bisect every threshold: rows meeting it are a prefix of its sort order
+        prefixes = []
+        for name, value in requirements.items():
+            if name not in self.sorted_columns:
+                if value < 0:
+                    return np.array([], dtype=np.int64)
+                continue
+            sorted_values, order, n_valid = self.sorted_columns[name]
+            count = int(np.searchsorted(sorted_values[:n_valid], value, side="right"))
+            tail = self.size - n_valid if missing_passes else 0
+            prefixes.append((count + tail, name, value))
+
+        # One filter per category: a bitset union, or a mask over category codes
+        sets = []
+        for name, condition in categories.items():
+            if name not in self.postings:
+                return np.array([], dtype=np.int64)
+            postings = self.postings[name]
+            if callable(condition):
+                matching = [code for code, category in enumerate(self.catalog.categories[name]) if condition(category)]
+            else:
+                matching = list(condition)
+            if not matching:
+                return np.array([], dtype=np.int64)
+            if name in self.bitsets:
+                check = np.bitwise_or.reduce(self.bitsets[name][matching], axis=0)
+            else:
+                check = np.zeros(len(postings), dtype=bool)
+                check[matching] = True
+            sets.append((sum(len(postings[code]) for code in matching), name, check, matching))
+
+        # Start from the most selective piece
+        prefixes.sort(key=lambda item: item[0])
+        sets.sort(key=lambda item: item[0])
+        if prefixes and (not sets or prefixes[0][0] <= sets[0][0]):
+            _, name, value = prefixes.pop(0)
+            rows = self._threshold_rows(name, value, missing_passes)
+        elif sets:
+            _, name, _, matching = sets.pop(0)
+            postings = self.postings[name]
+            rows = np.concatenate([postings[code] for code in matching])
+        else:
+            return np.arange(self.size)
+
+        # Check the candidates against everything else
+        for _, name, value in prefixes:
+            column = self.catalog.take(name, rows)
+            keep = ~(value < column) if missing_passes else column <= value
+            rows = rows[keep]
+        for _, name, check, _ in sets:
+            if name in self.bitsets:
+                rows = rows[((check[rows >> 3] >> (rows & 7).astype(np.uint8)) & 1).astype(bool)]
+            else:
+                rows = rows[check[self.catalog.codes[name][rows]]]
+
+        return np.sort(rows)
+
+    def _threshold_rows(self, name: str, value: float, missing_passes: bool) -> np.ndarray:
+        sorted_values, order, n_valid = self.sorted_columns[name]
+        count = int(np.searchsorted(sorted_values[:n_valid], value, side="right"))
+        if missing_passes and n_valid < self.size:
+            return np.concatenate([order[:count], order[n_valid:]])
+        return order[:count]
+
+
+def get_eligibility_index(catalog) -> EligibilityIndex:
+    """Get the eligibility index for a catalog, building it once per catalog"""
+    return catalog.derived("eligibility_index", EligibilityIndex)
+
+
+register_catalog_index("eligibility_index", EligibilityIndex)
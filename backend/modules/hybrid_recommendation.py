@@ -7,6 +7,9 @@ from typing import List, Dict, Any, Optional
 import numpy as np
 from dataclasses import dataclass
 
+from modules.admission_model import get_admission_model
+from utils.ranking import top_k_order
+
 @dataclass
 class ScoredUniversity:
     """University with scoring components"""
@@ -77,9 +80,15 @@ class HybridRecommendationEngine:
         student_profile: Dict[str, Any]
     ) -> float:
         """Get ML model's prediction score"""
-        # TODO: Call existing admission_prediction module
-        # For now, placeholder using simple heuristics
+        model = get_admission_model()
+        if model is not None:
+            return model.score(
+                student_profile.get('gpa') or 0,
+                student_profile.get('ielts') or 0,
+                student_profile.get('budget') or 0
+            )
         
+        # No usable model artifact: simple heuristics
         gpa_fit = min(1.0, (student_profile.get('gpa', 0) / 4.0))
         ielts_fit = min(1.0, (student_profile.get('ielts', 0) / 9.0))
         
@@ -173,20 +182,131 @@ class HybridRecommendationEngine:
         Returns:
             Ranked list of scored universities
         """
-        scored = [
-            self.score_university(uni, student_profile)
-            for uni in universities
+        if not universities:
+            return []
+        scores = self._score_arrays(universities, student_profile)
+        if scores is None:
+            # Values the arrays cannot hold (or a zero budget): score one by one, as before
+            scored = [
+                self.score_university(uni, student_profile)
+                for uni in universities
+            ]
+            key = _sort_field(sort_by)
+            scored.sort(key=lambda x: getattr(x, key), reverse=True)
+            return scored[:top_k] if top_k else scored
+
+        # Sort by specified criterion (stable, like list.sort)
+        key = _sort_field(sort_by)
+        if key == "acceptance_probability":
+            keys = np.full(len(universities), scores["ml_score"] * 100)
+        else:
+            keys = scores[key]
+        if top_k and top_k > 0:
+            order = top_k_order(keys, top_k)
+        else:
+            order = top_k_order(keys, len(keys))[:top_k or None]
+
+        # Result objects only for the rows returned
+        ml_score = scores["ml_score"]
+        cost_fit = scores["cost_fit"].tolist()
+        return [
+            ScoredUniversity(
+                university_id=universities[i].get('id'),
+                name=universities[i].get('name'),
+                ml_score=ml_score,
+                rule_score=scores["rule_score"][i],
+                combined_score=scores["combined_score"][i],
+                acceptance_probability=ml_score * 100,
+                cost_fit=cost_fit[i]
+            )
+            for i in order.tolist()
         ]
-        
-        # Sort by specified criterion
-        if sort_by == "acceptance_probability":
-            scored.sort(key=lambda x: x.acceptance_probability, reverse=True)
-        elif sort_by == "cost_fit":
-            scored.sort(key=lambda x: x.cost_fit, reverse=True)
-        else:  # combined_score (default)
-            scored.sort(key=lambda x: x.combined_score, reverse=True)
-        
-        if top_k:
-            scored = scored[:top_k]
-        
-        return scored
+
+    def _score_arrays(
+        self,
+        universities: List[Dict[str, Any]],
+        student_profile: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        score_university for every university at once, as arrays
+
+        Same arithmetic in the same order as the scalar methods, so the
+        numbers are identical. Python's min(1.0, x) / max(0, x) are written
+        as np.where on the same comparison, which also keeps their NaN
+        handling. Returns None if a ranking, fee or budget is not a number
+        (or is a float narrower than float64) or the budget is zero; the
+        scalar path handles those, raising where it always has.
+        """
+        ranking = _numbers(universities, 'ranking', 500)
+        rule_tuition = _numbers(universities, 'tuition_fee', 50000)
+        fit_tuition = _numbers(universities, 'tuition_fee', 25000)
+        rule_budget = student_profile.get('budget', float('inf'))
+        fit_budget = student_profile.get('budget', 50000)
+        if ranking is None or rule_tuition is None or fit_tuition is None:
+            return None
+        if not _is_float64_number(rule_budget) or not _is_float64_number(fit_budget) or rule_budget == 0:
+            return None
+
+        # The ML score depends on the student only
+        ml_score = self._get_ml_score(universities[0], student_profile)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            score = np.full(len(universities), 0.5)
+            ranking_ratio = ranking / 500
+            score += (1.0 - np.where(ranking_ratio < 1.0, ranking_ratio, 1.0)) * 0.2
+
+            over_budget = 1.0 - (rule_tuition - rule_budget) / rule_budget
+            cost_score = np.where(rule_tuition <= rule_budget, 1.0, np.where(over_budget > 0, over_budget, 0))
+            score += cost_score * 0.2
+
+            if 'field' in student_profile:
+                with_programs = [i for i, uni in enumerate(universities) if 'programs' in uni]
+                field_match = np.array([
+                    self._calculate_field_match(student_profile['field'], universities[i]['programs'])
+                    for i in with_programs
+                ], dtype=float)
+                score[with_programs] += field_match * 0.2
+
+            country = student_profile.get('country')
+            same_country = np.array([country == uni.get('country') for uni in universities], dtype=bool)
+            score[same_country] += 0.1
+            rule_score = np.clip(score, 0, 1)
+
+            within = fit_tuition / fit_budget + 0.5
+            over = 1.0 - (fit_tuition - fit_budget) / fit_budget
+            cost_fit = np.where(
+                fit_tuition <= fit_budget,
+                np.where(within < 1.0, within, 1.0),
+                np.where(over > 0, over, 0)
+            )
+
+        return {
+            "ml_score": ml_score,
+            "rule_score": rule_score,
+            "combined_score": self.ml_weight * ml_score + self.rule_weight * rule_score,
+            "cost_fit": cost_fit
+        }
+
+
+_FLOAT64_TYPES = (int, float, bool, np.float64)
+
+
+def _sort_field(sort_by: str) -> str:
+    """ScoredUniversity field rank_universities sorts on (combined_score unless another is named)"""
+    return sort_by if sort_by in ("acceptance_probability", "cost_fit") else "combined_score"
+
+
+def _is_float64_number(value: Any) -> bool:
+    # Narrower NumPy floats would be computed in their own precision one by one
+    return type(value) in _FLOAT64_TYPES or isinstance(value, np.integer)
+
+
+def _numbers(universities: List[Dict[str, Any]], key: str, default: Any) -> Optional[np.ndarray]:
+    """
+    university.get(key, default) for every university as a float64 array, or
+    None if some value is not a Python number, NumPy integer or float64
+    """
+    values = [uni.get(key, default) for uni in universities]
+    if not all(kind in _FLOAT64_TYPES or issubclass(kind, np.integer) for kind in {type(value) for value in values}):
+        return None
+    return np.array(values, dtype=float)
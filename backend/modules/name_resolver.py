@@ -0,0 +1,112 @@
+"""
+Name Resolver
+Typo-tolerant lookup of the country, field and university names users type,
+against the values actually present in the catalog and scholarship data
+
+"Germnay", "netherland" or "computer sciense" resolve to the catalog's own
+spelling through SymSpell dictionaries built once per catalog / snapshot.
+Values that already match keep their exact meaning, and values with no close
+entry are returned unchanged, so filters behave as before for them. A real
+country name absent from the data ("Austria" with no Austrian scholarships)
+is not a typo and is never rewritten to a neighbour ("Australia").
+"""
+
+import re
+from typing import Optional
+
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, register_catalog_index, register_snapshot_index
+from modules.text_search import get_text_index
+from utils.constants import COUNTRY_NAMES
+from utils.fuzzy_lookup import PhraseIndex, SymSpellIndex
+
+
+class CatalogNameResolver:
+    """Dictionaries over one catalog's countries, fields and university names"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.countries = SymSpellIndex(catalog.categories["country"] if "country" in catalog.codes else [], protected=COUNTRY_NAMES)
+        names = catalog.column("university").tolist() if catalog.has_column("university") else []
+        self.universities = PhraseIndex(names)
+        # First catalog row of each name
+        self.university_rows = {}
+        for row, name in enumerate(names):
+            self.university_rows.setdefault(name, row)
+
+        # "Computer Science / AI" can be asked for whole or as "computer science" or "ai"
+        fields = []
+        for value in (catalog.categories["field"] if "field" in catalog.codes else []):
+            if isinstance(value, str):
+                fields.append(value)
+                fields.extend(part.strip() for part in re.split(r"[/,&]", value))
+        self.fields = SymSpellIndex(fields)
+
+    def country(self, value: Optional[str]) -> Optional[str]:
+        """Catalog spelling of a country, or value itself if none is close"""
+        if not value or not value.strip():
+            return value
+        return self.countries.lookup(value) or value
+
+    def field(self, value: Optional[str]) -> Optional[str]:
+        """
+        value if it already matches a field by substring (the /recommend
+        filter), else the closest field name, else value
+        """
+        if not value or not value.strip() or "field" not in self.catalog.codes:
+            return value
+        if len(get_text_index(self.catalog).field_codes(value.lower())):
+            return value
+        return self.fields.lookup(value) or value
+
+    def university(self, value: Optional[str]) -> Optional[str]:
+        """Catalog spelling of a university name, or value itself if none is close"""
+        if not value or not value.strip():
+            return value
+        return self.universities.lookup(value) or value
+
+    def university_row(self, value: Optional[str]) -> Optional[int]:
+        """Catalog row of the university value names (after resolving), or None"""
+        if not value or not value.strip():
+            return None
+        return self.university_rows.get(self.university(value))
+
+
+class ScholarshipNameResolver:
+    """Dictionary over the scholarship data's countries"""
+
+    def __init__(self, snapshot):
+        df = snapshot.scholarships
+        countries = df["country"].unique().tolist() if df is not None and "country" in df.columns else []
+        self.countries = SymSpellIndex(countries, protected=COUNTRY_NAMES)
+
+    def country(self, value: Optional[str]) -> Optional[str]:
+        """Scholarship data spelling of a country, or value itself if none is close"""
+        if not value or not value.strip():
+            return value
+        return self.countries.lookup(value) or value
+
+
+def get_name_resolver(catalog) -> CatalogNameResolver:
+    """Get the name resolver for a catalog, building its dictionaries once per catalog"""
+    return catalog.derived("name_resolver", CatalogNameResolver)
+
+
+def get_scholarship_name_resolver(snapshot) -> ScholarshipNameResolver:
+    """Get the scholarship name resolver for a snapshot, building it once per snapshot"""
+    return snapshot.derived("scholarship_name_resolver", ScholarshipNameResolver)
+
+
+def resolve_scholarship_country(country: Optional[str], snapshot=None) -> Optional[str]:
+    """Resolve a country against a snapshot's (default: the current one's) scholarships (unchanged if no snapshot loads)"""
+    if not country:
+        return country
+    try:
+        if snapshot is None:
+            snapshot = get_catalog_snapshot()
+    except FileNotFoundError:
+        return country
+    return get_scholarship_name_resolver(snapshot).country(country)
+
+
+register_catalog_index("name_resolver", CatalogNameResolver)
+register_snapshot_index("scholarship_name_resolver", ScholarshipNameResolver)
@@ -1,54 +1,119 @@
-import pandas as pd
-import os
+import re
+from typing import List
+
+# ---------- Intent table ----------
+# Rules in priority order: (intent, keyword groups, answer). A rule matches
+# when the query contains at least one keyword from every group; the first
+# matching rule answers.
+
+COUNTRY_INFO = {
+    "france": "France offers affordable education (€6,000-€8,000/year) with strong AI and Computer Science programs. Universities like Sorbonne, Paris-Saclay, and Grenoble are top-ranked. IELTS requirement: 6.0-6.5. Scholarships: Eiffel, Charpak, Erasmus+.",
+    "germany": "Germany offers low-cost education with excellent STEM programs. Many public universities are FREE or very affordable (€8,000-€9,000/year). Top universities: TU Munich, RWTH Aachen. IELTS: 6.5. Scholarships: DAAD.",
+    "netherlands": "Netherlands has high tuition fees (€12,000-€13,000/year) but excellent education quality. Amsterdam and Delft are world-renowned. IELTS: 7.0. Living costs: €1,200/month.",
+    "italy": "Italy offers very affordable education (€3,000-€4,000/year) with rich academic history. Milan (Politecnico) and Bologna are top choices. IELTS: 6.0.",
+    "spain": "Spain provides affordable education (€4,500/year) with strong programs. Barcelona and Madrid universities are well-ranked. IELTS: 6.5. Living cost: €800/month."
+}
+
+INTENTS = [
+    ("ielts_requirements", [("ielts",), ("requirement", "how much")],
+     "IELTS requirements vary by university and program: Most require 6.0-7.0. Top universities typically require 6.5-7.5. Some universities accept 5.5 minimum. Check specific university requirements for accurate information."),
+    ("ielts", [("ielts",)],
+     "IELTS (International English Language Testing System) is widely accepted for university admissions in Europe. Scores range from 0-9, with 6.0+ typically required for master's programs."),
+    ("scholarship", [("scholarship",)],
+     "Popular scholarships include: Erasmus+ (Europe-wide), DAAD (Germany), Eiffel Excellence (France), Orange Tulip (Netherlands), Campus France, and country-specific schemes. Most require merit-based selection. Apply early!"),
+    ("cost", [("cost", "budget", "expensive", "cheap", "afford")],
+     "Tuition costs vary significantly: Cheapest: Italy/Spain (€3,000-€4,500/year), Mid-range: France/Germany (€6,000-€9,000), Expensive: Netherlands (€12,000-€13,000). Living costs: €700-€1,200/month depending on country. Plan total budget accordingly."),
+    ("academic", [("gpa", "academic", "grades")],
+     "Most master's programs require minimum GPA of 3.0+ (on 4.0 scale). Top-tier universities prefer 3.5+. Your GPA combined with IELTS and work experience determines admission chances. Strong GPA can help secure scholarships."),
+    *[(country, [(country,)], info) for country, info in COUNTRY_INFO.items()],
+    ("living", [("living", "accommodation", "food")],
+     "Average monthly living costs (excluding tuition): France/Germany/Austria: €800-€1,000 | Netherlands/Belgium/Finland: €1,100-€1,200 | Italy/Spain: €700-€800. Budget includes rent, food, transport, and entertainment."),
+    ("application", [("apply", "application", "admission")],
+     "Typical application requirements: Bachelor's degree + transcript, IELTS/TOEFL scores, Statement of Purpose (SOP), CV, recommendation letters, entrance exam (if required). Application timeline: 6-12 months before intake. Submit early for better scholarship chances."),
+    ("career", [("work", "job", "career", "salary")],
+     "Most European countries allow post-study work visas (1-2 years). Germany and Netherlands offer extended work permits. Average starting salaries for AI/CS graduates: €30,000-€50,000/year depending on country and role. EU degrees are highly valued globally."),
+]
+
+DEFAULT_ANSWER = "I can help with queries about countries (France, Germany, Netherlands, Italy, Spain), IELTS requirements, scholarships, costs, application process, and career opportunities. Could you rephrase your question?"
+
+
+class IntentMatcher:
+    """
+    All keywords of an intent table compiled into one regex
+
+    The pattern is a lookahead tried at every position, so overlapping
+    keywords are all found in a single pass. Alternatives are ordered longest
+    first; a keyword that is a prefix of a longer one (which the regex then
+    skips at that position) is credited through the longer keyword's bitmask.
+
+    A keyword without whitespace always lies inside one whitespace-separated
+    token, so the regex runs once per distinct token and its hits are
+    memoized; a query is then a split plus a few dict lookups. Keywords that
+    contain whitespace are checked against the whole query. The winning
+    answer is memoized per combination of hits.
+    """
+
+    CACHE_SIZE = 100000
+
+    def __init__(self, intents):
+        self.intents = intents
+        keywords = sorted({keyword for _, groups, _ in intents for group in groups for keyword in group})
+        bits = {keyword: 1 << i for i, keyword in enumerate(keywords)}
+        self.keyword_mask = {
+            keyword: sum(bit for other, bit in bits.items() if keyword.startswith(other))
+            for keyword in keywords
+        }
+        words = [keyword for keyword in keywords if len(keyword.split()) == 1 and keyword.strip() == keyword]
+        self.phrases = [(keyword, bits[keyword]) for keyword in keywords if keyword not in words]
+        alternatives = "|".join(re.escape(keyword) for keyword in sorted(words, key=len, reverse=True))
+        self.pattern = re.compile(f"(?=({alternatives}))")
+        # Per rule: one bitmask per keyword group
+        self.rules = [
+            (name, [sum(bits[keyword] for keyword in group) for group in groups], answer)
+            for name, groups, answer in intents
+        ]
+        self._token_hits = {}
+        self._answers = {}
+
+    def keyword_hits(self, text: str) -> int:
+        """Bitmask of the keywords occurring in text (already lowercased)"""
+        found = 0
+        cache = self._token_hits
+        for token in text.split():
+            hits = cache.get(token)
+            if hits is None:
+                hits = 0
+                for keyword in self.pattern.findall(token):
+                    hits |= self.keyword_mask[keyword]
+                if len(cache) >= self.CACHE_SIZE:
+                    cache.clear()
+                cache[token] = hits
+            found |= hits
+        for phrase, bit in self.phrases:
+            if phrase in text:
+                found |= bit
+        return found
+
+    def match(self, query: str) -> List[str]:
+        """Names of every matching intent, highest priority first"""
+        found = self.keyword_hits(query.lower())
+        return [name for name, groups, _ in self.rules if all(found & group for group in groups)]
+
+    def answer(self, query: str, default: str) -> str:
+        """Answer of the highest-priority matching intent"""
+        found = self.keyword_hits(query.lower())
+        answer = self._answers.get(found)
+        if answer is None:
+            answer = next((answer for _, groups, answer in self.rules if all(found & group for group in groups)), default)
+            if len(self._answers) >= self.CACHE_SIZE:
+                self._answers.clear()
+            self._answers[found] = answer
+        return answer
+
+
+INTENT_MATCHER = IntentMatcher(INTENTS)
+
 
 def answer_query(query):
     """Intelligent NLP-based query answering system"""
-    query_lower = query.lower()
-    
-    # Country-specific queries
-    country_info = {
-        "france": "France offers affordable education (€6,000-€8,000/year) with strong AI and Computer Science programs. Universities like Sorbonne, Paris-Saclay, and Grenoble are top-ranked. IELTS requirement: 6.0-6.5. Scholarships: Eiffel, Charpak, Erasmus+.",
-        "germany": "Germany offers low-cost education with excellent STEM programs. Many public universities are FREE or very affordable (€8,000-€9,000/year). Top universities: TU Munich, RWTH Aachen. IELTS: 6.5. Scholarships: DAAD.",
-        "netherlands": "Netherlands has high tuition fees (€12,000-€13,000/year) but excellent education quality. Amsterdam and Delft are world-renowned. IELTS: 7.0. Living costs: €1,200/month.",
-        "italy": "Italy offers very affordable education (€3,000-€4,000/year) with rich academic history. Milan (Politecnico) and Bologna are top choices. IELTS: 6.0.",
-        "spain": "Spain provides affordable education (€4,500/year) with strong programs. Barcelona and Madrid universities are well-ranked. IELTS: 6.5. Living cost: €800/month."
-    }
-    
-    # Test requirements
-    if "ielts" in query_lower:
-        if "requirement" in query_lower or "how much" in query_lower:
-            return "IELTS requirements vary by university and program: Most require 6.0-7.0. Top universities typically require 6.5-7.5. Some universities accept 5.5 minimum. Check specific university requirements for accurate information."
-        else:
-            return "IELTS (International English Language Testing System) is widely accepted for university admissions in Europe. Scores range from 0-9, with 6.0+ typically required for master's programs."
-    
-    # Scholarship queries
-    if "scholarship" in query_lower:
-        return "Popular scholarships include: Erasmus+ (Europe-wide), DAAD (Germany), Eiffel Excellence (France), Orange Tulip (Netherlands), Campus France, and country-specific schemes. Most require merit-based selection. Apply early!"
-    
-    # Cost/Budget queries
-    if "cost" in query_lower or "budget" in query_lower or "expensive" in query_lower or "cheap" in query_lower or "afford" in query_lower:
-        return "Tuition costs vary significantly: Cheapest: Italy/Spain (€3,000-€4,500/year), Mid-range: France/Germany (€6,000-€9,000), Expensive: Netherlands (€12,000-€13,000). Living costs: €700-€1,200/month depending on country. Plan total budget accordingly."
-    
-    # GPA/Academic queries
-    if "gpa" in query_lower or "academic" in query_lower or "grades" in query_lower:
-        return "Most master's programs require minimum GPA of 3.0+ (on 4.0 scale). Top-tier universities prefer 3.5+. Your GPA combined with IELTS and work experience determines admission chances. Strong GPA can help secure scholarships."
-    
-    # Country-specific help
-    for country, info in country_info.items():
-        if country in query_lower:
-            return info
-    
-    # Living cost queries
-    if "living" in query_lower or "accommodation" in query_lower or "food" in query_lower:
-        return "Average monthly living costs (excluding tuition): France/Germany/Austria: €800-€1,000 | Netherlands/Belgium/Finland: €1,100-€1,200 | Italy/Spain: €700-€800. Budget includes rent, food, transport, and entertainment."
-    
-    # Application process
-    if "apply" in query_lower or "application" in query_lower or "admission" in query_lower:
-        return "Typical application requirements: Bachelor's degree + transcript, IELTS/TOEFL scores, Statement of Purpose (SOP), CV, recommendation letters, entrance exam (if required). Application timeline: 6-12 months before intake. Submit early for better scholarship chances."
-    
-    # Work after graduation
-    if "work" in query_lower or "job" in query_lower or "career" in query_lower or "salary" in query_lower:
-        return "Most European countries allow post-study work visas (1-2 years). Germany and Netherlands offer extended work permits. Average starting salaries for AI/CS graduates: €30,000-€50,000/year depending on country and role. EU degrees are highly valued globally."
-    
-    # Default response
-    return f"I can help with queries about countries (France, Germany, Netherlands, Italy, Spain), IELTS requirements, scholarships, costs, application process, and career opportunities. Could you rephrase your question?"
+    return INTENT_MATCHER.answer(query, DEFAULT_ANSWER)
@@ -0,0 +1,154 @@
+"""
+Query Constraint Parser
+Pulls budget, IELTS, GPA, country, city and field out of free-text questions
+such as "cheap AI masters in Germany under 9000 with IELTS 6.5"
+
+Numbers are found with precompiled regexes. Places and fields come from
+gazetteers built from the catalog's own country, city and field values,
+compiled into one word-boundary regex per catalog.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from data_fetcher.catalog_snapshot import register_catalog_index
+
+NUMBER = r"(\d{1,3}(?:[,.]\d{3})+|\d+(?:\.\d+)?)"
+
+IELTS_PATTERNS = [
+    re.compile(r"\bielts\b(?:\s+(?:score|band))?(?:\s+(?:of|is|=|:))?\s*(\d(?:\.\d)?)\b"),
+    re.compile(r"\b(\d(?:\.\d)?)\s*(?:band\s+)?(?:in\s+)?ielts\b"),
+]
+GPA_PATTERNS = [
+    re.compile(r"\b(?:gpa|cgpa)\b(?:\s+(?:of|is|=|:))?\s*(\d+(?:\.\d+)?)(?:\s*/\s*(\d+))?"),
+    re.compile(r"\b(\d+(?:\.\d+)?)(?:\s*/\s*(\d+))?\s*(?:gpa|cgpa)\b"),
+]
+BUDGET_PATTERNS = [
+    re.compile(
+        r"(?:\bunder|\bbelow|\bless than|\bmax(?:imum)?|\bup to|\bwithin|\bbudget(?:\s+(?:of|is))?|<=?)"
+        r"\s*(?:€|eur\b|euros?\b)?\s*" + NUMBER + r"\s*(k\b)?"
+    ),
+    re.compile(r"(?:€\s*" + NUMBER + r"\s*(k\b)?)"),
+    re.compile(NUMBER + r"\s*(k\b)?\s*(?:€|eur\b|euros?\b)"),
+]
+
+# Smallest number read as a budget without a "k" (smaller ones are scores, years, ...)
+MIN_BUDGET = 100
+
+
+@dataclass
+class QueryConstraints:
+    """Constraints found in a query, shaped like the /recommend profile"""
+    gpa: Optional[float] = None
+    ielts: Optional[float] = None
+    budget: Optional[float] = None
+    country: Optional[str] = None
+    field: Optional[str] = None
+    city: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in asdict(self).values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: value for name, value in asdict(self).items() if value is not None}
+
+
+class QueryParser:
+    """Gazetteers over one catalog's countries, cities and fields"""
+
+    def __init__(self, catalog):
+        # term (lowercase) -> (kind, canonical value)
+        self.terms: Dict[str, tuple] = {}
+
+        for value in self._values(catalog, "field"):
+            # "Computer Science / AI" is found as "computer science / ai",
+            # "computer science" or "ai"; the filter then matches by substring
+            for part in [value] + re.split(r"[/,&]", value):
+                part = part.strip().lower()
+                if part:
+                    self.terms.setdefault(part, ("field", part))
+
+        city_countries: Dict[str, set] = {}
+        if catalog.has_column("city") and catalog.has_column("country"):
+            for record in catalog.records(columns=["city", "country"]):
+                if isinstance(record["city"], str) and isinstance(record["country"], str):
+                    city_countries.setdefault(record["city"], set()).add(record["country"])
+        self.city_country = {
+            city.lower(): next(iter(countries)) if len(countries) == 1 else None
+            for city, countries in city_countries.items()
+        }
+        for city in city_countries:
+            self.terms[city.lower()] = ("city", city)
+
+        # Countries win over a city or field spelled the same way
+        for value in self._values(catalog, "country"):
+            self.terms[value.lower()] = ("country", value)
+
+        alternatives = "|".join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)") if self.terms else None
+
+    @staticmethod
+    def _values(catalog, name):
+        if name not in catalog.codes:
+            return []
+        return [value for value in catalog.categories[name] if isinstance(value, str)]
+
+    def parse(self, query: str) -> QueryConstraints:
+        """Extract every constraint the query states; the first mention of each wins"""
+        text = query.lower()
+        constraints = QueryConstraints(
+            ielts=_first_number(IELTS_PATTERNS, text, 0, 9),
+            gpa=_gpa(text),
+            budget=_budget(text)
+        )
+
+        if self.pattern is not None:
+            for match in self.pattern.finditer(text):
+                kind, value = self.terms[match.group(0)]
+                if getattr(constraints, kind) is None:
+                    setattr(constraints, kind, value)
+
+        if constraints.country is None and constraints.city is not None:
+            constraints.country = self.city_country.get(constraints.city.lower())
+        return constraints
+
+
+def _first_number(patterns, text: str, low: float, high: float) -> Optional[float]:
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            value = float(match.group(1))
+            if low <= value <= high:
+                return value
+    return None
+
+
+def _gpa(text: str) -> Optional[float]:
+    """GPA on a 4-point scale; "8.2/10" style values are rescaled"""
+    for pattern in GPA_PATTERNS:
+        for match in pattern.finditer(text):
+            value = float(match.group(1))
+            scale = float(match.group(2)) if match.group(2) else 4.0
+            if scale > 0 and 0 <= value <= scale:
+                return round(value * 4.0 / scale, 2)
+    return None
+
+
+def _budget(text: str) -> Optional[float]:
+    for pattern in BUDGET_PATTERNS:
+        for match in pattern.finditer(text):
+            amount, thousands = match.group(1), match.group(2)
+            if re.fullmatch(r"\d{1,3}(?:[,.]\d{3})+", amount):
+                amount = re.sub(r"[,.]", "", amount)
+            value = float(amount) * (1000 if thousands else 1)
+            if value >= MIN_BUDGET:
+                return value
+    return None
+
+
+def get_query_parser(catalog) -> QueryParser:
+    """Get the query parser for a catalog, building its gazetteers once per catalog"""
+    return catalog.derived("query_parser", QueryParser)
+
+
+register_catalog_index("query_parser", QueryParser)
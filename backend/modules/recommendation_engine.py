@@ -1,27 +1,283 @@
-import pandas as pd
-import os
+import numpy as np
 
-def recommend_universities(profile):
-    csv_path = "backend/data/universities.csv"
-    if not os.path.exists(csv_path):
-        csv_path = "data/universities.csv"
-    
-    df = pd.read_csv(csv_path)
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, pushdown_storage
+from modules.eligibility_index import get_eligibility_index
+from modules.name_resolver import get_name_resolver
+from modules.text_search import get_text_index
+from utils.ranking import round_scores, top_k_order
+
+MATCH_LIMIT = 10
+
+# Largest number of matches a request may ask for per profile
+MATCH_LIMIT_MAX = 100
+
+# Orders /recommend can rank eligible universities by
+RANK_BY = ("match_score", "net_cost")
+
+# Upper bound on profiles x universities cells held in memory per batch chunk
+BATCH_MAX_CELLS = 2_000_000
+
+RESULT_COLUMNS = ["university", "country", "city", "field", "ielts_required", "average_fees_eur", "ranking", "course_url"]
 
-    filtered = df.copy()
+def recommend_universities(profile, catalog=None):
+    # SQLite storage runs the filters as an indexed query while it holds the snapshot's data
+    storage = None
+    if catalog is None:
+        snapshot = get_catalog_snapshot()
+        catalog = snapshot.universities
+        storage = pushdown_storage(snapshot)
+
+    requirements = {}
+    categories = {}
+    country = field = None
+    resolver = get_name_resolver(catalog)
     
     if profile.ielts and profile.ielts > 0:
-        filtered = filtered[filtered["ielts_required"] <= profile.ielts]
+        requirements["ielts_required"] = profile.ielts
     
     if profile.budget and profile.budget > 0:
-        filtered = filtered[filtered["average_fees_eur"] <= profile.budget]
+        requirements["average_fees_eur"] = profile.budget
     
     if profile.country and profile.country.strip():
-        filtered = filtered[filtered["country"].str.lower() == profile.country.lower()]
+        country = resolver.country(profile.country).lower()
+        categories["country"] = lambda value: isinstance(value, str) and value.lower() == country
     
     if profile.field and profile.field.strip():
-        filtered = filtered[filtered["field"].str.contains(profile.field, case=False, na=False)]
+        field = resolver.field(profile.field)
+
+    if storage is not None:
+        return storage.eligible_universities(
+            max_ielts=requirements.get("ielts_required"),
+            max_fees=requirements.get("average_fees_eur"),
+            country=country,
+            field=field,
+            columns=RESULT_COLUMNS,
+            limit=5
+        )
+
+    if field is not None:
+        categories["field"] = get_text_index(catalog).field_pattern_codes(field)
 
-    result = filtered[["university", "country", "city", "field", "ielts_required", "average_fees_eur", "ranking", "course_url"]].head(5).to_dict(orient="records")
+    rows = get_eligibility_index(catalog).query(requirements, categories)[:5]
+    result = catalog.records(rows, RESULT_COLUMNS)
     
     return result
+
+
+def match_universities(catalog, profile, limit=MATCH_LIMIT, scholarships=None, rank_by="match_score"):
+    """
+    Eligibility filtering and match scoring for /recommend
+
+    Eligible rows come from the catalog's EligibilityIndex; only those are scored.
+
+    Produces exactly what the row-by-row loop did: the same filters, the same
+    rounded match_score and the same order (best score first, ties in catalog order).
+
+    Args:
+        catalog: UniversityCatalog to match against
+        profile: Student profile (gpa, ielts, budget, country, field, and
+            optionally city, a catalog city name such as QueryParser finds)
+        limit: Recommendations to return
+        scholarships: ScholarshipJoinIndex of the catalog's snapshot; if given,
+            each recommendation lists its scholarships and net yearly cost
+        rank_by: "match_score", or "net_cost" (lowest net cost first, needs scholarships)
+
+    Returns:
+        (total eligible universities, top `limit` recommendations)
+    """
+    if rank_by not in RANK_BY:
+        raise ValueError(f"rank_by must be one of {', '.join(RANK_BY)}")
+    if rank_by == "net_cost" and scholarships is None:
+        raise ValueError("ranking by net cost needs the scholarship join")
+
+    # Normalize inputs (misspelled country / field names resolve to the catalog's)
+    resolver = get_name_resolver(catalog)
+    gpa = profile.gpa or 0
+    ielts = profile.ielts or 0
+    budget = profile.budget or 10**9
+    country = (resolver.country(profile.country) or "").lower()
+    field = (resolver.field(profile.field) or "").lower()
+    city = (getattr(profile, "city", None) or "").lower()
+
+    # Eligibility filters (missing requirements pass, as they did row by row)
+    categories = {}
+    if country:
+        categories["country"] = lambda value: str(value).lower() == country
+    if field:
+        categories["field"] = get_text_index(catalog).field_codes(field)
+    if city:
+        if "city" not in catalog.codes:
+            return 0, []
+        categories["city"] = lambda value: str(value).lower() == city
+    rows = get_eligibility_index(catalog).query(
+        requirements={"min_gpa": gpa, "min_ielts": ielts, "average_fees_eur": budget},
+        categories=categories,
+        missing_passes=True
+    )
+
+    # Match score calculation (gpa and ielts parts are the same for every row)
+    gpa_score = min(gpa / 4, 1)
+    ielts_score = min(ielts / 9, 1)
+    cost_score = 1 - (catalog.take("average_fees_eur", rows) / budget)
+    match_scores = round_scores((gpa_score * 0.4) + (ielts_score * 0.3) + (cost_score * 0.3), 2)
+
+    if rank_by == "net_cost":
+        # Unknown fees rank last
+        net_costs = scholarships.net_costs[rows]
+        order = top_k_order(-np.where(np.isnan(net_costs), np.inf, net_costs), limit)
+    else:
+        order = top_k_order(match_scores, limit)
+
+    results = _recommendation_records(catalog, rows[order], match_scores[order])
+    if scholarships is not None:
+        for row, result in zip(rows[order].tolist(), results):
+            result["scholarships"] = scholarships.scholarships(row)
+            result["net_cost_eur"] = scholarships.net_cost(row)
+    return len(rows), results
+
+
+def match_universities_batch(catalog, profiles, limit=MATCH_LIMIT, max_cells=BATCH_MAX_CELLS):
+    """
+    /recommend for many profiles at once, filtered as a profiles x universities matrix
+
+    Profiles are processed in chunks so no intermediate matrix exceeds
+    `max_cells` elements, whatever the batch size. Each profile gets exactly
+    the (total, recommendations) pair match_universities would return.
+    """
+    # Lay the catalog out cheapest first. For a fixed (positive) budget the
+    # match score only falls as fees rise, so every profile's eligible cells
+    # come out of the matrix already in score order.
+    by_fee = get_eligibility_index(catalog).sorted_rows("average_fees_eur")
+    sorted_fees = catalog.take("average_fees_eur", by_fee)
+    chunk_size = max(1, max_cells // max(len(catalog), 1))
+    text_index = get_text_index(catalog)
+    resolver = get_name_resolver(catalog)
+    # Profiles repeat the same few countries / fields: resolve each spelling once
+    resolved_countries, resolved_fields = {}, {}
+
+    def country_codes(wanted):
+        return [code for code, value in enumerate(catalog.categories["country"]) if str(value).lower() == wanted]
+
+    results = []
+    for start in range(0, len(profiles), chunk_size):
+        chunk = profiles[start:start + chunk_size]
+
+        # Normalize inputs, one value per profile
+        gpa = np.array([profile.gpa or 0 for profile in chunk], dtype=float)
+        ielts = np.array([profile.ielts or 0 for profile in chunk], dtype=float)
+        budget = np.array([profile.budget or 10**9 for profile in chunk], dtype=float)
+
+        # Eligibility matrix
+        rejected = _below_minimum(catalog, "min_gpa", gpa[:, None], by_fee)
+        rejected = rejected | _below_minimum(catalog, "min_ielts", ielts[:, None], by_fee)
+        mask = ~(rejected | (budget[:, None] < sorted_fees))
+        mask &= _text_filter_matrix(catalog, "country", [_resolved(resolved_countries, resolver.country, profile.country) for profile in chunk],
+                                    by_fee, country_codes)
+        mask &= _text_filter_matrix(catalog, "field", [_resolved(resolved_fields, resolver.field, profile.field) for profile in chunk],
+                                    by_fee, text_index.field_codes)
+
+        # Eligible cells, grouped by profile, cheapest first
+        profile_ids, positions = np.nonzero(mask)
+        totals = np.bincount(profile_ids, minlength=len(chunk))
+        starts = np.cumsum(totals) - totals
+
+        # Match score calculation for eligible cells only
+        gpa_score = np.minimum(gpa / 4, 1)
+        ielts_score = np.minimum(ielts / 9, 1)
+        cost_score = 1 - (sorted_fees[positions] / budget[profile_ids])
+        raw_scores = ((gpa_score * 0.4) + (ielts_score * 0.3))[profile_ids] + (cost_score * 0.3)
+
+        # Rounded score of each profile's kth cell; rounding is monotonic, so
+        # everything that can still tie it sits right behind it
+        floor = np.full(len(chunk), -np.inf)
+        ranked = (totals > limit) & (budget > 0)
+        if limit > 0 and ranked.any():
+            floor[ranked] = round_scores(raw_scores[starts[ranked] + limit - 1], 2)
+        candidates = np.flatnonzero(raw_scores >= (floor - 0.01)[profile_ids])
+
+        # Round only the candidates, then order them per profile: best rounded
+        # score first, ties in catalog order
+        profile_ids = profile_ids[candidates]
+        rows = by_fee[positions[candidates]]
+        scores = round_scores(raw_scores[candidates], 2)
+        keep = scores >= floor[profile_ids]
+        profile_ids, rows, scores = profile_ids[keep], rows[keep], scores[keep]
+        order = np.lexsort((rows, -scores, profile_ids))
+        profile_ids, rows, scores = profile_ids[order], rows[order], scores[order]
+
+        # First `limit` entries of each profile's run
+        run_starts = np.searchsorted(profile_ids, np.arange(len(chunk)))
+        selected = np.flatnonzero(np.arange(len(profile_ids)) - run_starts[profile_ids] < limit)
+        counts = np.bincount(profile_ids[selected], minlength=len(chunk))
+        records = _recommendation_records(catalog, rows[selected], scores[selected])
+
+        offset = 0
+        for total, count in zip(totals.tolist(), counts.tolist()):
+            results.append((total, records[offset:offset + count]))
+            offset += count
+
+    return results
+
+
+def _resolved(cache, resolve, value):
+    """Lowercased resolve(value), remembered in cache"""
+    if value not in cache:
+        cache[value] = (resolve(value) or "").lower()
+    return cache[value]
+
+
+def _below_minimum(catalog, column, values, rows):
+    """values < column[rows], or < 0 per profile when the catalog has no such column (the old row.get default)"""
+    if catalog.has_column(column):
+        return values < catalog.take(column, rows)
+    return values < 0
+
+
+def _text_filter_matrix(catalog, column, wanted_values, rows, matching_codes):
+    """
+    profiles x universities mask for a text filter on a categorical column,
+    with universities in the order given by rows
+
+    matching_codes(wanted) runs once per distinct wanted value; empty wanted
+    values match everything, like the single-profile filters. Without the
+    column, any other wanted value matches nothing.
+    """
+    if not any(wanted_values):
+        return True
+    if column not in catalog.codes:
+        return np.array([not wanted for wanted in wanted_values], dtype=bool)[:, None]
+    categories = catalog.categories[column]
+    distinct = sorted(set(wanted_values))
+    allowed = np.ones((len(distinct), len(categories)), dtype=bool)
+    for i, wanted in enumerate(distinct):
+        if wanted:
+            allowed[i] = False
+            allowed[i, matching_codes(wanted)] = True
+    lookup = {wanted: i for i, wanted in enumerate(distinct)}
+    profile_rows = np.array([lookup[wanted] for wanted in wanted_values])
+    return allowed[profile_rows][:, catalog.codes[column][rows]]
+
+
+def _recommendation_records(catalog, rows, match_scores):
+    """Shape scored catalog rows like the /recommend response entries"""
+    results = []
+    columns = zip(
+        catalog.take("university", rows).tolist(),
+        catalog.take("country", rows).tolist(),
+        catalog.take("city", rows, "").tolist(),
+        catalog.take("ranking", rows, 500).tolist(),
+        catalog.take("average_fees_eur", rows).tolist(),
+        catalog.take("field", rows, "").tolist(),
+        match_scores.tolist()
+    )
+    for university, country, city, ranking, average_fees, field, match_score in columns:
+        results.append({
+            "university": university,
+            "country": country,
+            "city": city,
+            "ranking": ranking,
+            "average_fees_eur": average_fees,
+            "field": field,
+            "match_score": match_score
+        })
+    return results
@@ -0,0 +1,346 @@
+"""
+ROI Simulation Module
+Monte Carlo projection of what studying at a university pays back
+
+For each university, every simulation draws:
+- a starting salary (lognormal around the country's median graduate salary,
+  scaled by field),
+- a yearly living-cost inflation rate for the country,
+- whether a scholarship is won and which one (from the scholarships
+  available in the country),
+- the months until the first job (gamma distributed around the country's mean).
+
+From those, the investment (tuition plus inflated living costs, minus the
+award) gives a payback period (months to the first job, then repaying from
+a share of salary) and a net ROI over a working horizon (earnings minus the
+investment, per euro the studies cost). Percentiles of both are reported.
+
+Each university gets its own random stream derived from the seed and the
+university (name and catalog row), so results do not depend on which other
+universities are compared or on whether the process pool is used.
+
+The process pool is shared and long-lived: start_simulation_pool() creates it
+once per server process (at app startup) with the "spawn" start method, so
+its workers never inherit the server's threads and requests do not pay for
+process startup.
+"""
+
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from modules.cost_roi_analysis import get_cost_engine
+from modules.name_resolver import get_name_resolver
+from modules.text_search import get_text_index
+from utils.constants import EUROPEAN_COUNTRIES
+from utils.ranking import top_k_order
+
+ROI_SIMULATIONS = 20000
+ROI_PERCENTILES = (5, 25, 50, 75, 95)
+ROI_SEED = 42
+
+# Upper bounds per request (universities x simulations is held in memory per university only)
+ROI_MAX_SIMULATIONS = 200000
+ROI_MAX_UNIVERSITIES = 2000
+
+# Size of the shared process pool (default: DEFAULT_POOL_WORKERS; 1 disables it)
+ROI_POOL_WORKERS_ENV = "ROI_POOL_WORKERS"
+
+# Every server worker starts its own pool, so the default stays small
+DEFAULT_POOL_WORKERS = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 1
+_pool_lock = threading.Lock()
+
+# Median graduate starting salary (EUR/year) by country
+SALARY_MEDIANS = {
+    "France": 42000,
+    "Germany": 52000,
+    "Netherlands": 50000,
+    "Belgium": 46000,
+    "Finland": 44000,
+    "Italy": 33000,
+    "Spain": 31000,
+    "Austria": 47000,
+    "Sweden": 45000,
+    "UK": 45000,
+    "USA": 75000,
+    "Canada": 55000,
+    "Australia": 60000,
+    "China": 25000,
+    "India": 12000,
+    "Japan": 40000
+}
+DEFAULT_SALARY_MEDIAN = 40000
+# Spread of log salary
+SALARY_SIGMA = 0.25
+
+# Salary multiplier by field keyword; a field takes its best matching keyword
+FIELD_SALARY_MULTIPLIERS = {
+    "ai": 1.10,
+    "data": 1.06,
+    "robotics": 1.05,
+    "computer": 1.05,
+    "engineering": 1.0,
+    "informatics": 1.0
+}
+
+# Yearly living-cost inflation (mean, standard deviation) by country
+LIVING_COST_INFLATION = {
+    "France": (0.025, 0.010),
+    "Germany": (0.028, 0.010),
+    "Netherlands": (0.035, 0.012),
+    "Belgium": (0.030, 0.010),
+    "Finland": (0.025, 0.008),
+    "Italy": (0.022, 0.010),
+    "Spain": (0.027, 0.010),
+    "Austria": (0.030, 0.010),
+    "UK": (0.040, 0.015),
+    "USA": (0.035, 0.012)
+}
+DEFAULT_LIVING_COST_INFLATION = (0.03, 0.01)
+
+# Mean months from graduation to first job by country (gamma, shape TIME_TO_JOB_SHAPE)
+TIME_TO_JOB_MONTHS = {
+    "France": 5.0,
+    "Germany": 4.0,
+    "Netherlands": 3.5,
+    "Belgium": 4.5,
+    "Finland": 5.0,
+    "Italy": 7.0,
+    "Spain": 8.0,
+    "Austria": 4.5
+}
+DEFAULT_TIME_TO_JOB_MONTHS = 5.0
+TIME_TO_JOB_SHAPE = 2.0
+
+# Chance of winning one of the country's scholarships (awards count per year of study)
+SCHOLARSHIP_AWARD_PROBABILITY = 0.2
+
+# Share of salary put towards paying back the investment
+REPAYMENT_SHARE = 0.3
+
+
+def field_salary_multiplier(field: Optional[str]) -> float:
+    """Best FIELD_SALARY_MULTIPLIERS entry whose keyword is in the field (1.0 if none)"""
+    words = set(str(field or "").lower().replace("/", " ").split())
+    matches = [multiplier for keyword, multiplier in FIELD_SALARY_MULTIPLIERS.items() if keyword in words]
+    return max(matches) if matches else 1.0
+
+
+def simulation_parameters(snapshot, rows: Sequence[int], duration_years: float) -> List[Dict[str, Any]]:
+    """
+    Plain (picklable) simulation inputs for the given catalog rows
+
+    Raises:
+        ValueError: If duration_years is not positive or a university has no fee
+    """
+    if not duration_years > 0:
+        raise ValueError("duration_years must be positive")
+    catalog = snapshot.universities
+    rows = np.asarray(rows, dtype=np.int64)
+    engine = get_cost_engine(catalog)
+
+    # Scholarship amounts open to each country
+    awards: Dict[str, List[float]] = {}
+    df = snapshot.scholarships
+    if df is not None and {"country", "amount_eur"} <= set(df.columns):
+        for country, amount in zip(df["country"].tolist(), df["amount_eur"].tolist()):
+            if amount == amount:
+                awards.setdefault(country, []).append(float(amount))
+
+    parameters = []
+    columns = zip(
+        rows.tolist(),
+        catalog.take("university", rows).tolist(),
+        catalog.take("country", rows).tolist(),
+        catalog.take("field", rows, "").tolist(),
+        engine.fees[rows].tolist(),
+        engine.monthly_living[rows].tolist()
+    )
+    for row, university, country, field, fee, monthly_living in columns:
+        if fee != fee:
+            raise ValueError(f"{university} has no average_fees_eur")
+        country_awards = awards.get(country, []) + (awards.get("Europe", []) if country in EUROPEAN_COUNTRIES else [])
+        parameters.append({
+            "row": row,
+            "university": university,
+            "country": country,
+            "field": field,
+            "tuition_fee": fee,
+            "monthly_living_cost": monthly_living,
+            "duration_years": duration_years,
+            "salary_median": SALARY_MEDIANS.get(country, DEFAULT_SALARY_MEDIAN) * field_salary_multiplier(field),
+            "inflation": LIVING_COST_INFLATION.get(country, DEFAULT_LIVING_COST_INFLATION),
+            "time_to_job_months": TIME_TO_JOB_MONTHS.get(country, DEFAULT_TIME_TO_JOB_MONTHS),
+            "awards": country_awards
+        })
+    return parameters
+
+
+def simulate_university(parameters: Dict[str, Any], n_simulations: int, seed: int, horizon_years: float) -> Dict[str, Any]:
+    """Run the simulations for one university and summarize them as percentiles"""
+    key = zlib.crc32(str(parameters["university"]).encode("utf-8"))
+    rng = np.random.default_rng([seed, key, parameters["row"]])
+    duration = parameters["duration_years"]
+
+    salary = parameters["salary_median"] * rng.lognormal(0.0, SALARY_SIGMA, n_simulations)
+    mean, sd = parameters["inflation"]
+    inflation = rng.normal(mean, sd, n_simulations)
+    time_to_job = rng.gamma(TIME_TO_JOB_SHAPE, parameters["time_to_job_months"] / TIME_TO_JOB_SHAPE, n_simulations)
+
+    # Living costs grow by the drawn rate each year: sum of (1 + r)^t over the study years
+    yearly_living = parameters["monthly_living_cost"] * 12
+    small = np.abs(inflation) < 1e-9
+    growth = np.where(small, duration, ((1.0 + inflation) ** duration - 1.0) / np.where(small, 1.0, inflation))
+    cost = parameters["tuition_fee"] * duration + yearly_living * growth
+
+    award = np.zeros(n_simulations)
+    if parameters["awards"]:
+        won = rng.random(n_simulations) < SCHOLARSHIP_AWARD_PROBABILITY
+        amounts = np.asarray(parameters["awards"])[rng.integers(0, len(parameters["awards"]), n_simulations)]
+        award = np.where(won, amounts * duration, 0.0)
+    investment = np.maximum(cost - award, 0.0)
+
+    payback_years = time_to_job / 12.0 + investment / (salary * REPAYMENT_SHARE)
+    working_years = np.maximum(horizon_years - time_to_job / 12.0, 0.0)
+    net_roi = (salary * working_years - investment) / cost
+
+    return {
+        "university": parameters["university"],
+        "country": parameters["country"],
+        "field": parameters["field"],
+        "tuition_fee": parameters["tuition_fee"],
+        "expected_cost": round(float(cost.mean()), 2),
+        "scholarship_probability": SCHOLARSHIP_AWARD_PROBABILITY if parameters["awards"] else 0.0,
+        "payback_years": _percentiles(payback_years, 2),
+        "net_roi": _percentiles(net_roi, 3),
+        "payback_within_horizon": round(float((payback_years <= horizon_years).mean()), 4)
+    }
+
+
+def _percentiles(values: np.ndarray, ndigits: int) -> Dict[str, float]:
+    points = np.percentile(values, ROI_PERCENTILES)
+    return {f"p{p}": round(float(point), ndigits) for p, point in zip(ROI_PERCENTILES, points)}
+
+
+def _simulate_chunk(chunk, n_simulations, seed, horizon_years):
+    return [simulate_university(parameters, n_simulations, seed, horizon_years) for parameters in chunk]
+
+
+def start_simulation_pool(max_workers: Optional[int] = None) -> int:
+    """
+    Start the shared simulation process pool, if not running yet
+
+    Args:
+        max_workers: Pool size (default: ROI_POOL_WORKERS, else
+            DEFAULT_POOL_WORKERS or the CPU count if that is lower)
+
+    Returns:
+        Number of processes simulations can be spread over
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            if max_workers is None:
+                max_workers = int(os.environ.get(ROI_POOL_WORKERS_ENV, 0)) or min(DEFAULT_POOL_WORKERS, os.cpu_count() or 1)
+            if max_workers > 1:
+                _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+                _pool_size = max_workers
+        return _pool_size
+
+
+def stop_simulation_pool():
+    """Shut the shared simulation process pool down"""
+    global _pool, _pool_size
+    with _pool_lock:
+        pool, _pool, _pool_size = _pool, None, 1
+    if pool is not None:
+        pool.shutdown()
+
+
+def select_universities(catalog, names=None, country=None, field=None, limit=50) -> np.ndarray:
+    """
+    Rows to compare: the named universities (misspellings resolved), or else
+    the best-ranked `limit` universities with a fee, optionally in a country / field
+
+    Raises:
+        ValueError: If a named university is not in the catalog
+    """
+    resolver = get_name_resolver(catalog)
+    if names:
+        rows = []
+        for name in names:
+            row = resolver.university_row(name)
+            if row is None:
+                raise ValueError(f"University '{name}' not found")
+            rows.append(row)
+        return np.array(rows, dtype=np.int64)
+
+    keep = ~np.isnan(get_cost_engine(catalog).fees)
+    if country and country.strip() and "country" in catalog.codes:
+        wanted = resolver.country(country).lower()
+        keep &= catalog.category_mask("country", lambda value: str(value).lower() == wanted)
+    if field and field.strip() and "field" in catalog.codes:
+        codes = get_text_index(catalog).field_codes(resolver.field(field).lower())
+        keep &= np.isin(catalog.codes["field"], codes)
+    rows = np.flatnonzero(keep)
+    ranking = catalog.take("ranking", rows, np.inf).astype(float)
+    ranking[np.isnan(ranking)] = np.inf
+    return rows[top_k_order(-ranking, max(limit, 0))]
+
+
+def simulate_roi(
+    snapshot,
+    rows: Sequence[int],
+    n_simulations: int = ROI_SIMULATIONS,
+    seed: int = ROI_SEED,
+    duration_years: float = 2,
+    horizon_years: float = 10,
+    workers: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Simulated payback and net ROI for each university, best median net ROI first
+
+    Args:
+        snapshot: Catalog snapshot the rows belong to
+        rows: Catalog row positions of the universities to compare
+        n_simulations: Draws per university
+        seed: Seed for reproducible results
+        duration_years: Length of study
+        horizon_years: Working years after graduation counted in net ROI
+        workers: Processes of the shared pool to spread universities over
+            (1, or no pool started, runs in-process)
+
+    Raises:
+        ValueError: If a limit is exceeded or a duration is not positive
+    """
+    if not 0 < n_simulations <= ROI_MAX_SIMULATIONS:
+        raise ValueError(f"simulations must be between 1 and {ROI_MAX_SIMULATIONS}")
+    if len(rows) > ROI_MAX_UNIVERSITIES:
+        raise ValueError(f"at most {ROI_MAX_UNIVERSITIES} universities can be compared at once")
+    if not horizon_years > 0:
+        raise ValueError("horizon_years must be positive")
+    parameters = simulation_parameters(snapshot, rows, duration_years)
+
+    pool, pool_size = _pool, _pool_size
+    workers = max(1, min(workers, pool_size, len(parameters)))
+    if pool is None or workers == 1:
+        results = _simulate_chunk(parameters, n_simulations, seed, horizon_years)
+    else:
+        chunks = [parameters[i::workers] for i in range(workers)]
+        futures = [pool.submit(_simulate_chunk, chunk, n_simulations, seed, horizon_years) for chunk in chunks]
+        by_position = {}
+        for i, future in enumerate(futures):
+            for j, result in enumerate(future.result()):
+                by_position[i + j * workers] = result
+        results = [by_position[i] for i in range(len(parameters))]
+
+    # Stable, so equal medians keep the order the rows were given in
+    return sorted(results, key=lambda result: -result["net_roi"]["p50"])
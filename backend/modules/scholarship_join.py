@@ -0,0 +1,184 @@
+"""
+Scholarship Join Index
+Which catalog universities each scholarship applies to, resolved once per
+catalog snapshot from the free-text eligible_universities and country columns
+
+A scholarship's country picks the catalog countries it is open in ("Europe"
+covers the European ones). Its eligible_universities text then narrows them:
+- a list of university names ("TU Munich, RWTH Aachen") means exactly those,
+- a nationality ("Selected French Universities", "German Public
+  Universities") keeps that country, a region ("Flemish Universities") that
+  region's cities,
+- "Selected" / "Partner" keep every candidate but mark the scholarship as
+  selective (the institution list is not in the data),
+- "Public" keeps every candidate (the catalog lists public universities only).
+
+A scholarship whose eligibility names a group of students ("Indian Students",
+"Developing Countries") is restricted: profiles carry no nationality, so it
+cannot be known to apply. Only merit-based or open awards are unrestricted.
+
+Each university row then has its scholarships (largest award first, stored
+for all rows as one offsets array and one id array), the best award it is
+sure to qualify for (selective and restricted ones are listed but not
+counted) and its net yearly cost (tuition plus living costs, minus that
+award), so /recommend attaches scholarships and ranks by net cost with plain
+lookups.
+"""
+
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+from data_fetcher.catalog_snapshot import register_snapshot_index
+from modules.cost_roi_analysis import get_cost_engine
+from modules.name_resolver import get_name_resolver
+from utils.constants import EUROPEAN_COUNTRIES
+
+# Nationality adjectives in eligible_universities -> catalog country
+NATIONALITY_COUNTRIES = {
+    "french": "France",
+    "german": "Germany",
+    "dutch": "Netherlands",
+    "belgian": "Belgium",
+    "finnish": "Finland",
+    "italian": "Italy",
+    "spanish": "Spain",
+    "austrian": "Austria",
+    "swedish": "Sweden"
+}
+
+# Regional adjectives -> (country, cities of the region)
+REGION_CITIES = {
+    "flemish": ("Belgium", {"Leuven", "Ghent", "Antwerp", "Brussels", "Hasselt"}),
+    "walloon": ("Belgium", {"Liège", "Louvain-la-Neuve", "Mons", "Namur"})
+}
+
+# Words meaning the award goes to a subset of the matched universities
+SELECTIVE_WORDS = {"selected", "partner", "participating"}
+
+# Eligibility texts made only of these words are open to every student
+OPEN_ELIGIBILITY_WORDS = {"merit", "based", "academic", "excellence", "all", "any", "open", "international", "students", "applicants"}
+
+
+class ScholarshipJoinIndex:
+    """Scholarship <-> university row join for one snapshot"""
+
+    def __init__(self, snapshot):
+        catalog = snapshot.universities
+        size = len(catalog)
+        df = snapshot.scholarships
+        columns = ["scholarship_name", "country", "eligible_universities", "coverage", "amount_eur", "eligibility"]
+        records = []
+        if df is not None and {"scholarship_name", "country"} <= set(df.columns):
+            values = [df[name].tolist() if name in df.columns else [None] * len(df) for name in columns]
+            records = [dict(zip(columns, row)) for row in zip(*values)]
+
+        # Catalog rows each scholarship applies to
+        self.scholarship_rows: List[np.ndarray] = []
+        self.selective: List[bool] = []
+        self.restricted: List[bool] = [_restricted(record["eligibility"]) for record in records]
+        resolver = get_name_resolver(catalog)
+        for record in records:
+            rows, selective = _eligible_rows(catalog, resolver, record["country"], record["eligible_universities"])
+            self.scholarship_rows.append(rows)
+            self.selective.append(selective)
+
+        # Per university row: its scholarships, largest award first (file order on ties),
+        # as CSR arrays: row r's ids are row_ids[row_offsets[r]:row_offsets[r + 1]]
+        amounts = np.array([_award(record["amount_eur"]) for record in records], dtype=float)
+        order = np.argsort(-amounts, kind="stable")
+        pair_rows = np.concatenate([self.scholarship_rows[i] for i in order] + [np.array([], dtype=np.int64)])
+        pair_ids = np.repeat(order, [len(self.scholarship_rows[i]) for i in order]).astype(np.int32)
+        by_row = np.argsort(pair_rows, kind="stable")
+        self.row_ids = pair_ids[by_row]
+        self.row_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_rows, minlength=size), out=self.row_offsets[1:])
+        self.entries = [
+            {
+                "scholarship_name": record["scholarship_name"],
+                "coverage": record["coverage"],
+                "amount_eur": record["amount_eur"],
+                "eligibility": record["eligibility"],
+                "selective": selective,
+                "restricted": restricted
+            }
+            for record, selective, restricted in zip(records, self.selective, self.restricted)
+        ]
+
+        # One award can be held at a time: the net cost takes the best one every student gets
+        counted = ~(np.array(self.selective, dtype=bool) | np.array(self.restricted, dtype=bool))
+        best = np.full(size, -np.inf)
+        keep = counted[pair_ids]
+        np.maximum.at(best, pair_rows[keep], amounts[pair_ids[keep]])
+        self.best_award = np.where(np.isinf(best), 0.0, best)
+        engine = get_cost_engine(catalog)
+        yearly_cost = engine.fees + engine.monthly_living * 12
+        self.net_costs = np.maximum(yearly_cost - self.best_award, 0.0)
+        self.net_costs[np.isnan(yearly_cost)] = np.nan
+
+    def scholarships(self, row: int) -> List[Dict[str, Any]]:
+        """Scholarships applicable at a catalog row, largest award first"""
+        scholarships = self.row_ids[self.row_offsets[row]:self.row_offsets[row + 1]]
+        return [dict(self.entries[scholarship]) for scholarship in scholarships.tolist()]
+
+    def net_cost(self, row: int):
+        """Yearly tuition and living cost at a catalog row after its best award (None if the fee is unknown)"""
+        value = self.net_costs[row]
+        return None if np.isnan(value) else float(value)
+
+
+def _award(value) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if value == value else 0.0
+
+
+def _restricted(eligibility) -> bool:
+    """Whether an eligibility text limits the award to some students"""
+    if not isinstance(eligibility, str):
+        return False
+    return not set(re.findall(r"[a-z]+", eligibility.lower())) <= OPEN_ELIGIBILITY_WORDS
+
+
+def _eligible_rows(catalog, resolver, country, text):
+    """(catalog rows a scholarship applies to, whether only some of them get it)"""
+    text = text if isinstance(text, str) else ""
+
+    # An explicit list of universities
+    parts = [part.strip() for part in re.split(r"[,;]", text) if part.strip()]
+    named = [resolver.university_row(part) for part in parts]
+    if named and all(row is not None for row in named):
+        return np.unique(np.array(named, dtype=np.int64)), False
+
+    if "country" not in catalog.codes:
+        return np.array([], dtype=np.int64), False
+    if isinstance(country, str) and country.strip().lower() == "europe":
+        countries = set(EUROPEAN_COUNTRIES)
+    else:
+        countries = {resolver.country(country)} if isinstance(country, str) else set()
+
+    words = re.findall(r"[a-z]+", text.lower())
+    cities = None
+    for word in words:
+        if word in NATIONALITY_COUNTRIES:
+            countries &= {NATIONALITY_COUNTRIES[word]}
+        elif word in REGION_CITIES:
+            region_country, region_cities = REGION_CITIES[word]
+            countries &= {region_country}
+            cities = region_cities if cities is None else cities & region_cities
+
+    keep = catalog.category_mask("country", lambda value: value in countries)
+    if cities is not None and "city" in catalog.codes:
+        keep &= catalog.category_mask("city", lambda value: value in cities)
+    return np.flatnonzero(keep), any(word in SELECTIVE_WORDS for word in words)
+
+
+def get_scholarship_join(snapshot) -> ScholarshipJoinIndex:
+    """Get the scholarship join for a snapshot, building it once per snapshot"""
+    return snapshot.derived("scholarship_join", ScholarshipJoinIndex)
+
+
+register_snapshot_index("scholarship_join", ScholarshipJoinIndex)
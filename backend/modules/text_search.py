@@ -0,0 +1,63 @@
+"""
+Catalog Text Search
+Trigram indexes over the university catalog's field, university and city text
+"""
+
+import numpy as np
+
+from data_fetcher.catalog_snapshot import register_catalog_index
+from utils.text_index import EMPTY_POSTING, REGEX_SYNTAX, TrigramIndex, text_test
+
+
+class CatalogTextIndex:
+    """
+    Substring search over a UniversityCatalog, built once per catalog
+
+    Field and city are categorical, so their indexes cover the distinct values
+    and return category codes. University names are indexed per row.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.field = TrigramIndex(catalog.categories["field"]) if "field" in catalog.codes else None
+        self.city = TrigramIndex(catalog.categories["city"]) if "city" in catalog.codes else None
+        self.university = TrigramIndex(catalog.column("university")) if catalog.has_column("university") else None
+
+    def field_codes(self, field: str) -> np.ndarray:
+        """
+        Codes of the field values containing `field`, like ``field.lower() in str(value).lower()``
+        (none if the catalog has no field column)
+        """
+        if self.field is None:
+            return EMPTY_POSTING
+        return self.field.search(field)
+
+    def field_pattern_codes(self, pattern: str) -> np.ndarray:
+        """
+        Codes of the string field values matching a case-insensitive regex,
+        like ``str.contains(pattern, case=False, na=False)``
+
+        Plain-text patterns (the usual case) go through the trigram index;
+        anything with regex syntax is matched value by value. A catalog without
+        a field column matches nothing.
+        """
+        if self.field is None:
+            return EMPTY_POSTING
+        categories = self.catalog.categories["field"]
+        if REGEX_SYNTAX.search(pattern) is None:
+            codes = self.field.search(pattern)
+        else:
+            matches = text_test(pattern)
+            codes = np.array([
+                code for code, value in enumerate(categories)
+                if isinstance(value, str) and matches(value)
+            ], dtype=np.int64)
+        return np.array([code for code in codes.tolist() if isinstance(categories[code], str)], dtype=np.int64)
+
+
+def get_text_index(catalog) -> CatalogTextIndex:
+    """Get the text index for a catalog, building it once per catalog"""
+    return catalog.derived("text_index", CatalogTextIndex)
+
+
+register_catalog_index("text_index", CatalogTextIndex)
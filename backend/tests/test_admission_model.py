@@ -0,0 +1,119 @@
+"""
+Tests for loading and compiling models/admission_model.pkl
+
+The estimators below are minimal fitted-model stand-ins exposing the same
+attributes as scikit-learn's (coef_, intercept_, classes_, transform,
+predict_proba), pickled to a file and read back through the real loader.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from modules.admission_model import EstimatorAdmissionModel, LinearAdmissionModel, load_admission_model
+
+
+class Scaler:
+    """StandardScaler-like affine transform"""
+
+    def __init__(self, mean, scale, names=None):
+        self.mean_ = np.asarray(mean, dtype=float)
+        self.scale_ = np.asarray(scale, dtype=float)
+        self.n_features_in_ = len(self.mean_)
+        if names is not None:
+            self.feature_names_in_ = np.asarray(names, dtype=object)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+
+class Squarer:
+    """A transform that is not affine"""
+
+    n_features_in_ = 3
+
+    def transform(self, X):
+        return np.asarray(X, dtype=float) ** 2
+
+
+class Logistic:
+    """LogisticRegression-like binary classifier"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray([coef], dtype=float)
+        self.intercept_ = np.asarray([intercept], dtype=float)
+        self.n_features_in_ = self.coef_.shape[1]
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-(np.asarray(X, dtype=float) @ self.coef_[0] + self.intercept_[0])))
+        return np.column_stack([1 - p, p])
+
+
+class Pipeline:
+    def __init__(self, *steps):
+        self.steps = [(f"step{i}", step) for i, step in enumerate(steps)]
+
+    def predict_proba(self, X):
+        for _, step in self.steps[:-1]:
+            X = step.transform(X)
+        return self.steps[-1][1].predict_proba(X)
+
+
+PROFILES = np.array([[3.2, 6.5, 9000.0], [2.0, 5.0, 0.0], [4.0, 9.0, 30000.0]])
+
+
+def write(tmp_path, model):
+    path = tmp_path / "admission_model.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+def expected(model, X):
+    return model.predict_proba(X)[:, 1]
+
+
+def test_missing_and_empty_artifacts_are_rejected(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_admission_model(str(tmp_path / "missing.pkl"))
+    (tmp_path / "empty.pkl").write_bytes(b"")
+    with pytest.raises(ValueError):
+        load_admission_model(str(tmp_path / "empty.pkl"))
+
+
+def test_scaled_logistic_pipeline_compiles_to_linear_weights(tmp_path):
+    model = Pipeline(Scaler([3.0, 6.5, 10000], [0.5, 1.0, 5000]), Logistic([1.2, 0.8, 0.3], -0.1))
+    compiled = load_admission_model(write(tmp_path, model))
+
+    assert isinstance(compiled, LinearAdmissionModel)
+    scores = compiled.score_batch(PROFILES[:, 0], PROFILES[:, 1], PROFILES[:, 2])
+    np.testing.assert_allclose(scores, expected(model, PROFILES), rtol=1e-9)
+    assert compiled.score(*PROFILES[0]) == pytest.approx(expected(model, PROFILES[:1])[0], rel=1e-9)
+
+
+def test_named_features_are_reordered(tmp_path):
+    # The model's columns are (budget, gpa, ielts)
+    model = Pipeline(Scaler([10000, 3.0, 6.5], [5000, 0.5, 1.0], names=["budget_eur", "gpa", "ielts_score"]),
+                     Logistic([0.3, 1.2, 0.8], 0.2))
+    compiled = load_admission_model(write(tmp_path, model))
+
+    scores = compiled.score_batch(PROFILES[:, 0], PROFILES[:, 1], PROFILES[:, 2])
+    np.testing.assert_allclose(scores, expected(model, PROFILES[:, [2, 0, 1]]), rtol=1e-9)
+
+
+def test_non_affine_pipeline_is_served_through_the_estimator(tmp_path):
+    model = Pipeline(Squarer(), Logistic([0.1, 0.05, 1e-9], -1.0))
+    compiled = load_admission_model(write(tmp_path, model))
+
+    assert isinstance(compiled, EstimatorAdmissionModel)
+    scores = compiled.score_batch(PROFILES[:, 0], PROFILES[:, 1], PROFILES[:, 2])
+    np.testing.assert_allclose(scores, expected(model, PROFILES))
+
+
+def test_unmappable_features_are_rejected(tmp_path):
+    model = Pipeline(Scaler([0, 0, 0], [1, 1, 1], names=["gpa", "ielts", "age"]), Logistic([1, 1, 1], 0))
+    with pytest.raises(ValueError):
+        load_admission_model(write(tmp_path, model))
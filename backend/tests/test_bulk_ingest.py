@@ -0,0 +1,45 @@
+"""
+Tests for bulk ingest validation and the admin route guard
+"""
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from modules.bulk_ingest import UNIVERSITY_ALIASES, UNIVERSITY_RULES, validate_frame
+from utils.admin_auth import ADMIN_TOKEN_ENV
+from utils.data_validator_v2 import validate_university_data
+
+
+@pytest.mark.parametrize("field, value", [
+    ("ranking", -1),
+    ("ranking", 3),
+    ("tuition_fee", -5),
+    ("tuition_fee", 12000),
+    ("acceptance_rate", 101),
+    ("acceptance_rate", 40)
+])
+def test_ingest_rules_agree_with_schema(field, value):
+    record = {"name": "Test University", "country": "Italy", "city": "Rome", field: value}
+    valid, _ = validate_university_data(record)
+
+    df = pd.DataFrame([{UNIVERSITY_ALIASES.get(key, key): str(item) for key, item in record.items()}], dtype=object)
+    assert (not validate_frame(df, UNIVERSITY_RULES)) == valid
+
+
+@pytest.fixture
+def client():
+    return TestClient(app_module.app)
+
+
+def test_admin_routes_refused_without_configured_token(client, monkeypatch):
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    response = client.post("/admin/ingest", content=b"university,country,city\n", headers={"X-Admin-Token": ""})
+    assert response.status_code == 403
+
+
+def test_admin_routes_need_matching_token(client, monkeypatch):
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    assert client.post("/admin/ingest", content=b"university,country,city\n").status_code == 401
+    assert client.delete("/admin/scholarships/Anything", headers={"X-Admin-Token": "wrong"}).status_code == 401
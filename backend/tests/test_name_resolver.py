@@ -0,0 +1,33 @@
+"""
+Tests for typo-tolerant country resolution
+"""
+
+import pytest
+
+from utils.constants import COUNTRY_NAMES
+from utils.fuzzy_lookup import SymSpellIndex
+
+
+@pytest.fixture
+def countries():
+    return SymSpellIndex(["Australia", "Germany", "Netherlands", "Nigeria"], protected=COUNTRY_NAMES)
+
+
+@pytest.mark.parametrize("typed, expected", [
+    ("Germnay", "Germany"),
+    ("netherland", "Netherlands"),
+    ("australa", "Australia"),
+    ("GERMANY", "Germany")
+])
+def test_typos_within_distance_are_corrected(countries, typed, expected):
+    assert countries.lookup(typed) == expected
+
+
+@pytest.mark.parametrize("typed", ["Austria", "niger", "Iran"])
+def test_valid_countries_are_not_rewritten(countries, typed):
+    assert countries.lookup(typed) is None
+
+
+def test_short_names_are_not_corrected():
+    # "uk" is within one edit of many words; three letters or fewer need an exact match
+    assert SymSpellIndex(["UAE"]).lookup("UK") is None
@@ -0,0 +1,74 @@
+"""
+Tests for the scholarship statistics deltas applied by the admin routes
+"""
+
+import pandas as pd
+import pytest
+
+from data_fetcher import scholarship_store
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, reload_catalog_snapshot
+from data_fetcher.scholarship_store import ScholarshipStatistics, record_scholarship_changes, scholarship_statistics
+from modules.admin_management import add_scholarship, remove_scholarship
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    pd.DataFrame([
+        {"university": "Base 0", "country": "Italy", "city": "Rome", "average_fees_eur": 1000}
+    ]).to_csv(tmp_path / "data" / "universities.csv", index=False)
+    pd.DataFrame([
+        {"scholarship_name": "Award A", "country": "Italy", "coverage": "Full", "amount_eur": 5000, "eligibility": "All"},
+        {"scholarship_name": "Award B", "country": "Spain", "coverage": "Partial", "amount_eur": 2000, "eligibility": "All"}
+    ]).to_csv(tmp_path / "data" / "scholarships.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scholarship_store, "_statistics", None)
+    monkeypatch.setattr(scholarship_store, "_statistics_stamp", None)
+    reload_catalog_snapshot()
+
+
+def rebuilt():
+    return ScholarshipStatistics(get_catalog_snapshot().scholarships).as_dict()
+
+
+def test_add_and_remove_update_statistics_in_place():
+    scholarship_statistics()
+    statistics = scholarship_store._statistics
+
+    add_scholarship({"scholarship_name": "Award C", "country": "Italy", "coverage": "Full", "amount_eur": 1000})
+    assert scholarship_store._statistics is statistics
+    assert scholarship_statistics() == rebuilt()
+    assert scholarship_statistics()["total_scholarships"] == 3
+
+    remove_scholarship("Award A")
+    assert scholarship_store._statistics is statistics
+    assert scholarship_statistics() == rebuilt()
+    assert scholarship_statistics()["by_country"] == {"Italy": 1, "Spain": 1}
+
+
+def test_reader_between_publish_and_delta_is_not_counted_twice():
+    base = get_catalog_snapshot()
+    scholarship_statistics(base)
+    added = {"scholarship_name": "Award C", "country": "Italy", "coverage": "Full", "amount_eur": 1000}
+    df = pd.concat([base.scholarships, pd.DataFrame([added])], ignore_index=True)
+    df.to_csv("data/scholarships.csv", index=False)
+    published = reload_catalog_snapshot()
+
+    # A request reads the published snapshot before the writer records its delta
+    scholarship_statistics(published)
+    record_scholarship_changes(base, published, added=[added], removed=[])
+
+    assert scholarship_statistics() == rebuilt()
+    assert scholarship_statistics()["total_scholarships"] == 3
+
+
+def test_add_keeps_an_unpublished_edit_to_the_file():
+    scholarship_statistics()
+    edited = pd.read_csv("data/scholarships.csv")
+    edited.loc[len(edited)] = {"scholarship_name": "Award E", "country": "Spain", "coverage": "Full", "amount_eur": 300, "eligibility": "All"}
+    edited.to_csv("data/scholarships.csv", index=False)
+
+    add_scholarship({"scholarship_name": "Award C", "country": "Italy", "coverage": "Full", "amount_eur": 1000})
+    names = pd.read_csv("data/scholarships.csv")["scholarship_name"].tolist()
+    assert names == ["Award A", "Award B", "Award E", "Award C"]
+    assert scholarship_statistics() == rebuilt()
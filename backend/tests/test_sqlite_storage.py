@@ -0,0 +1,71 @@
+"""
+Tests for the SQLite storage backend: identifiers in writes and pushed-down
+reads pinned to the catalog snapshot
+"""
+
+import pandas as pd
+import pytest
+
+from data_fetcher.catalog_snapshot import get_catalog_snapshot, pushdown_storage, reload_catalog_snapshot
+from data_fetcher.migrate_to_sqlite import migrate
+from data_fetcher.storage import DATABASE_FILE, STORAGE_ENV, SqliteStorage, get_storage
+from modules.cost_roi_analysis import find_affordable_universities, get_affordability_index, match_scholarships
+
+
+@pytest.fixture(autouse=True)
+def sqlite_catalog(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    pd.DataFrame([
+        {"university": "Base 0", "country": "Italy", "city": "Rome", "average_fees_eur": 1000}
+    ]).to_csv(tmp_path / "data" / "universities.csv", index=False)
+    pd.DataFrame([
+        {"scholarship_name": "Award A", "country": "Italy", "coverage": "Full", "amount_eur": 5000, "eligibility": "All"}
+    ]).to_csv(tmp_path / "data" / "scholarships.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(STORAGE_ENV, "sqlite")
+    migrate(str(tmp_path / "data" / DATABASE_FILE))
+    reload_catalog_snapshot()
+
+
+@pytest.mark.parametrize("name", ['x" TEXT); DROP TABLE universities; --', "two words", "1st"])
+def test_insert_rejects_column_names_that_are_not_identifiers(name):
+    storage = get_storage()
+    with pytest.raises(ValueError):
+        storage.add_universities([{"university": "New", "country": "Italy", "city": "Rome", name: 1}])
+    assert storage.columns("universities") == ["university", "country", "city", "average_fees_eur"]
+    assert len(storage.read_universities()) == 1
+
+
+def test_insert_adds_identifier_columns():
+    storage = get_storage()
+    storage.add_universities([{"university": "New", "country": "Italy", "city": "Rome", "ranking": 3}])
+    assert "ranking" in storage.columns("universities")
+
+
+def test_pushdown_only_while_database_matches_snapshot():
+    snapshot = get_catalog_snapshot()
+    assert pushdown_storage(snapshot) is get_storage()
+
+    get_storage().write_scholarships(
+        pd.DataFrame(),
+        added=[{"scholarship_name": "Award B", "country": "Italy", "coverage": "Partial", "amount_eur": 100, "eligibility": "All"}],
+        removed_names=[]
+    )
+    # Not published yet: answers come from the snapshot, not the newer database
+    assert pushdown_storage(snapshot) is None
+    assert [row["name"] for row in match_scholarships(None, "Italy")] == ["Award A"]
+
+    reload_catalog_snapshot()
+    assert pushdown_storage() is get_storage()
+    assert [row["name"] for row in match_scholarships(None, "Italy")] == ["Award A", "Award B"]
+
+
+def test_affordable_for_a_snapshot_uses_the_fee_index(monkeypatch):
+    calls = []
+    affordability = SqliteStorage.affordability
+    monkeypatch.setattr(SqliteStorage, "affordability", lambda self, budget: calls.append(budget) or affordability(self, budget))
+    snapshot = get_catalog_snapshot()
+
+    result = find_affordable_universities(None, 4000, snapshot=snapshot)
+    assert calls == [4000]
+    assert result == get_affordability_index(snapshot.universities).summary(4000)
@@ -0,0 +1,37 @@
+"""
+Tests for catalog text search on catalogs without a field column
+"""
+
+import pandas as pd
+import pytest
+
+from data_fetcher.fetch_universities import UniversityCatalog
+from modules.recommendation_engine import match_universities, match_universities_batch
+from modules.text_search import get_text_index
+
+
+class Profile:
+    def __init__(self, **fields):
+        self.__dict__.update({"gpa": 3.0, "ielts": 7.0, "budget": 20000, "country": None, "field": None, **fields})
+
+
+@pytest.fixture
+def catalog():
+    return UniversityCatalog.from_frame(pd.DataFrame([
+        {"university": "Base 0", "country": "Italy", "city": "Rome", "average_fees_eur": 1000, "ielts_required": 6.0},
+        {"university": "Base 1", "country": "Spain", "city": "Madrid", "average_fees_eur": 2000, "ielts_required": 6.5}
+    ]))
+
+
+@pytest.mark.parametrize("pattern", ["ai", "data|ai"])
+def test_field_search_without_field_column_matches_nothing(catalog, pattern):
+    index = get_text_index(catalog)
+    assert len(index.field_codes(pattern)) == 0
+    assert len(index.field_pattern_codes(pattern)) == 0
+
+
+def test_field_filter_without_field_column(catalog):
+    assert match_universities(catalog, Profile(field="ai")) == (0, [])
+    assert match_universities(catalog, Profile())[0] == 2
+    totals = [total for total, _ in match_universities_batch(catalog, [Profile(field="ai"), Profile()])]
+    assert totals == [0, 2]
@@ -0,0 +1,186 @@
+"""
+Tests for the universities write-ahead log: torn lines, interrupted
+compactions, read-only data directories and concurrent writers
+"""
+
+import multiprocessing
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from data_fetcher import university_log
+from data_fetcher.university_log import (
+    append_universities,
+    catalog_lock,
+    commit_universities,
+    compact_universities,
+    fold_path,
+    lock_path,
+    log_path,
+    read_universities
+)
+
+
+def university(tag):
+    return {"university": f"Inserted {tag}", "country": "France", "city": "Paris", "average_fees_eur": 5000}
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    path = str(tmp_path / "universities.csv")
+    pd.DataFrame([
+        {"university": "Base 0", "country": "Italy", "city": "Rome", "average_fees_eur": 1000},
+        {"university": "Base 1", "country": "Spain", "city": "Madrid", "average_fees_eur": 2000}
+    ]).to_csv(path, index=False)
+    return path
+
+
+def names(path):
+    return read_universities(path)["university"].tolist()
+
+
+def test_torn_line_is_cut_before_next_append(base_path):
+    append_universities(base_path, [university(1)])
+    with open(log_path(base_path), "ab") as log_file:
+        log_file.write(b'{"university": "Torn", "coun')
+
+    # A torn tail is not a record
+    assert names(base_path) == ["Base 0", "Base 1", "Inserted 1"]
+    append_universities(base_path, [university(2)])
+    assert names(base_path) == ["Base 0", "Base 1", "Inserted 1", "Inserted 2"]
+
+
+def test_unreadable_log_line_is_skipped(base_path):
+    append_universities(base_path, [university(1)])
+    with open(log_path(base_path), "ab") as log_file:
+        log_file.write(b'{"university": "Glued", "coun{"university": "x"}\n[1, 2]\n')
+    append_universities(base_path, [university(2)])
+    assert names(base_path) == ["Base 0", "Base 1", "Inserted 1", "Inserted 2"]
+
+
+@pytest.mark.parametrize("operation", ["compact", "commit"])
+def test_crash_between_renames_does_not_duplicate_rows(base_path, tmp_path, monkeypatch, operation):
+    append_universities(base_path, [university(1), university(2)])
+    staged = str(tmp_path / "staged.csv")
+    pd.DataFrame([university("staged")]).to_csv(staged, index=False)
+    expected = ["Base 0", "Base 1", "Inserted 1", "Inserted 2"] + (["Inserted staged"] if operation == "commit" else [])
+
+    replace_contents = university_log._replace_contents
+
+    def crash_on_log_cut(path, data):
+        if path == log_path(base_path):
+            raise OSError("simulated crash")
+        replace_contents(path, data)
+
+    monkeypatch.setattr(university_log, "_replace_contents", crash_on_log_cut)
+    with pytest.raises(OSError):
+        if operation == "compact":
+            compact_universities(base_path)
+        else:
+            commit_universities(base_path, staged)
+    monkeypatch.setattr(university_log, "_replace_contents", replace_contents)
+
+    # The base holds the folded rows and the log still has them: readers skip them
+    assert os.path.exists(fold_path(base_path))
+    assert names(base_path) == expected
+
+    # The next writer finishes the fold
+    append_universities(base_path, [university(3)])
+    assert not os.path.exists(fold_path(base_path))
+    assert names(base_path) == expected + ["Inserted 3"]
+    assert compact_universities(base_path)
+    assert names(base_path) == expected + ["Inserted 3"]
+    assert os.path.getsize(log_path(base_path)) == 0
+
+
+def test_crash_before_base_rename_keeps_log(base_path, monkeypatch):
+    append_universities(base_path, [university(1)])
+
+    def crash(*args):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(university_log.os, "replace", crash)
+    with pytest.raises(OSError):
+        compact_universities(base_path)
+    monkeypatch.undo()
+
+    assert names(base_path) == ["Base 0", "Base 1", "Inserted 1"]
+
+
+def test_reader_without_writable_lock_file(base_path, monkeypatch):
+    append_universities(base_path, [university(1)])
+    os.remove(lock_path(base_path))
+
+    def read_only_open(path, mode="r", *args, **kwargs):
+        if path == lock_path(base_path) and mode != "r":
+            raise PermissionError(f"read-only file system: {path}")
+        return open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(university_log, "open", read_only_open, raising=False)
+    assert names(base_path) == ["Base 0", "Base 1", "Inserted 1"]
+    with pytest.raises(PermissionError):
+        append_universities(base_path, [university(2)])
+
+
+def _write_from_process(path, process, threads, per_thread):
+    def write(thread):
+        for i in range(per_thread):
+            append_universities(path, [university(f"{process}-{thread}-{i}")])
+
+    workers = [threading.Thread(target=write, args=(thread,)) for thread in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_concurrent_appends_and_compactions_lose_nothing(base_path):
+    processes, threads, per_thread = 3, 3, 20
+    writers = [
+        multiprocessing.get_context("spawn").Process(target=_write_from_process, args=(base_path, process, threads, per_thread))
+        for process in range(processes)
+    ]
+    for writer in writers:
+        writer.start()
+    while any(writer.is_alive() for writer in writers):
+        compact_universities(base_path)
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    compact_universities(base_path)
+
+    merged = names(base_path)
+    expected = {
+        f"Inserted {process}-{thread}-{i}"
+        for process in range(processes) for thread in range(threads) for i in range(per_thread)
+    }
+    assert merged[:2] == ["Base 0", "Base 1"]
+    assert sorted(merged[2:]) == sorted(expected)
+    assert os.path.getsize(log_path(base_path)) == 0
+
+
+def test_shared_holders_do_not_wait_for_each_other(base_path):
+    both_inside = threading.Barrier(2, timeout=5)
+    writer_done = threading.Event()
+
+    def reader():
+        with catalog_lock(base_path, exclusive=False):
+            both_inside.wait()
+
+    def writer():
+        with catalog_lock(base_path):
+            writer_done.set()
+
+    with catalog_lock(base_path, exclusive=False):
+        thread = threading.Thread(target=reader)
+        thread.start()
+        # Only passes if the reader got in while this thread holds the lock
+        both_inside.wait()
+        thread.join()
+        writing = threading.Thread(target=writer)
+        writing.start()
+        assert not writer_done.wait(0.2)
+    writing.join(5)
+    assert writer_done.is_set()
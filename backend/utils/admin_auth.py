@@ -0,0 +1,28 @@
+"""
+Admin Authentication
+FastAPI dependency guarding the /admin routes
+
+Admin requests carry the token from the ADMIN_API_TOKEN environment variable
+in an X-Admin-Token header. When the variable is unset the admin routes are
+disabled (every request is refused) rather than left open.
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN_ENV = "ADMIN_API_TOKEN"
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Raises:
+        HTTPException: 403 if no admin token is configured, 401 if the header does not match it
+    """
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected:
+        raise HTTPException(status_code=403, detail=f"Admin routes are disabled: {ADMIN_TOKEN_ENV} is not set")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token header")
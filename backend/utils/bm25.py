@@ -0,0 +1,220 @@
+"""
+Backend Utilities - BM25 Module
+Inverted index with BM25 ranking and top-k pruning
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Beyond this many segment combinations (long queries) a query is scored exhaustively
+MAX_COMBINATIONS = 20000
+
+EMPTY_DOCS = np.array([], dtype=np.int64)
+EMPTY_SCORES = np.array([], dtype=float)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens (letters and digits, any script)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    BM25 over a fixed list of documents
+
+    Postings are stored sparsely: for each term, the ids of the documents
+    containing it (ascending) and the term's precomputed BM25 contribution to
+    each of them. Each term's postings are also kept grouped into segments of
+    equal contribution (best first, documents ascending inside a segment);
+    BM25 contributions only depend on term frequency and document length, so
+    a term has few segments.
+
+    A query never scores every matching document. Its possible scores are
+    sums of one segment contribution per term (or nothing), and those
+    combinations are visited best first. Each visit intersects the chosen
+    segments (skipping those whose document lengths cannot overlap) and takes
+    the first few documents in all of them, which all score exactly the
+    combination's sum; the walk stops as soon as the next combination cannot
+    beat the current k-th result.
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.size = len(documents)
+        self.vocabulary: Dict[str, int] = {}
+
+        term_ids, doc_ids = [], []
+        lengths = np.zeros(self.size)
+        for doc_id, text in enumerate(documents):
+            tokens = tokenize(text)
+            lengths[doc_id] = len(tokens)
+            term_ids.extend(self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens)
+            doc_ids.extend([doc_id] * len(tokens))
+
+        # One posting per (term, document), sorted by term then document
+        n_docs = max(self.size, 1)
+        keys, tf = np.unique(np.array(term_ids, dtype=np.int64) * n_docs + np.array(doc_ids, dtype=np.int64), return_counts=True)
+        post_terms = keys // n_docs
+        self.doc_ids = keys % n_docs
+        self.offsets = np.searchsorted(post_terms, np.arange(len(self.vocabulary) + 1))
+
+        df = np.diff(self.offsets)
+        idf = np.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+        average_length = lengths.mean() if self.size and lengths.mean() > 0 else 1.0
+        norm = k1 * (1.0 - b + b * lengths / average_length)
+        self.impacts = idf[post_terms] * tf * (k1 + 1.0) / (tf + norm[self.doc_ids])
+
+        self.max_impact = np.maximum.reduceat(self.impacts, self.offsets[:-1]) if len(self.impacts) else EMPTY_SCORES
+
+        # Same postings ordered by term, contribution (desc), document
+        order = np.lexsort((self.doc_ids, -self.impacts, post_terms))
+        self.ordered_docs = self.doc_ids[order]
+        ordered_impacts = self.impacts[order]
+        ordered_terms = post_terms[order]
+        changes = np.flatnonzero((np.diff(ordered_terms) != 0) | (np.diff(ordered_impacts) != 0)) + 1
+        # Segment s covers ordered_docs[segment_starts[s]:segment_starts[s + 1]]
+        self.segment_starts = np.concatenate([[0], changes, [len(order)]] if len(order) else [[0]]).astype(np.int64)
+        self.segment_impacts = ordered_impacts[self.segment_starts[:-1]]
+        self.segment_impacts_list = self.segment_impacts.tolist()
+        # Term t owns segments term_segments[t]:term_segments[t + 1]
+        self.term_segments = np.searchsorted(ordered_terms[self.segment_starts[:-1]], np.arange(len(self.vocabulary) + 1))
+        # Document length range per segment: segments of different terms whose
+        # ranges do not overlap cannot share a document
+        if len(order):
+            segment_lengths = lengths[self.ordered_docs]
+            self.segment_min_length = np.minimum.reduceat(segment_lengths, self.segment_starts[:-1]).tolist()
+            self.segment_max_length = np.maximum.reduceat(segment_lengths, self.segment_starts[:-1]).tolist()
+        else:
+            self.segment_min_length, self.segment_max_length = [], []
+
+    def __len__(self) -> int:
+        return self.size
+
+    def search(self, query: str, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top k documents for a query
+
+        Returns:
+            (document ids, scores), best first; equal scores by document id
+        """
+        terms = {self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary}
+        if not terms or k <= 0:
+            return EMPTY_DOCS, EMPTY_SCORES
+        terms = sorted(terms, key=lambda term: (-self.max_impact[term], term))
+
+        if len(terms) == 1:
+            start = self.segment_starts[self.term_segments[terms[0]]]
+            end = self.segment_starts[self.term_segments[terms[0] + 1]]
+            top = np.arange(start, min(start + k, end))
+            docs = self.ordered_docs[top]
+            return docs, self._score(docs, terms)
+
+        # Every combination of one segment (or None: term absent) per term
+        # whose segments can share a document, with its exact score
+        states = [((), 0.0, float("-inf"), float("inf"))]
+        for term in terms:
+            expanded = []
+            for chosen, total, low, high in states:
+                for segment in range(self.term_segments[term], self.term_segments[term + 1]):
+                    segment_low = max(low, self.segment_min_length[segment])
+                    segment_high = min(high, self.segment_max_length[segment])
+                    if segment_low <= segment_high:
+                        # Added in term order, like _score, so sums compare exactly
+                        expanded.append((chosen + (segment,), total + self.segment_impacts_list[segment], segment_low, segment_high))
+                expanded.append((chosen + (None,), total + 0.0, low, high))
+            states = expanded
+            if len(states) > MAX_COMBINATIONS:
+                return self._exhaustive_search(terms, k)
+        combinations = sorted(
+            ((total, chosen) for chosen, total, _, _ in states if total > 0.0),
+            key=lambda item: -item[0]
+        )
+
+        top_docs, top_scores = EMPTY_DOCS, EMPTY_SCORES
+        for score, chosen in combinations:
+            full = len(top_docs) == k
+            if full and score < top_scores[-1]:
+                break
+            present = [segment for segment in chosen if segment is not None]
+            absent = [term for term, segment in zip(terms, chosen) if segment is None]
+            # A tie with the k-th result only helps documents with smaller ids
+            limit = int(top_docs[-1]) if full and score == top_scores[-1] else None
+            docs = self._combination_docs(present, absent, k, limit)
+            if len(docs):
+                merged_docs = np.concatenate([top_docs, docs])
+                merged_scores = np.concatenate([top_scores, np.full(len(docs), score)])
+                order = np.lexsort((merged_docs, -merged_scores))[:k]
+                top_docs, top_scores = merged_docs[order], merged_scores[order]
+
+        return top_docs, top_scores
+
+    def _combination_docs(self, segments: Sequence[int], absent_terms: Sequence[int], k: int, limit=None) -> np.ndarray:
+        """
+        Smallest k document ids that are in every given segment and contain
+        none of absent_terms (optionally only ids below limit)
+
+        Such documents score exactly the combination's bound. The smallest
+        segment is scanned in growing chunks, stopping once k are found.
+        """
+        ranges = sorted(
+            ((int(self.segment_starts[segment]), int(self.segment_starts[segment + 1])) for segment in segments),
+            key=lambda bounds: bounds[1] - bounds[0]
+        )
+        others = [self.ordered_docs[start:end] for start, end in ranges[1:]]
+        others += [self._postings(term)[0] for term in absent_terms]
+        n_present = len(ranges) - 1
+
+        start, end = ranges[0]
+        scan = self.ordered_docs[start:end]
+        if limit is not None:
+            scan = scan[:np.searchsorted(scan, limit)]
+
+        found = []
+        n_found = 0
+        chunk = 4 * k
+        position = 0
+        while position < len(scan) and n_found < k:
+            docs = scan[position:position + chunk]
+            position += chunk
+            chunk *= 4
+            for i, other in enumerate(others):
+                if len(docs) == 0:
+                    break
+                if len(other) == 0:
+                    member = np.zeros(len(docs), dtype=bool)
+                else:
+                    positions = np.minimum(np.searchsorted(other, docs), len(other) - 1)
+                    member = other[positions] == docs
+                docs = docs[member] if i < n_present else docs[~member]
+            found.append(docs)
+            n_found += len(docs)
+        return np.concatenate(found)[:k] if found else EMPTY_DOCS
+
+    def _exhaustive_search(self, terms: Sequence[int], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.zeros(self.size)
+        for term in terms:
+            docs, impacts = self._postings(term)
+            scores[docs] += impacts
+        docs = np.flatnonzero(scores > 0.0)
+        scores = scores[docs]
+        if len(docs) > k:
+            keep = np.flatnonzero(scores >= np.partition(scores, len(scores) - k)[len(scores) - k])
+            docs, scores = docs[keep], scores[keep]
+        order = np.lexsort((docs, -scores))[:k]
+        return docs[order], scores[order]
+
+    def _postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(document ids ascending, contributions) of one term"""
+        start, end = self.offsets[term], self.offsets[term + 1]
+        return self.doc_ids[start:end], self.impacts[start:end]
+
+    def _score(self, candidates: np.ndarray, terms: Sequence[int]) -> np.ndarray:
+        scores = np.zeros(len(candidates))
+        for term in terms:
+            docs, impacts = self._postings(term)
+            positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            scores += np.where(docs[positions] == candidates, impacts[positions], 0.0)
+        return scores
@@ -15,6 +15,35 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, validator
 
 
+# (field, kind, required, minimum, maximum, range message) of a university:
+# UniversityValidationSchema checks one record with them, bulk ingest whole columns
+UNIVERSITY_FIELD_RULES = [
+    ("name", "text", True, None, None, None),
+    ("country", "text", True, None, None, None),
+    ("city", "text", True, None, None, None),
+    ("ranking", "int", False, 0, None, "Ranking cannot be negative"),
+    ("tuition_fee", "float", False, 0, None, "Tuition fee cannot be negative"),
+    ("acceptance_rate", "float", False, 0, 100, "Acceptance rate must be between 0 and 100"),
+    ("programs_count", "int", False, None, None, None)
+]
+
+# Same layout, for the scores of a student profile
+STUDENT_FIELD_RULES = [
+    ("gpa", "float", True, 0, 4, "GPA must be between 0 and 4"),
+    ("ielts", "float", True, 0, 9, "IELTS score must be between 0 and 9"),
+    ("budget", "float", True, 0, None, "Budget cannot be negative")
+]
+
+
+def _check_range(rules, field, v):
+    """Apply the minimum / maximum of a field's rule to one value"""
+    for name, _, _, minimum, maximum, message in rules:
+        if name == field and v is not None:
+            if (minimum is not None and v < minimum) or (maximum is not None and v > maximum):
+                raise ValueError(message)
+    return v
+
+
 class UniversityValidationSchema(BaseModel):
     """Enhanced university validation schema"""
     name: str
@@ -29,21 +58,15 @@ class UniversityValidationSchema(BaseModel):
 
     @validator('tuition_fee')
     def validate_tuition(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Tuition fee cannot be negative')
-        return v
+        return _check_range(UNIVERSITY_FIELD_RULES, 'tuition_fee', v)
 
     @validator('ranking')
     def validate_ranking(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Ranking cannot be negative')
-        return v
+        return _check_range(UNIVERSITY_FIELD_RULES, 'ranking', v)
 
     @validator('acceptance_rate')
     def validate_acceptance(cls, v):
-        if v is not None and (v < 0 or v > 100):
-            raise ValueError('Acceptance rate must be between 0 and 100')
-        return v
+        return _check_range(UNIVERSITY_FIELD_RULES, 'acceptance_rate', v)
 
 
 class StudentProfileValidationSchema(BaseModel):
@@ -56,21 +79,15 @@ class StudentProfileValidationSchema(BaseModel):
 
     @validator('gpa')
     def validate_gpa(cls, v):
-        if v < 0 or v > 4:
-            raise ValueError('GPA must be between 0 and 4')
-        return v
+        return _check_range(STUDENT_FIELD_RULES, 'gpa', v)
 
     @validator('ielts')
     def validate_ielts(cls, v):
-        if v < 0 or v > 9:
-            raise ValueError('IELTS score must be between 0 and 9')
-        return v
+        return _check_range(STUDENT_FIELD_RULES, 'ielts', v)
 
     @validator('budget')
     def validate_budget(cls, v):
-        if v < 0:
-            raise ValueError('Budget cannot be negative')
-        return v
+        return _check_range(STUDENT_FIELD_RULES, 'budget', v)
 
 
 def validate_university_data(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
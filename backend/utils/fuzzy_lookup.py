@@ -0,0 +1,170 @@
+"""
+Backend Utilities - Fuzzy Lookup Module
+SymSpell-style spelling correction against a fixed vocabulary
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+# Upper bound on remembered lookups per index (misspellings repeat a lot)
+CACHE_SIZE = 100000
+
+
+def normalize(value: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return " ".join(str(value).lower().split())
+
+
+def allowed_distance(length: int) -> int:
+    """Edits tolerated for a word of this length (none for very short words like "uk")"""
+    if length <= 3:
+        return 0
+    if length <= 5:
+        return 1
+    return 2
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """word plus every string obtained by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insert, delete, substitute, swap
+    adjacent), or max_distance + 1 once it is known to be larger
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SymSpellIndex:
+    """
+    Vocabulary with a precomputed delete-neighbourhood dictionary
+
+    Every entry's prefix is indexed under all strings reachable by deleting up
+    to MAX_DISTANCE characters. A lookup generates the same deletes for its
+    input and only verifies the handful of entries sharing one, so its cost
+    does not grow with the vocabulary.
+    """
+
+    MAX_DISTANCE = 2
+    PREFIX_LENGTH = 10
+
+    def __init__(self, values: Iterable[str], protected: Iterable[str] = ()):
+        """
+        Args:
+            values: The vocabulary
+            protected: Words that are valid in their own right even when not
+                in the vocabulary: they are never corrected to an entry
+        """
+        self.values: List[str] = []
+        self.normalized: List[str] = []
+        self.exact: Dict[str, str] = {}
+        self.deletes: Dict[str, List[int]] = {}
+        self._cache: Dict[str, Optional[str]] = {}
+        self.protected: Set[str] = {normalize(value) for value in protected if isinstance(value, str)}
+        for value in values:
+            if not isinstance(value, str):
+                continue
+            key = normalize(value)
+            if not key or key in self.exact:
+                continue
+            self.exact[key] = value
+            entry = len(self.values)
+            self.values.append(value)
+            self.normalized.append(key)
+            for delete in _deletes(key[:self.PREFIX_LENGTH], self.MAX_DISTANCE):
+                self.deletes.setdefault(delete, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def lookup(self, value: str) -> Optional[str]:
+        """
+        The vocabulary entry closest to value (case-insensitive), or None if
+        nothing is within the distance allowed for its length (or value is a
+        protected word other than an entry)
+
+        Ties go to the entry closest in length, then to the earliest entry.
+        """
+        key = normalize(value)
+        if key in self.exact:
+            return self.exact[key]
+        if key in self.protected:
+            return None
+        if key in self._cache:
+            return self._cache[key]
+        max_distance = min(allowed_distance(len(key)), self.MAX_DISTANCE)
+        if max_distance == 0:
+            return None
+
+        candidates = set()
+        for delete in _deletes(key[:self.PREFIX_LENGTH], max_distance):
+            candidates.update(self.deletes.get(delete, ()))
+
+        best, best_rank = None, None
+        for entry in candidates:
+            distance = edit_distance(key, self.normalized[entry], max_distance)
+            if distance <= max_distance:
+                rank = (distance, abs(len(self.normalized[entry]) - len(key)), entry)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = entry, rank
+
+        result = self.values[best] if best is not None else None
+        if len(self._cache) < CACHE_SIZE:
+            self._cache[key] = result
+        return result
+
+
+class PhraseIndex:
+    """
+    Multi-word names (e.g. university names) corrected word by word
+
+    Many names share their first words ("University of ..."), which would put
+    most of them behind the same prefix deletes. Instead each word is
+    corrected against the vocabulary of words used in any name, and the
+    corrected phrase must then match a name exactly.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        self.exact: Dict[str, str] = {}
+        for value in values:
+            if isinstance(value, str):
+                key = normalize(value)
+                if key:
+                    self.exact.setdefault(key, value)
+        self.words = SymSpellIndex(word for key in self.exact for word in key.split())
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def lookup(self, value: str) -> Optional[str]:
+        """The name value spells (case-insensitive, small typos per word), or None"""
+        key = normalize(value)
+        if key in self.exact:
+            return self.exact[key]
+        corrected = []
+        for word in key.split():
+            match = self.words.lookup(word)
+            if match is None:
+                return None
+            corrected.append(match)
+        return self.exact.get(" ".join(corrected))
@@ -1,2 +1,13 @@
+import os
+
+
 def format_currency(amount):
     return f"€{amount:,}"
+
+
+def resolve_data_path(filename):
+    """Return the path of a data file, trying the repo root first and then backend/"""
+    csv_path = os.path.join("backend", "data", filename)
+    if not os.path.exists(csv_path):
+        csv_path = os.path.join("data", filename)
+    return csv_path
@@ -0,0 +1,89 @@
+"""
+Backend Utilities - Prefix Trie Module
+Compacted prefix trie with precomputed top-k entries per node
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+WORD_START = re.compile(r"(?<![^\W_])[^\W_]")
+
+# Sorts after every character, so query + PREFIX_END bounds all keys starting with query
+PREFIX_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return " ".join(str(text).lower().split())
+
+
+class PrefixTrie:
+    """
+    Prefix completion over a fixed list of names, best entries first
+
+    Every name is keyed under each of its word starts ("tu munich" and
+    "munich"), so any word of a name can be typed first. The keys are sorted;
+    the nodes of the compacted trie over them are exactly the ranges of keys
+    sharing a prefix (LCP intervals), found in one pass over neighbouring
+    keys. Each node stores the k best entries below it, merged bottom-up from
+    its children. A lookup is two bisections for the prefix's key range and
+    one dict hit for that range's node.
+    """
+
+    def __init__(self, names: Sequence[str], ranks: Sequence[int], k: int = 8):
+        """
+        Args:
+            names: Text of each entry
+            ranks: Rank of each entry (smaller is better, distinct)
+            k: Entries kept per node
+        """
+        self.k = k
+        pairs = sorted(
+            (name[match.start():], rank)
+            for name, rank in zip((normalize(name) for name in names), ranks)
+            for match in WORD_START.finditer(name)
+        )
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.nodes: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+        # stack of open intervals: [depth, first key, best ranks]
+        stack = [[0, 0, ()]]
+        for i, (key, rank) in enumerate(pairs):
+            self.nodes[(i, i + 1)] = (rank,)
+            depth = _common_prefix_length(key, pairs[i + 1][0]) if i + 1 < len(pairs) else -1
+            child_start, child_best = i, (rank,)
+            while stack and depth < stack[-1][0]:
+                _, start, best = stack.pop()
+                best = self._merge(best, child_best)
+                self.nodes[(start, i + 1)] = best
+                child_start, child_best = start, best
+            if not stack:
+                break
+            if depth > stack[-1][0]:
+                stack.append([depth, child_start, child_best])
+            else:
+                stack[-1][2] = self._merge(stack[-1][2], child_best)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _merge(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(sorted(set(a).union(b))[:self.k])
+
+    def complete(self, prefix: str) -> Tuple[int, ...]:
+        """Ranks of the best (up to k) entries with a word starting with prefix, best first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return ()
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + PREFIX_END, start)
+        return self.nodes.get((start, end), ())
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    length = min(len(a), len(b))
+    for i in range(length):
+        if a[i] != b[i]:
+            return i
+    return length
@@ -0,0 +1,52 @@
+"""
+Ranking Helpers
+Rounding and top-k selection on NumPy score arrays, shared by the
+recommendation, cost and ROI modules
+"""
+
+import numpy as np
+
+
+def round_scores(values, ndigits):
+    """
+    np.round that agrees with Python's round() on every element
+
+    np.round rounds values * 10**ndigits, and that product is itself rounded,
+    so a value just below or above a half step can land exactly on it. For
+    those elements the exact rounding error of the product (Dekker's
+    two-product) tells which side the true value is on.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled)
+
+    # Exact error of values * scale, split into halves that multiply exactly
+    split = 134217729.0 * values
+    high = split - (split - values)
+    low = values - high
+    scale_split = 134217729.0 * scale
+    scale_high = scale_split - (scale_split - scale)
+    scale_low = scale - scale_high
+    error = (((high * scale_high - scaled) + high * scale_low) + low * scale_high) + low * scale_low
+
+    on_half = (scaled - np.floor(scaled)) == 0.5
+    rounded = np.where(on_half & (error > 0), np.ceil(scaled), rounded)
+    rounded = np.where(on_half & (error < 0), np.floor(scaled), rounded)
+    return rounded / scale
+
+
+def top_k_order(scores, k):
+    """
+    Positions of the k highest scores, best first, ties kept in input order
+
+    Same result as a stable descending sort truncated to k, but only the
+    candidates that can make the cut (found with argpartition) get sorted.
+    """
+    if len(scores) > k > 0:
+        kth = np.argpartition(-scores, k - 1)[:k]
+        threshold = scores[kth].min()
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order[:k]
@@ -0,0 +1,128 @@
+"""
+Backend Utilities - Streaming Module
+Helpers for reading and writing newline-delimited JSON (NDJSON) incrementally,
+and for reading CSV the same way
+"""
+
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+async def iter_ndjson(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Parse a stream of bytes as NDJSON without buffering the whole body
+
+    Yields:
+        (line number, parsed object) for every non-blank line
+
+    Raises:
+        ValueError: On a line that is not valid JSON (message includes the line number)
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in byte_chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, _parse_line(line, line_number)
+    if buffer.strip():
+        yield line_number + 1, _parse_line(buffer, line_number + 1)
+
+
+async def iter_csv_rows(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Parse a stream of bytes as CSV without buffering the whole body
+
+    Quoted fields may span lines; a record is complete once its quotes balance.
+
+    Yields:
+        (line number the record starts on, fields) for every non-blank record,
+        the header included
+
+    Raises:
+        ValueError: On a record the csv module cannot parse (message includes the line number)
+    """
+    buffer = b""
+    line_number = 0
+    record: List[bytes] = []
+    start = 1
+    quotes = 0
+    done = False
+    while not done:
+        try:
+            chunk = await byte_chunks.__anext__()
+        except StopAsyncIteration:
+            # The last line may lack its newline
+            chunk, done = b"\n" if buffer else b"", True
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if not record:
+                start = line_number
+            record.append(line.rstrip(b"\r"))
+            quotes += line.count(b'"')
+            if quotes % 2:
+                continue
+            text = b"\n".join(record).decode("utf-8-sig" if start == 1 else "utf-8")
+            record, quotes = [], 0
+            if text.strip():
+                yield start, _parse_record(text, start)
+    if record:
+        raise ValueError(f"Unterminated quoted field starting on line {start}")
+
+
+async def batched(items: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    """Group an async iterator into lists of at most `size` items"""
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_line(payload: Dict[str, Any]) -> bytes:
+    """Serialize one NDJSON line"""
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that are still reading the request body
+
+    Before ASGI 2.4 Starlette listens for client disconnects by draining
+    ``receive`` while the response streams, which would swallow the body chunks
+    an NDJSON-in/NDJSON-out endpoint has not parsed yet. This response leaves
+    ``receive`` to the generator; a client that goes away surfaces as an error
+    on the next send instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_record(text: str, line_number: int) -> List[str]:
+    try:
+        return next(csv.reader([text]))
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV on line {line_number}: {str(e)}")
+
+
+def _parse_line(line: bytes, line_number: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON on line {line_number}: {str(e)}")
@@ -0,0 +1,77 @@
+"""
+Backend Utilities - Text Index Module
+N-gram inverted index for case-insensitive substring search
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+EMPTY_POSTING = np.array([], dtype=np.int64)
+
+# A search pattern without any of these is plain text (a substring search)
+REGEX_SYNTAX = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def text_test(pattern: str) -> Callable[[str], bool]:
+    """Case-insensitive match: a substring test for plain text, a regex search otherwise"""
+    if REGEX_SYNTAX.search(pattern) is None:
+        text = pattern.lower()
+        return lambda value: text in value.lower()
+    compiled = re.compile(pattern, re.IGNORECASE)
+    return lambda value: compiled.search(value) is not None
+
+
+class TrigramIndex:
+    """
+    Substring search over a fixed list of strings
+
+    Every 1-, 2- and 3-character gram of each (lowercased) text maps to the
+    sorted ids of the texts containing it. A query of up to three characters is
+    a single posting-list lookup; a longer one intersects the posting lists of
+    its trigrams and confirms the few survivors with a plain ``in`` check, so
+    results are exactly ``query.lower() in str(text).lower()``.
+    """
+
+    MAX_GRAM = 3
+
+    def __init__(self, texts: Sequence[Any]):
+        self.texts: List[str] = [str(text).lower() for text in texts]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for doc_id, text in enumerate(self.texts):
+            grams = {
+                text[i:i + n]
+                for n in range(1, self.MAX_GRAM + 1)
+                for i in range(len(text) - n + 1)
+            }
+            for gram in grams:
+                postings[gram].append(doc_id)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(self, query: str) -> np.ndarray:
+        """Sorted ids of the texts containing query (case-insensitive)"""
+        query = query.lower()
+        if not query:
+            return np.arange(len(self.texts))
+        if len(query) <= self.MAX_GRAM:
+            return self.postings.get(query, EMPTY_POSTING)
+
+        grams = {query[i:i + self.MAX_GRAM] for i in range(len(query) - self.MAX_GRAM + 1)}
+        posting_lists = sorted((self.postings.get(gram, EMPTY_POSTING) for gram in grams), key=len)
+        # Shortest list first; each longer list is only probed by binary search
+        candidates = posting_lists[0]
+        for posting in posting_lists[1:]:
+            if len(candidates) == 0:
+                break
+            positions = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+            candidates = candidates[posting[positions] == candidates]
+
+        # Shared trigrams do not guarantee they are contiguous, so confirm
+        return np.array([doc_id for doc_id in candidates.tolist() if query in self.texts[doc_id]], dtype=np.int64)